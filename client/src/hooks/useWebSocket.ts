@@ -31,6 +31,11 @@ export function useWebSocket(url: string | null, options: UseWebSocketOptions =
       ws.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
+          // サーバーのハートビートには pong を返す（応答がないと切断される）
+          if (data.type === 'ping') {
+            ws.send(JSON.stringify({ type: 'pong' }));
+            return;
+          }
           onMessage?.(data);
         } catch (error) {
           console.error('Failed to parse WebSocket message:', error);
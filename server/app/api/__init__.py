@@ -1,3 +1,4 @@
 from .game_api import router as game_api_router
+from .tournament_api import router as tournament_api_router
 
-__all__ = ["game_api_router"]
+__all__ = ["game_api_router", "tournament_api_router"]
@@ -5,6 +5,8 @@ from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import Optional
 from app.game.services.game_service import game_service
+from app.game.services.game_lifecycle import game_lifecycle, GameCapacityError, CLOSE_DELETED
+from app.sharding.node import shard_node
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,14 @@ class CreateSinglePlayRequest(BaseModel):
     """シングルプレイゲーム作成のリクエスト"""
     big_blind: int = Field(default=100, ge=10, le=1000, description="ビッグブラインド額")
     buy_in: int = Field(default=10000, ge=1000, le=100000, description="初期スタック額")
+    ai_time_budget: Optional[float] = Field(
+        default=None, ge=0.005, le=1.0,
+        description="AIの1決定あたりの時間予算（秒、equity戦略で使用、省略時はサーバー既定）"
+    )
+    run_it_times: int = Field(
+        default=1, ge=1, le=3,
+        description="オールインで決着したときにボードを走らせる回数"
+    )
 
 
 class CreateSinglePlayResponse(BaseModel):
@@ -51,17 +61,24 @@ async def create_single_play_game(request: CreateSinglePlayRequest = CreateSingl
     try:
         logger.info(f"Creating single play game: big_blind={request.big_blind}, buy_in={request.buy_in}")
         
+        # 上限ならLRUのゲームを破棄して空きを作る
+        await game_lifecycle.admit()
+        
         # シングルプレイゲームを作成
         game = await game_service.create_single_play_game(
             big_blind=request.big_blind,
-            buy_in=request.buy_in
+            buy_in=request.buy_in,
+            ai_time_budget=request.ai_time_budget,
+            run_it_times=request.run_it_times
         )
         
+        game_lifecycle.register(game.id)
         ai_players = [p.name for p in game.players if p.is_ai]
         
         websocket_url = f"/ws/game/{game.id}?username=YOUR_USERNAME"
         
         logger.info(f"Game created: {game.id}, AI players: {ai_players}")
+        await shard_node.announce_game("created", game.id)
         
         return CreateSinglePlayResponse(
             game_id=game.id,
@@ -70,6 +87,9 @@ async def create_single_play_game(request: CreateSinglePlayRequest = CreateSingl
             websocket_url=websocket_url
         )
         
+    except GameCapacityError as e:
+        logger.warning(f"Game not created: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -104,17 +124,38 @@ async def get_game_info(game_id: str):
     )
 
 
+@router.get("/{game_id}/memory")
+async def get_game_memory(game_id: str):
+    """
+    ゲームごとのメモリ使用量の概算（バイト）
+    
+    Args:
+        game_id: ゲームID
+        
+    Returns:
+        dict: 状態・フレームキャッシュ・再送用の履歴ごとのバイト数と合計
+    """
+    usage = game_lifecycle.memory_usage(game_id)
+    if usage is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
+    return {"game_id": game_id, "bytes": usage}
+
+
 @router.delete("/{game_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_game(game_id: str):
     """
-    ゲームを削除
+    ゲームを削除（接続中のプレイヤーと観戦者は切断される）
     
     Args:
         game_id: ゲームID
     """
-    if game_id not in game_service.games:
+    if not await game_lifecycle.close_game(game_id, CLOSE_DELETED):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game not found")
-    
-    del game_service.games[game_id]
-    logger.info(f"Game deleted: {game_id}")
 
+
+async def announce_game_closed(game_id: str, reason: str) -> None:
+    """破棄されたゲームをメッセージバスに通知（シャーディング時のゲーム数の集計用）"""
+    await shard_node.announce_game("deleted", game_id)
+
+
+game_lifecycle.add_close_listener(announce_game_closed)
@@ -0,0 +1,160 @@
+"""
+トーナメント作成・進行用のREST APIエンドポイント
+"""
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+import math
+import uuid
+from app.game.domain.player import Player
+from app.game.domain.tournament import BlindLevel
+from app.game.services.game_lifecycle import game_lifecycle, GameCapacityError
+from app.game.services.tournament_service import tournament_service
+from app.sharding.node import shard_node
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/tournaments", tags=["tournaments"])
+
+
+# === Request/Response Models ===
+
+class BlindLevelModel(BaseModel):
+    """ブラインドレベル"""
+    small_blind: int = Field(..., ge=1, description="スモールブラインド額")
+    big_blind: int = Field(..., ge=2, description="ビッグブラインド額")
+
+    @model_validator(mode="after")
+    def check_order(self) -> "BlindLevelModel":
+        if self.small_blind > self.big_blind:
+            raise ValueError("small_blind must not exceed big_blind")
+        return self
+
+
+class CreateTournamentRequest(BaseModel):
+    """トーナメント作成のリクエスト（参加者はAIプレイヤー）"""
+    entrants: int = Field(default=18, ge=2, le=10000, description="参加するAIプレイヤー数")
+    seats_per_table: int = Field(default=9, ge=2, le=10, description="1テーブルあたりの座席数")
+    starting_stack: int = Field(default=10000, ge=1000, le=1000000, description="初期スタック額")
+    blind_levels: Optional[List[BlindLevelModel]] = Field(default=None, description="ブラインドレベルの一覧")
+    level_interval: Optional[float] = Field(
+        default=None, ge=0, le=86400, description="ブラインドレベルの長さ（秒、省略時はサーバー既定、0で上げない）"
+    )
+
+
+class CreateTournamentResponse(BaseModel):
+    """トーナメント作成のレスポンス"""
+    tournament_id: str = Field(..., description="作成されたトーナメントのID")
+    table_ids: List[str] = Field(..., description="テーブル（ゲーム）IDのリスト")
+    spectate_urls: List[str] = Field(..., description="テーブルごとの観戦用WebSocket URL")
+
+
+class TournamentStatusResponse(BaseModel):
+    """トーナメントの状況のレスポンス"""
+    tournament_id: str = Field(..., description="トーナメントID")
+    is_started: bool = Field(..., description="開始済みか")
+    is_finished: bool = Field(..., description="終了したか")
+    level: int = Field(..., description="現在のブラインドレベル（0始まり）")
+    small_blind: int = Field(..., description="現在のスモールブラインド額")
+    big_blind: int = Field(..., description="現在のビッグブラインド額")
+    remaining_players: int = Field(..., description="残りプレイヤー数")
+    tables: dict[str, int] = Field(..., description="テーブルIDごとの着席人数")
+
+
+# === Endpoints ===
+
+@router.post("", response_model=CreateTournamentResponse, status_code=status.HTTP_201_CREATED)
+async def create_tournament(request: CreateTournamentRequest = CreateTournamentRequest()):
+    """
+    AIプレイヤーだけのトーナメントを作成（開始は POST /api/tournaments/{tournament_id}/start）
+
+    - 参加者は座席数ごとのテーブルに均等に配置される
+    - テーブルはトーナメントが終わるまで期限切れ・上限による破棄の対象にならない
+
+    Returns:
+        CreateTournamentResponse: トーナメントIDとテーブルの一覧
+    """
+    try:
+        # 上限ならLRUのゲームを破棄してテーブル数分の空きを作る
+        await game_lifecycle.admit(math.ceil(request.entrants / request.seats_per_table))
+
+        entrants = [
+            Player(player_id=str(uuid.uuid4()), name=f"AI_Player_{i + 1}", is_ai=True)
+            for i in range(request.entrants)
+        ]
+        blind_levels = None
+        if request.blind_levels:
+            blind_levels = [BlindLevel(level.small_blind, level.big_blind) for level in request.blind_levels]
+
+        tournament = await tournament_service.create_tournament(
+            entrants,
+            seats_per_table=request.seats_per_table,
+            starting_stack=request.starting_stack,
+            blind_levels=blind_levels,
+            level_interval=request.level_interval
+        )
+
+        table_ids = list(tournament.tables)
+        for table_id in table_ids:
+            game_lifecycle.register(table_id, pinned=True)
+            await shard_node.announce_game("created", table_id)
+
+        logger.info(f"Tournament created: {tournament.id}, entrants={request.entrants}, tables={len(table_ids)}")
+
+        return CreateTournamentResponse(
+            tournament_id=tournament.id,
+            table_ids=table_ids,
+            spectate_urls=[f"/ws/spectate/{table_id}" for table_id in table_ids]
+        )
+
+    except GameCapacityError as e:
+        logger.warning(f"Tournament not created: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{tournament_id}/start")
+async def start_tournament(tournament_id: str):
+    """
+    全テーブルで最初のハンドを開始（以降はハンドが終わるたびに次のハンドが自動で始まる）
+
+    Args:
+        tournament_id: トーナメントID
+    """
+    tournament = tournament_service.get_tournament(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found")
+    if not await tournament_service.start_tournament(tournament_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Tournament already started or finished")
+    return {"tournament_id": tournament_id, "started": True}
+
+
+@router.get("/{tournament_id}", response_model=TournamentStatusResponse)
+async def get_tournament_status(tournament_id: str):
+    """
+    トーナメントの状況（ブラインドレベル・残り人数・テーブルごとの人数）
+
+    Args:
+        tournament_id: トーナメントID
+
+    Returns:
+        TournamentStatusResponse: トーナメントの状況
+    """
+    tournament = tournament_service.get_tournament(tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tournament not found")
+
+    level = tournament.current_level
+    return TournamentStatusResponse(
+        tournament_id=tournament.id,
+        is_started=tournament.is_started,
+        is_finished=tournament.is_finished,
+        level=tournament.level_index,
+        small_blind=level.small_blind,
+        big_blind=level.big_blind,
+        remaining_players=tournament.remaining_players,
+        tables=dict(tournament.table_counts)
+    )
@@ -0,0 +1,67 @@
+"""
+イベントループの遅延の計測
+interval 秒ごとに loop.call_later でコールバックを予約し、予定時刻から実際に呼ばれるまでの
+遅れ（ループを塞いでいた処理の長さ）をヒストグラムに記録する。
+"""
+from typing import Optional
+import asyncio
+
+from .metrics import Histogram, metrics
+
+
+class EventLoopLagMonitor:
+    """
+    イベントループの遅延を定期的に計測する
+
+    Args:
+        interval: 計測の間隔（秒）
+        histogram: 遅延を記録するヒストグラム
+    """
+
+    def __init__(self, histogram: Histogram, interval: float = 0.5):
+        self.histogram = histogram
+        self.interval: float = interval
+        self.last_lag: float = 0.0
+        self.max_lag: float = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._expected: float = 0.0
+
+    def start(self) -> None:
+        """計測を開始（実行中のイベントループ上で呼ぶ）"""
+        if self._handle is not None or self.interval <= 0:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._schedule()
+
+    def stop(self) -> None:
+        """計測を停止"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self) -> None:
+        self._expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_later(self.interval, self._on_tick)
+
+    def _on_tick(self) -> None:
+        lag = max(0.0, self._loop.time() - self._expected)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.histogram.observe(lag)
+        self._schedule()
+
+
+# グローバルインスタンス
+loop_lag_monitor = EventLoopLagMonitor(
+    metrics.histogram(
+        "poker_event_loop_lag_seconds",
+        "Delay between when a periodic event-loop callback was due and when it ran",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+)
+metrics.gauge(
+    "poker_event_loop_lag_last_seconds",
+    "Most recent event-loop lag sample",
+    collector=lambda: [({}, loop_lag_monitor.last_lag)],
+)
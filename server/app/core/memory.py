@@ -0,0 +1,56 @@
+"""
+オブジェクトのメモリ使用量の概算
+ゲームごとのメモリ計測（ライフサイクル管理の統計）に使う。
+"""
+from collections import deque
+from enum import Enum
+from typing import Any, Optional, Set
+import sys
+import types
+
+# 共有されていて個々のオブジェクトの持ち物とはみなさない型
+_SHARED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType, Enum,
+)
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    objから辿れるオブジェクトの合計サイズ（バイト）を概算する
+
+    dict / list / tuple / set / deque、__dict__ と __slots__ の属性を辿る。
+    クラス・モジュール・関数・Enumの値は共有物として数えない。同じオブジェクトは1回だけ数える。
+
+    Args:
+        obj: 対象のオブジェクト
+        seen: 計測済みのオブジェクトのid（複数の対象で重複を除く場合に共有する）
+
+    Returns:
+        int: 合計サイズ（バイト）
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, _SHARED_TYPES) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, _ATOMIC_TYPES):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for cls in type(current).__mro__:
+            slots = getattr(cls, "__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if hasattr(current, name):
+                    stack.append(getattr(current, name))
+    return total
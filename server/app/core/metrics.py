@@ -0,0 +1,201 @@
+"""
+プロセス内のメトリクス（Prometheus テキスト形式）
+計測する側はカウンタの加算やヒストグラムのバケット更新だけを行い、テキストへの変換は
+/metrics がスクレイプされたときだけ行う。ゲーム数など数えるのが高くつく値は、
+スクレイプ時に呼ばれるコレクタで集計する。
+"""
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import math
+import time
+
+# (ラベル, 値) の組。ラベルのない値は空の dict
+Sample = Tuple[Dict[str, str], float]
+# スクレイプ時に値を返す関数
+Collector = Callable[[], Iterable[Sample]]
+
+# 秒単位の処理時間用の既定のバケット
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+class Counter:
+    """単調増加するカウンタ"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {_format_value(self.value)}"]
+
+
+class Gauge:
+    """
+    増減する値（set で設定するか、スクレイプ時に collector で集計する）
+
+    Args:
+        name: メトリクス名
+        help: 説明
+        collector: スクレイプ時に (ラベル, 値) を返す関数（Noneなら set した値）
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, collector: Optional[Collector] = None):
+        self.name = name
+        self.help = help
+        self.value: float = 0
+        self.collector = collector
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self) -> List[str]:
+        if self.collector is None:
+            return [f"{self.name} {_format_value(self.value)}"]
+        return [
+            f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+            for labels, value in self.collector()
+        ]
+
+
+class Histogram:
+    """
+    固定バケットのヒストグラム（観測はバケットのカウンタを1つ増やすだけ）
+
+    Args:
+        name: メトリクス名
+        help: 説明
+        buckets: バケットの上限（昇順、+Inf は自動で追加）
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # 最後の要素は +Inf（どのバケットにも入らない値）
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), self._counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(self.sum)}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class RateMeter:
+    """
+    直近 window 秒の発生数から毎秒の発生率を求める（1秒ごとのバケットに数える）
+
+    Args:
+        window: 率を求める期間（秒）
+    """
+
+    def __init__(self, window: int = 60):
+        self.window: int = max(1, window)
+        self._buckets: Deque[List[int]] = deque()  # [秒, 件数]
+
+    def mark(self, count: int = 1) -> None:
+        second = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += count
+            return
+        self._buckets.append([second, count])
+        while self._buckets[0][0] <= second - self.window:
+            self._buckets.popleft()
+
+    def rate(self) -> float:
+        """直近 window 秒の1秒あたりの件数"""
+        since = int(time.monotonic()) - self.window
+        return sum(count for second, count in self._buckets if second > since) / self.window
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """メトリクスの登録と Prometheus テキスト形式への変換"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        """カウンタを登録"""
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str, collector: Optional[Collector] = None) -> Gauge:
+        """ゲージを登録（collector を渡すとスクレイプ時に集計する）"""
+        return self._register(Gauge(name, help, collector))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """ヒストグラムを登録"""
+        return self._register(Histogram(name, help, buckets))
+
+    def unregister(self, name: str) -> None:
+        """メトリクスの登録を解除"""
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """
+        全メトリクスを Prometheus テキスト形式（version 0.0.4）にする
+
+        Returns:
+            str: /metrics のレスポンス本文
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        lines.append("")
+        return "\n".join(lines)
+
+
+# グローバルインスタンス
+metrics = MetricsRegistry()
@@ -0,0 +1,196 @@
+"""
+階層型タイマーホイール
+大量のタイマー（ターン制限時間、ブラインドレベル、アイドル検出など）を
+1つのasyncioタスクで駆動する。登録・キャンセルはO(1)。
+"""
+from typing import Any, Callable, List, Optional, Set
+import asyncio
+import inspect
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """登録済みタイマーのハンドル（cancel()でO(1)キャンセル）"""
+
+    __slots__ = ("expires_tick", "callback", "args", "cancelled", "_bucket")
+
+    def __init__(self, expires_tick: int, callback: Callable[..., Any], args: tuple):
+        self.expires_tick: int = expires_tick
+        self.callback: Callable[..., Any] = callback
+        self.args: tuple = args
+        self.cancelled: bool = False
+        self._bucket: Optional[Set["TimerHandle"]] = None
+
+    def cancel(self) -> None:
+        """タイマーをキャンセル"""
+        self.cancelled = True
+        if self._bucket is not None:
+            self._bucket.discard(self)
+            self._bucket = None
+
+
+class HierarchicalTimerWheel:
+    """
+    階層型タイマーホイール
+
+    レベル0は1tickごとのスロット、レベルnは wheel_size**n tickごとのスロットを持つ。
+    上位レベルのタイマーは下位レベルが一周するたびに下位へ振り直される（カスケード）。
+
+    Args:
+        tick: 1tickの秒数
+        wheel_size: 1レベルあたりのスロット数（2のべき乗）
+        levels: レベル数（tick * wheel_size**levels 秒先まで登録可能）
+    """
+
+    def __init__(self, tick: float = 0.1, wheel_size: int = 64, levels: int = 4):
+        if wheel_size & (wheel_size - 1):
+            raise ValueError("wheel_size must be a power of two")
+        self.tick: float = tick
+        self.wheel_size: int = wheel_size
+        self.levels: int = levels
+        self._bits: int = wheel_size.bit_length() - 1
+        self._mask: int = wheel_size - 1
+        self._wheels: List[List[Set[TimerHandle]]] = [
+            [set() for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self.current_tick: int = 0
+
+    def __len__(self) -> int:
+        """登録中（未発火・未キャンセル）のタイマー数"""
+        return sum(len(bucket) for wheel in self._wheels for bucket in wheel)
+
+    @property
+    def max_delay(self) -> float:
+        """登録可能な最大遅延（秒）"""
+        return self.tick * (self.wheel_size ** self.levels - 1)
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """
+        delay秒後にcallback(*args)を呼ぶタイマーを登録する
+
+        Returns:
+            TimerHandle: キャンセル用のハンドル
+        """
+        ticks = max(1, math.ceil(delay / self.tick))
+        ticks = min(ticks, self.wheel_size ** self.levels - 1)
+        handle = TimerHandle(self.current_tick + ticks, callback, args)
+        self._insert(handle)
+        return handle
+
+    def _insert(self, handle: TimerHandle) -> None:
+        """残りtick数に応じたレベル・スロットにタイマーを置く"""
+        remaining = handle.expires_tick - self.current_tick
+        level = 0
+        while level < self.levels - 1 and remaining >= (1 << (self._bits * (level + 1))):
+            level += 1
+        slot = (handle.expires_tick >> (self._bits * level)) & self._mask
+        bucket = self._wheels[level][slot]
+        bucket.add(handle)
+        handle._bucket = bucket
+
+    def advance(self, ticks: int = 1) -> List[TimerHandle]:
+        """
+        ホイールをticks分進め、期限切れになったタイマーを返す
+
+        コールバックの実行は呼び出し側で行う。
+        """
+        expired: List[TimerHandle] = []
+        for _ in range(ticks):
+            self.current_tick += 1
+            self._cascade()
+            bucket = self._wheels[0][self.current_tick & self._mask]
+            if bucket:
+                for handle in bucket:
+                    handle._bucket = None
+                expired.extend(bucket)
+                bucket.clear()
+        return expired
+
+    def _cascade(self) -> None:
+        """下位レベルが一周したら上位レベルの該当スロットを振り直す"""
+        for level in range(1, self.levels):
+            if (self.current_tick >> (self._bits * (level - 1))) & self._mask:
+                break
+            slot = (self.current_tick >> (self._bits * level)) & self._mask
+            bucket = self._wheels[level][slot]
+            if not bucket:
+                continue
+            handles = list(bucket)
+            bucket.clear()
+            for handle in handles:
+                self._insert(handle)
+
+
+class TimerWheelScheduler:
+    """
+    タイマーホイールを1つのasyncioタスクで駆動するスケジューラ
+
+    コールバックが非同期関数の場合はタスクとして実行する。
+    """
+
+    def __init__(self, tick: float = 0.1, wheel_size: int = 64, levels: int = 4):
+        self.wheel = HierarchicalTimerWheel(tick=tick, wheel_size=wheel_size, levels=levels)
+        self._task: Optional[asyncio.Task] = None
+        # 実行中の非同期コールバック（完了まで参照を保持する）
+        self._callbacks: Set[asyncio.Future] = set()
+
+    @property
+    def is_running(self) -> bool:
+        """駆動タスクが動作中かどうか"""
+        return self._task is not None and not self._task.done()
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """delay秒後にcallback(*args)を実行する"""
+        return self.wheel.schedule(delay, callback, *args)
+
+    def start(self) -> None:
+        """駆動タスクを開始"""
+        if not self.is_running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """駆動タスクを停止"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """経過時間に合わせてホイールを進め、期限切れのタイマーを実行する"""
+        loop = asyncio.get_running_loop()
+        tick = self.wheel.tick
+        # 再開時も現在のtickから続けて進める
+        started = loop.time() - self.wheel.current_tick * tick
+        while True:
+            await asyncio.sleep(tick)
+            target_tick = int((loop.time() - started) / tick)
+            behind = target_tick - self.wheel.current_tick
+            if behind <= 0:
+                continue
+            for handle in self.wheel.advance(behind):
+                if not handle.cancelled:
+                    self._fire(handle)
+
+    def _fire(self, handle: TimerHandle) -> None:
+        """タイマーのコールバックを実行"""
+        try:
+            result = handle.callback(*handle.args)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._callbacks.add(task)
+                task.add_done_callback(self._on_callback_done)
+        except Exception as e:
+            logger.error(f"Timer callback failed: {e}", exc_info=True)
+
+    def _on_callback_done(self, task: asyncio.Future) -> None:
+        """非同期コールバックの参照を外し、例外をログに出す"""
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Timer callback failed: {task.exception()}")
@@ -6,9 +6,11 @@ from .table import Table, Pot
 from .action import PlayerAction
 from .enum import Round, GameStatus, ActionType, Position, SeatStatus
 from .game_state import GameState
+from .tournament import Tournament, BlindLevel, TableMove
 
 __all__ = [
     "Deck", "Card", "Player", "Seat", "Table", 
     "Pot", "PlayerAction", "GameState",
+    "Tournament", "BlindLevel", "TableMove",
     "Round", "GameStatus", "ActionType", "Position", "SeatStatus"
 ]
\ No newline at end of file
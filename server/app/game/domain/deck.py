@@ -1,11 +1,18 @@
 # app/game/domain/deck.py
 import random
-from typing import List
+from typing import List, Tuple
 from treys import Card as TreysCard
 
 
 class Card:
-    
+    """
+    トランプ1枚（不変）
+
+    52枚は FULL_DECK としてプロセスで1組だけ作り、全テーブルのデッキで共有する。
+    """
+
+    __slots__ = ("rank", "suit", "_treys_int")
+
     rank_order = "23456789TJQKA"
     suit_map = {"s": "♠", "h": "♥", "d": "♦", "c": "♣"}
 
@@ -17,6 +24,7 @@ class Card:
 
         self.rank = rank
         self.suit = suit
+        self._treys_int: int = TreysCard.new(rank + suit)
 
     def __str__(self) -> str:
         return f"{self.rank}{self.suit_map[self.suit]}"
@@ -25,17 +33,31 @@ class Card:
         return f"Card('{self.rank}', '{self.suit}')"
 
     def to_treys_int(self) -> int:
-        return TreysCard.new(self.rank + self.suit)
+        return self._treys_int
+
+
+# 全テーブルで共有する52枚（ハンドごとに Card を作り直さない）
+FULL_DECK: Tuple[Card, ...] = tuple(
+    Card(rank, suit)
+    for suit in Card.suit_map.keys()
+    for rank in Card.rank_order
+)
 
 
 class Deck:
+    """
+    52枚のデッキ
+
+    カードのリストはハンドをまたいで使い回し、reset で FULL_DECK から並べ直す。
+    """
 
     def __init__(self):
-        self.cards: List[Card] = [
-            Card(rank, suit)
-            for suit in Card.suit_map.keys()
-            for rank in Card.rank_order
-        ]
+        self.cards: List[Card] = list(FULL_DECK)
+        self.shuffle()
+
+    def reset(self) -> None:
+        """52枚を戻してシャッフル（新しいハンド用）"""
+        self.cards[:] = FULL_DECK
         self.shuffle()
 
     def shuffle(self):
@@ -47,5 +69,5 @@ class Deck:
         if n > len(self.cards):
             raise ValueError("Not enough cards in the deck")
         drawn = self.cards[:n]
-        self.cards = self.cards[n:]
+        del self.cards[:n]
         return drawn
@@ -10,16 +10,27 @@ import uuid
 
 class GameState:
     """ゲーム全体の進行状態を管理するクラス"""
-    def __init__(self, big_blind: int=100, small_blind: int=50, seat_count: int=3):
+    def __init__(
+        self,
+        big_blind: int=100,
+        small_blind: int=50,
+        seat_count: int=3,
+        run_it_times: int=1,
+        table: Optional[Table]=None
+    ):
         self.id: str = str(uuid.uuid4())
+        self.version: int = 0  # 状態が変わるたびに増える（差分配信の基準）
+        self.hand_number: int = 0  # 開始したハンドの通し番号（タイマーなどがハンドを識別する）
         self.history: list[PlayerAction] = []
         self.status: GameStatus = GameStatus.WAITING
         self.players: List[Player] = []
-        self.table: Table = Table(seat_count=seat_count)
+        self.table: Table = table if table is not None else Table(seat_count=seat_count)
         self.current_round: Round = Round.PREFLOP
         
         self.big_blind: int = big_blind
         self.small_blind: int = small_blind
+        self.run_it_times: int = run_it_times  # オールイン時にボードを何回走らせるか
+        self.ai_time_budget: Optional[float] = None  # AIの1決定あたりの時間予算（秒、Noneはサービス既定）
 
         self.dealer_seat_index: Optional[int] = None
         self.small_blind_seat_index: Optional[int] = None
@@ -30,10 +41,44 @@ class GameState:
         self.current_bet: int = 0       # 現在のベット額
         self.min_raise_amount: int = 0  # 最小レイズ額(総額)
         self.last_raise_delta: int = 0  # 最後のレイズ幅
+        self.bets_in_round: int = 0     # このラウンドのベット/レイズ回数（ブラインドは含まない）
 
         self.winners: List[Dict[str, Any]] = []
         self.valid_actions: List[Dict[str, Any]] = []
 
+    def reset(self, big_blind: int=100, small_blind: int=50, seat_count: int=3, run_it_times: int=1) -> None:
+        """
+        作成直後の状態に戻す（プールから再利用するとき）
+
+        座席数が同じならテーブル（デッキ・座席・ポット）を空にして使い回す。
+        """
+        table = self.table if len(self.table.seats) == seat_count else None
+        if table is not None:
+            table.reset()
+        self.__dict__.clear()
+        GameState.__init__(self, big_blind, small_blind, seat_count, run_it_times, table=table)
+
+    def snapshot(self) -> "GameState":
+        """
+        AIの決定に渡す読み取り用のコピー
+
+        座席・ホールカード・ボード・ポット・ベット・ラウンドだけを写し、アクション履歴・山札・
+        プレイヤー一覧・勝者は含まない（大きさは座席数にだけ比例する）。
+        """
+        game = GameState.__new__(GameState)
+        game.__dict__.update(self.__dict__)
+        game.history = []
+        game.players = []
+        game.winners = []
+        game.valid_actions = []
+        game.table = self.table.snapshot()
+        return game
+
+    def touch(self) -> int:
+        """状態の変更を記録してバージョンを進める"""
+        self.version += 1
+        return self.version
+
     def get_player_by_id(self, player_id: str) -> Optional[Player]:
        """player_idからプレイヤーオブジェクトを検索する"""
        for player in self.players:
@@ -45,6 +90,7 @@ class GameState:
         """セッションにプレイヤーを追加する"""
         if player not in self.players:
             self.players.append(player)
+            self.touch()
             try:
                 print(f"GameState.add_player: added player id={player.id} name={player.name} total_players={len(self.players)}")
             except Exception:
@@ -59,6 +105,7 @@ class GameState:
                 if seat.player and seat.player.id == player_to_remove.id:
                     seat.stand_up()
                     break
+            self.touch()
             try:
                 self.players.remove(player_to_remove)
                 print(f"GameState.remove_player_by_id: removed player id={player_to_remove.id} t_id={player_id} total_players={len(self.players)}")
@@ -83,6 +130,7 @@ class GameState:
         self.amount_to_call = 0
         self.min_raise_amount = self.big_blind
         self.last_raise_delta = self.big_blind
+        self.bets_in_round = 0
     
     def add_action(self, player_id: str, action_type: ActionType, amount: Optional[int] = None):
         """アクションを履歴に追加する"""
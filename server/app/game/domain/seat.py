@@ -52,6 +52,7 @@ class Seat:
     def clear_for_new_hand(self) -> None:
         """新しいハンドのために座席の状態をリセットする"""
         self.hole_cards.clear()
+        self.show_hand = False
         self.bet_in_round = 0
         self.bet_in_hand = 0
         if self.is_occupied:
@@ -76,7 +77,8 @@ class Seat:
         self.player = None
         self.stack = 0
         self.status = SeatStatus.EMPTY
-        self.hole_cards = []
+        self.hole_cards.clear()
+        self.show_hand = False
         self.bet_in_round = 0
         self.bet_in_hand = 0
    
@@ -86,4 +88,22 @@ class Seat:
             raise ValueError(f"Seat {self.index} is empty")
         if len(cards) != 2:
             raise ValueError("A player must receive exactly two hole cards")
-        self.hole_cards = cards
\ No newline at end of file
+        # 座席のリストを使い回す
+        self.hole_cards[:] = cards
+
+    def snapshot(self) -> "Seat":
+        """読み取り用のコピー（プレイヤーはID・名前・AIかどうかだけを写す）"""
+        seat = Seat.__new__(Seat)
+        seat.__dict__.update(self.__dict__)
+        seat.hole_cards = list(self.hole_cards)
+        if self.player is not None:
+            seat.player = Player(self.player.id, self.player.name, self.player.is_ai)
+        return seat
+
+    def reset(self) -> None:
+        """作成直後の空席に戻す（テーブルを再利用するとき）"""
+        self.stand_up()
+        self.position = None
+        self.last_action = None
+        self.acted = False
+        self.hand_score = 9999
\ No newline at end of file
@@ -14,12 +14,36 @@ class Pot:
         self.amount: int = 0
         self.eligible_seats: List[int] = []
 
+    def reset(self) -> None:
+        """空のポットに戻す（リストは使い回す）"""
+        self.amount = 0
+        self.eligible_seats.clear()
+
+    def snapshot(self) -> "Pot":
+        """読み取り用のコピー"""
+        pot = Pot.__new__(Pot)
+        pot.amount = self.amount
+        pot.eligible_seats = list(self.eligible_seats)
+        return pot
+
 class Table:
     def __init__(self, seat_count: int = 3):
         self.deck = Deck()
         self.seats: List[Seat] = [Seat(index=i, player=None) for i in range(seat_count)]
         self.community_cards: List[Card] = []
+        self.runouts: List[List[Card]] = []  # ラン・イット・N回時の各ボード
         self.pots: List[Pot] = [Pot()]
+
+    def snapshot(self) -> "Table":
+        """読み取り用のコピー（山札は含まない）"""
+        table = Table.__new__(Table)
+        table.deck = Deck.__new__(Deck)
+        table.deck.cards = []
+        table.seats = [seat.snapshot() for seat in self.seats]
+        table.community_cards = list(self.community_cards)
+        table.runouts = [list(board) for board in self.runouts]
+        table.pots = [pot.snapshot() for pot in self.pots]
+        return table
         
     @property
     def total_pot(self) -> int:
@@ -44,15 +68,30 @@ class Table:
     @property
     def is_betting_over(self) -> bool:
         """以降ベッティングが存在するかどうか"""
-        return len(self.active_seats()) == 1
+        return len(self.active_seats()) <= 1
 
     def reset_for_new_hand(self):
-        """テーブルの状態を新しいハンドのためにリセットする"""
-        self.deck = Deck()
-        self.community_cards = []
-        self.pots = [Pot()]
+        """
+        テーブルの状態を新しいハンドのためにリセットする
+
+        デッキ・ボード・メインポットはハンドをまたいで使い回し、サイドポットだけを捨てる。
+        """
+        self.deck.reset()
+        self.community_cards.clear()
+        self.runouts.clear()
+        if self.pots:
+            self.pots[0].reset()
+            del self.pots[1:]
+        else:
+            self.pots.append(Pot())
         for seat in self.seats:
             seat.clear_for_new_hand()
+
+    def reset(self) -> None:
+        """全員を立たせて空のテーブルに戻す（GameState をプールから再利用するとき）"""
+        for seat in self.seats:
+            seat.reset()
+        self.reset_for_new_hand()
     
     def reset_for_new_round(self):
         """テーブルの状態を新しいベッティングラウンドのためにリセットする"""
@@ -0,0 +1,100 @@
+# app/game/domain/tournament.py
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass, field
+import uuid
+from .game_state import GameState
+
+
+@dataclass(frozen=True)
+class BlindLevel:
+    """トーナメントのブラインドレベル"""
+    small_blind: int
+    big_blind: int
+
+
+@dataclass(frozen=True)
+class TableMove:
+    """テーブル間のプレイヤー移動を表すクラス"""
+    player_id: str
+    from_table_id: str
+    to_table_id: str
+    seat_index: int
+
+
+class Tournament:
+    """マルチテーブルトーナメントの状態を管理するクラス
+
+    テーブルごとの着席人数は増分で管理し、人数ごとのバケット
+    (count_buckets) を持つことで、最少/最多テーブルの検索を
+    テーブルあたりの座席数に比例する時間で行う。
+    """
+    def __init__(
+        self,
+        seats_per_table: int = 9,
+        starting_stack: int = 10000,
+        blind_levels: Optional[List[BlindLevel]] = None,
+        level_interval: float = 0.0
+    ):
+        self.id: str = str(uuid.uuid4())
+        self.seats_per_table: int = seats_per_table
+        self.starting_stack: int = starting_stack
+        self.blind_levels: List[BlindLevel] = blind_levels or [BlindLevel(50, 100)]
+        self.level_interval: float = level_interval  # ブラインドレベルの長さ（秒、0で上げない）
+        self.level_index: int = 0
+
+        self.tables: Dict[str, GameState] = {}
+        self.player_table: Dict[str, str] = {}      # player_id -> table_id
+        self.table_counts: Dict[str, int] = {}      # table_id -> 着席人数
+        self.table_levels: Dict[str, int] = {}      # table_id -> 適用済みのブラインドレベル
+        self.count_buckets: Dict[int, Set[str]] = {
+            count: set() for count in range(seats_per_table + 1)
+        }
+
+        self.finished_player_ids: List[str] = []    # 敗退順
+        self.is_started: bool = False
+        self.is_finished: bool = False
+
+    @property
+    def current_level(self) -> BlindLevel:
+        """現在のブラインドレベルを返す"""
+        return self.blind_levels[min(self.level_index, len(self.blind_levels) - 1)]
+
+    @property
+    def remaining_players(self) -> int:
+        """残りプレイヤー数"""
+        return len(self.player_table)
+
+    def add_table(self, table_id: str, game: GameState) -> None:
+        """テーブルを登録する"""
+        self.tables[table_id] = game
+        self.table_counts[table_id] = 0
+        self.table_levels[table_id] = -1
+        self.count_buckets[0].add(table_id)
+
+    def remove_table(self, table_id: str) -> None:
+        """テーブルを登録解除する"""
+        count = self.table_counts.pop(table_id)
+        self.count_buckets[count].discard(table_id)
+        self.table_levels.pop(table_id, None)
+        self.tables.pop(table_id, None)
+
+    def change_count(self, table_id: str, delta: int) -> None:
+        """テーブルの着席人数を増減し、バケットを更新する"""
+        count = self.table_counts[table_id]
+        self.count_buckets[count].discard(table_id)
+        count += delta
+        self.table_counts[table_id] = count
+        self.count_buckets[count].add(table_id)
+
+    def smallest_table_id(self, exclude: Optional[str] = None) -> Optional[str]:
+        """着席人数が最も少ないテーブルIDを返す（空テーブルは除く）"""
+        for count in range(1, self.seats_per_table + 1):
+            for table_id in self.count_buckets[count]:
+                if table_id != exclude:
+                    return table_id
+        return None
+
+    def smallest_count(self, exclude: Optional[str] = None) -> int:
+        """着席人数の最小値を返す（空テーブルは除く）"""
+        table_id = self.smallest_table_id(exclude)
+        return self.table_counts[table_id] if table_id is not None else 0
@@ -0,0 +1,79 @@
+"""情報集合の抽象化 - (GameState, Seat) を正規化したキーに変換する"""
+from typing import Optional, Tuple
+from treys import Evaluator
+from ..domain.game_state import GameState
+from ..domain.seat import Seat
+from ..domain.enum import Round
+from .cfr import card_bucket
+
+# (ストリート, ポジション, ハンド強度, ポットオッズ, 相手の人数, レイズ可否, SPR)
+InfoSetKey = Tuple[int, ...]
+
+_STREET_INDEX = {
+    Round.PREFLOP: 0,
+    Round.FLOP: 1,
+    Round.TURN: 2,
+    Round.RIVER: 3,
+}
+
+POT_ODDS_BUCKETS = 8
+MAX_OPPONENTS_BUCKET = 3
+
+
+class InfoSetAbstraction:
+    """
+    ゲーム状態を粗くバケット化し、実質的に同じ判断になる局面を同じキーにまとめる
+
+    - ハンド強度: cfr.py と同じカードバケット（8段階）
+    - ポジション: ボタンからの相対位置を アーリー/ミドル/レイト の3段階
+    - ポットオッズ: コール不要なら0、それ以外は8段階
+    - 相手の人数: 1〜3（3人以上は3）
+    - SPR（スタック/ポット）: 1未満 / 4未満 / それ以上
+    """
+
+    def __init__(self) -> None:
+        self.evaluator = Evaluator()
+
+    def key(self, game: GameState, seat: Seat) -> Optional[InfoSetKey]:
+        """
+        情報集合のキーを求める
+
+        Args:
+            game: ゲーム状態
+            seat: 手番の座席
+
+        Returns:
+            Optional[InfoSetKey]: キー（ホールカードがない場合などは None）
+        """
+        street = _STREET_INDEX.get(game.current_round)
+        if street is None or len(seat.hole_cards) != 2:
+            return None
+
+        seats = game.table.seats
+        hole = [card.to_treys_int() for card in seat.hole_cards]
+        board = [card.to_treys_int() for card in game.table.community_cards]
+        hand_bucket = card_bucket(hole, board, self.evaluator)
+
+        pot = game.table.total_pot + sum(s.bet_in_round for s in seats)
+        call_amount = max(game.current_bet - seat.bet_in_round, 0)
+        if call_amount > 0:
+            pot_odds = call_amount / (pot + call_amount)
+            odds_bucket = 1 + min(int(pot_odds * POT_ODDS_BUCKETS), POT_ODDS_BUCKETS - 1)
+        else:
+            odds_bucket = 0
+
+        dealer = game.dealer_seat_index if game.dealer_seat_index is not None else 0
+        relative = (seat.index - dealer - 1) % len(seats)
+        position = min(3 * relative // max(len(seats) - 1, 1), 2)
+
+        opponents = min(len(game.table.in_hand_seats()) - 1, MAX_OPPONENTS_BUCKET)
+
+        if game.current_bet == 0:
+            can_raise = seat.stack > 0
+        else:
+            can_raise = not seat.acted and seat.stack + seat.bet_in_round > game.current_bet
+
+        spr = seat.stack / pot if pot > 0 else float("inf")
+        spr_bucket = 0 if spr < 1 else (1 if spr < 4 else 2)
+
+        return (street, position, hand_bucket, odds_bucket, opponents, int(can_raise), spr_bucket)
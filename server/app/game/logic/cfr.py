@@ -0,0 +1,240 @@
+"""ヘッズアップCFR戦略の抽象化（カードバケット/ベットサイズ）と戦略テーブル
+
+学習は cfr_trainer.py で行い、本モジュールは対局中の O(1) 参照に必要なものだけを持つ。
+"""
+from typing import Dict, List, Optional, Tuple
+import mmap
+import random
+import struct
+import numpy as np
+from treys import Card as TreysCard, Evaluator
+from ..domain.game_state import GameState
+from ..domain.seat import Seat
+from ..domain.enum import Round
+
+# --- 抽象化の定義（学習側と対局側で共有する） ---
+
+NUM_STREETS = 4
+NUM_BUCKETS = 8
+MAX_BETS = 3  # 1ストリートのベット/レイズ回数の上限（プリフロップはBBを1回と数える）
+
+ABSTRACT_FOLD = 0
+ABSTRACT_CALL = 1       # チェックまたはコール
+ABSTRACT_HALF_POT = 2   # コール後のポットの1/2を上乗せ
+ABSTRACT_POT = 3        # コール後のポットと同額を上乗せ
+ABSTRACT_ALL_IN = 4
+NUM_ABSTRACT_ACTIONS = 5
+
+BET_FRACTIONS: Dict[int, float] = {ABSTRACT_HALF_POT: 0.5, ABSTRACT_POT: 1.0}
+
+NUM_INFOSETS = NUM_STREETS * 2 * (MAX_BETS + 1) * 2 * NUM_BUCKETS
+
+_STREET_INDEX: Dict[Round, int] = {
+    Round.PREFLOP: 0,
+    Round.FLOP: 1,
+    Round.TURN: 2,
+    Round.RIVER: 3,
+}
+
+# フロップ以降のバケット境界（treys の評価値がこれより大きければ弱い側のバケット）
+# ハイカード(弱/強)、ワンペア(8以下/9以上)、ツーペア、スリーカード、ストレート/フラッシュ、フルハウス以上
+_POSTFLOP_BOUNDS: Tuple[int, ...] = (6680, 6185, 4645, 3325, 2467, 1609, 322)
+
+
+def infoset_index(street: int, is_button: bool, bets: int, facing_bet: bool, bucket: int) -> int:
+    """
+    情報集合を戦略テーブルの行番号に変換する（算術のみ、O(1)）
+
+    Args:
+        street: 0=プリフロップ 〜 3=リバー
+        is_button: ボタン（ヘッズアップではSB、ポストフロップで後に行動）かどうか
+        bets: このストリートのベット/レイズ回数（0〜MAX_BETS）
+        facing_bet: コールが必要かどうか
+        bucket: カードバケット（0〜NUM_BUCKETS-1）
+
+    Returns:
+        int: 行番号
+    """
+    index = street * 2 + (1 if is_button else 0)
+    index = index * (MAX_BETS + 1) + min(bets, MAX_BETS)
+    index = index * 2 + (1 if facing_bet else 0)
+    return index * NUM_BUCKETS + bucket
+
+
+def _preflop_strength(high: int, low: int, suited: bool) -> float:
+    """プリフロップの簡易ハンド強度（ランクは0=2〜12=A）"""
+    if high == low:
+        return 0.5 + 0.5 * high / 12
+    strength = 0.35 * high / 12 + 0.15 * low / 12
+    if suited:
+        strength += 0.06
+    gap = high - low
+    if gap == 1:
+        strength += 0.04
+    elif gap == 2:
+        strength += 0.02
+    return min(strength, 1.0)
+
+
+def _build_preflop_buckets() -> Dict[Tuple[int, int, bool], int]:
+    """169種類のスターティングハンドを組み合わせ数で重み付けして等頻度にバケット化"""
+    hands = []
+    for high in range(13):
+        for low in range(high + 1):
+            if high == low:
+                hands.append(((high, low, False), 6))
+            else:
+                hands.append(((high, low, True), 4))
+                hands.append(((high, low, False), 12))
+    hands.sort(key=lambda item: _preflop_strength(*item[0]))
+
+    buckets = {}
+    cumulative = 0
+    for key, combos in hands:
+        midpoint = (cumulative + combos / 2) / 1326
+        buckets[key] = min(int(midpoint * NUM_BUCKETS), NUM_BUCKETS - 1)
+        cumulative += combos
+    return buckets
+
+
+_PREFLOP_BUCKETS = _build_preflop_buckets()
+
+
+def preflop_bucket(hole: List[int]) -> int:
+    """treys表現のホールカード2枚からプリフロップのバケットを求める"""
+    first_rank = TreysCard.get_rank_int(hole[0])
+    second_rank = TreysCard.get_rank_int(hole[1])
+    suited = TreysCard.get_suit_int(hole[0]) == TreysCard.get_suit_int(hole[1])
+    high, low = max(first_rank, second_rank), min(first_rank, second_rank)
+    return _PREFLOP_BUCKETS[(high, low, suited and high != low)]
+
+
+def postflop_bucket(score: int) -> int:
+    """treys の評価値（低いほど強い）からフロップ以降のバケットを求める"""
+    for bucket, bound in enumerate(_POSTFLOP_BOUNDS):
+        if score > bound:
+            return bucket
+    return NUM_BUCKETS - 1
+
+
+def card_bucket(hole: List[int], board: List[int], evaluator: Evaluator) -> int:
+    """
+    ホールカードと公開済みボード（treys表現）からカードバケットを求める
+
+    Args:
+        hole: ホールカード2枚
+        board: ボード（0枚または3〜5枚）
+        evaluator: treys Evaluator（HandEvaluator.evaluator を渡す）
+
+    Returns:
+        int: バケット（0〜NUM_BUCKETS-1、大きいほど強い）
+    """
+    if len(board) < 3:
+        return preflop_bucket(hole)
+    return postflop_bucket(evaluator.evaluate(board, hole))
+
+
+def infoset_from_game(game: GameState, seat: Seat, evaluator: Evaluator) -> Optional[int]:
+    """
+    実際のゲーム状態を抽象化した情報集合の行番号に変換する
+
+    Args:
+        game: ゲーム状態（ヘッズアップ）
+        seat: 手番の座席
+        evaluator: treys Evaluator
+
+    Returns:
+        Optional[int]: 行番号（ショーダウン中などで抽象化できない場合は None）
+    """
+    street = _STREET_INDEX.get(game.current_round)
+    if street is None or len(seat.hole_cards) != 2:
+        return None
+
+    bets = game.bets_in_round + (1 if street == 0 else 0)
+    hole = [card.to_treys_int() for card in seat.hole_cards]
+    board = [card.to_treys_int() for card in game.table.community_cards]
+    return infoset_index(
+        street,
+        seat.index == game.dealer_seat_index,
+        bets,
+        game.current_bet > seat.bet_in_round,
+        card_bucket(hole, board, evaluator)
+    )
+
+
+# --- 戦略テーブル（ファイル形式） ---
+
+# ヘッダー: マジック, バケット数, ベット上限, アクション数, 予約（16バイト）
+STRATEGY_MAGIC = b"PKCFR1"
+_HEADER = struct.Struct("<6sHHHxxxxxx")
+HEADER_SIZE = _HEADER.size
+
+
+def write_strategy_file(path: str, average_strategy: np.ndarray) -> None:
+    """
+    平均戦略を uint8 に量子化して戦略ファイルに書き出す
+
+    Args:
+        path: 出力先
+        average_strategy: (NUM_INFOSETS, NUM_ABSTRACT_ACTIONS) の確率（行ごとに合計1）
+    """
+    if average_strategy.shape != (NUM_INFOSETS, NUM_ABSTRACT_ACTIONS):
+        raise ValueError(f"戦略の形が不正です: {average_strategy.shape}")
+    quantized = np.rint(np.clip(average_strategy, 0.0, 1.0) * 255).astype(np.uint8)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(STRATEGY_MAGIC, NUM_BUCKETS, MAX_BETS, NUM_ABSTRACT_ACTIONS))
+        f.write(quantized.tobytes())
+
+
+class StrategyTable:
+    """
+    mmapした戦略ファイルを参照するテーブル
+
+    ファイル全体は読み込まず、行番号で量子化済みの確率（uint8）を直接引く。
+    複数のAIServiceやワーカープロセスで同じファイルを開いてもページは共有される。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, buckets, max_bets, actions = _HEADER.unpack_from(self._mmap, 0)
+        if magic != STRATEGY_MAGIC:
+            raise ValueError(f"戦略ファイルではありません: {path}")
+        if (buckets, max_bets, actions) != (NUM_BUCKETS, MAX_BETS, NUM_ABSTRACT_ACTIONS):
+            raise ValueError(
+                f"戦略ファイルの抽象化が一致しません: buckets={buckets}, max_bets={max_bets}, actions={actions}"
+            )
+        self._table = np.frombuffer(
+            self._mmap, dtype=np.uint8, count=NUM_INFOSETS * NUM_ABSTRACT_ACTIONS, offset=HEADER_SIZE
+        ).reshape(NUM_INFOSETS, NUM_ABSTRACT_ACTIONS)
+
+    def __getstate__(self):
+        # プロセスプールに渡すときはパスだけを送り、ワーカー側で開き直す
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def weights(self, index: int) -> List[int]:
+        """情報集合の各抽象アクションの重み（0〜255）"""
+        return self._table[index].tolist()
+
+    def sample(self, index: int, legal: List[int], rng: Optional[random.Random] = None) -> int:
+        """
+        合法な抽象アクションに限定して戦略からアクションを1つ選ぶ
+
+        Args:
+            index: 情報集合の行番号
+            legal: 合法な抽象アクション
+            rng: 乱数生成器
+
+        Returns:
+            int: 抽象アクション（重みがすべて0なら ABSTRACT_CALL）
+        """
+        row = self._table[index]
+        weights = [int(row[action]) for action in legal]
+        if sum(weights) == 0:
+            return ABSTRACT_CALL
+        return (rng or random).choices(legal, weights=weights)[0]
@@ -0,0 +1,340 @@
+"""
+ヘッズアップ・ホールデムのオフラインCFR学習（外部サンプリングMCCFR）
+
+抽象化（カードバケット/ベットサイズ）は cfr.py の定義を使い、評価は HandEvaluator の
+treys Evaluator で行う。複数プロセスでイテレーションを分担し、定期的にチェックポイントを保存する。
+
+使い方:
+    python -m app.game.logic.cfr_trainer --iterations 200000 --workers 4 \\
+        --checkpoint cfr_checkpoint.npz --output cfr_strategy.bin
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import argparse
+import logging
+import os
+import random
+import time
+import numpy as np
+from .hand_evaluator import HandEvaluator
+from .equity import _FULL_DECK
+from .cfr import (
+    ABSTRACT_ALL_IN,
+    ABSTRACT_CALL,
+    ABSTRACT_FOLD,
+    BET_FRACTIONS,
+    MAX_BETS,
+    NUM_ABSTRACT_ACTIONS,
+    NUM_INFOSETS,
+    card_bucket,
+    infoset_index,
+    write_strategy_file,
+)
+
+logger = logging.getLogger(__name__)
+
+# 抽象ゲームのチップ単位（SB=1, BB=2）
+SMALL_BLIND = 1
+BIG_BLIND = 2
+
+
+class _Deal:
+    """1イテレーション分の配札（バケットとショーダウン結果を事前計算）"""
+
+    __slots__ = ("buckets", "showdown")
+
+    def __init__(self, evaluator, rng: random.Random):
+        cards = rng.sample(_FULL_DECK, 9)
+        holes = (cards[0:2], cards[2:4])
+        board = cards[4:9]
+        # buckets[player][street]
+        self.buckets = tuple(
+            tuple(card_bucket(hole, board[:count], evaluator) for count in (0, 3, 4, 5))
+            for hole in holes
+        )
+        scores = [evaluator.evaluate(board, hole) for hole in holes]
+        # 1ならプレイヤー0（ボタン）の勝ち、-1なら負け、0は引き分け
+        self.showdown = (scores[0] < scores[1]) - (scores[0] > scores[1])
+
+
+class MCCFRWorker:
+    """
+    外部サンプリングMCCFRでイテレーションを実行し、累積後悔と平均戦略の増分を返す
+
+    プレイヤー0がボタン（SB、プリフロップ先手）、プレイヤー1がBB。
+    """
+
+    def __init__(self, stack: int, regret_sum: np.ndarray, seed: int):
+        self.stack = stack
+        self.evaluator = HandEvaluator().evaluator
+        self.rng = random.Random(seed)
+        # 小さなベクトル演算が多いため、内部ではPythonのリストで扱う
+        self.regret_sum: List[List[float]] = regret_sum.tolist()
+        self.regret_delta: List[List[float]] = [[0.0] * NUM_ABSTRACT_ACTIONS for _ in range(NUM_INFOSETS)]
+        self.strategy_delta: List[List[float]] = [[0.0] * NUM_ABSTRACT_ACTIONS for _ in range(NUM_INFOSETS)]
+
+    def run(self, iterations: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        イテレーションを実行する（1イテレーションで両プレイヤーを1回ずつ更新）
+
+        Returns:
+            (regret_delta, strategy_delta): (NUM_INFOSETS, NUM_ABSTRACT_ACTIONS)
+        """
+        for _ in range(iterations):
+            for traverser in (0, 1):
+                deal = _Deal(self.evaluator, self.rng)
+                self._walk(deal, traverser, 0, 0, 1, 0, [SMALL_BLIND, BIG_BLIND])
+        return np.array(self.regret_delta), np.array(self.strategy_delta)
+
+    def _legal_actions(self, actor: int, bets: int, contrib: List[int]) -> List[int]:
+        """抽象アクションのうち合法なもの"""
+        to_call = contrib[1 - actor] - contrib[actor]
+        remaining = self.stack - contrib[actor]
+        legal = [ABSTRACT_FOLD] if to_call > 0 else []
+        legal.append(ABSTRACT_CALL)
+        if bets < MAX_BETS and remaining > to_call and contrib[1 - actor] < self.stack:
+            pot = contrib[0] + contrib[1] + to_call
+            for action, fraction in BET_FRACTIONS.items():
+                if to_call + max(int(pot * fraction), BIG_BLIND) < remaining:
+                    legal.append(action)
+            legal.append(ABSTRACT_ALL_IN)
+        return legal
+
+    def _strategy(self, index: int, legal: List[int]) -> List[float]:
+        """後悔マッチングで現在の戦略を求める（合法アクションの順）"""
+        regrets = self.regret_sum[index]
+        positive = [max(regrets[action], 0.0) for action in legal]
+        total = sum(positive)
+        if total > 0:
+            return [value / total for value in positive]
+        return [1.0 / len(legal)] * len(legal)
+
+    def _walk(
+        self,
+        deal: _Deal,
+        traverser: int,
+        street: int,
+        actor: int,
+        bets: int,
+        street_actions: int,
+        contrib: List[int]
+    ) -> float:
+        """ゲーム木を辿り、traverser から見た期待利得を返す"""
+        facing = contrib[1 - actor] > contrib[actor]
+        legal = self._legal_actions(actor, bets, contrib)
+        index = infoset_index(street, actor == 0, bets, facing, deal.buckets[actor][street])
+        strategy = self._strategy(index, legal)
+
+        if actor != traverser:
+            # 相手の手番: 平均戦略を蓄積し、アクションを1つサンプリング
+            accumulated = self.strategy_delta[index]
+            for action, probability in zip(legal, strategy):
+                accumulated[action] += probability
+            action = self.rng.choices(legal, weights=strategy)[0]
+            return self._apply(deal, traverser, street, actor, bets, street_actions, contrib, action)
+
+        # 自分の手番: 全アクションを展開して後悔を更新
+        utilities = [
+            self._apply(deal, traverser, street, actor, bets, street_actions, contrib, action)
+            for action in legal
+        ]
+        node_utility = sum(p * u for p, u in zip(strategy, utilities))
+        regret_delta = self.regret_delta[index]
+        regret_sum = self.regret_sum[index]
+        for action, utility in zip(legal, utilities):
+            regret_delta[action] += utility - node_utility
+            regret_sum[action] += utility - node_utility
+        return node_utility
+
+    def _apply(
+        self,
+        deal: _Deal,
+        traverser: int,
+        street: int,
+        actor: int,
+        bets: int,
+        street_actions: int,
+        contrib: List[int],
+        action: int
+    ) -> float:
+        """抽象アクションを適用して次の局面を辿る"""
+        opponent = 1 - actor
+        if action == ABSTRACT_FOLD:
+            # 降りたプレイヤーの拠出分を相手が得る
+            return -contrib[traverser] if actor == traverser else contrib[1 - traverser]
+
+        if action == ABSTRACT_CALL:
+            next_contrib = list(contrib)
+            next_contrib[actor] = contrib[opponent]
+            if street_actions == 0:
+                # プリフロップのリンプ、またはポストフロップの先手のチェック
+                return self._walk(deal, traverser, street, opponent, bets, 1, next_contrib)
+            if street == 3 or next_contrib[actor] >= self.stack:
+                return self._showdown(deal, traverser, next_contrib)
+            return self._walk(deal, traverser, street + 1, 1, 0, 0, next_contrib)
+
+        to_call = contrib[opponent] - contrib[actor]
+        remaining = self.stack - contrib[actor]
+        if action == ABSTRACT_ALL_IN:
+            added = remaining
+        else:
+            pot = contrib[0] + contrib[1] + to_call
+            added = to_call + max(int(pot * BET_FRACTIONS[action]), BIG_BLIND)
+        next_contrib = list(contrib)
+        next_contrib[actor] += added
+        return self._walk(deal, traverser, street, opponent, bets + 1, street_actions + 1, next_contrib)
+
+    @staticmethod
+    def _showdown(deal: _Deal, traverser: int, contrib: List[int]) -> float:
+        """ショーダウンの traverser から見た利得（拠出額は等しい）"""
+        result = deal.showdown if traverser == 0 else -deal.showdown
+        return result * contrib[traverser]
+
+
+def _run_worker(stack: int, regret_sum: np.ndarray, seed: int, iterations: int) -> Tuple[np.ndarray, np.ndarray]:
+    """ワーカープロセスでイテレーションを実行"""
+    return MCCFRWorker(stack, regret_sum, seed).run(iterations)
+
+
+class CFRTrainer:
+    """
+    MCCFRの学習を複数プロセスで進め、チェックポイントと戦略ファイルを書き出す
+
+    各ラウンドで全ワーカーに同じ累積後悔を配り、それぞれ batch_iterations 回ずつ
+    独立した乱数で学習させ、返ってきた増分を合算する。
+
+    Args:
+        stack_bb: 開始スタック（BB単位）
+        seed: 乱数シード
+    """
+
+    def __init__(self, stack_bb: int = 100, seed: Optional[int] = None):
+        self.stack = stack_bb * BIG_BLIND
+        self.seed = seed if seed is not None else random.randrange(2 ** 31)
+        self.iterations = 0
+        self.regret_sum = np.zeros((NUM_INFOSETS, NUM_ABSTRACT_ACTIONS), dtype=np.float64)
+        self.strategy_sum = np.zeros((NUM_INFOSETS, NUM_ABSTRACT_ACTIONS), dtype=np.float64)
+
+    def train(
+        self,
+        iterations: int,
+        workers: int = 1,
+        batch_iterations: int = 1000,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: float = 60.0
+    ) -> None:
+        """
+        学習を実行する
+
+        Args:
+            iterations: 追加で実行するイテレーション数
+            workers: ワーカープロセス数（1ならプロセスを使わない）
+            batch_iterations: 1ワーカーが1ラウンドで実行するイテレーション数
+            checkpoint_path: チェックポイントの保存先（省略時は保存しない）
+            checkpoint_interval: チェックポイントを保存する間隔（秒）
+        """
+        target = self.iterations + iterations
+        last_checkpoint = time.monotonic()
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while self.iterations < target:
+                per_worker = min(batch_iterations, -(-(target - self.iterations) // workers))
+                seeds = [self.seed + self.iterations + i for i in range(workers)]
+                if executor is None:
+                    results = [_run_worker(self.stack, self.regret_sum, seeds[0], per_worker)]
+                else:
+                    futures = [
+                        executor.submit(_run_worker, self.stack, self.regret_sum, seed, per_worker)
+                        for seed in seeds
+                    ]
+                    results = [future.result() for future in futures]
+
+                for regret_delta, strategy_delta in results:
+                    self.regret_sum += regret_delta
+                    self.strategy_sum += strategy_delta
+                self.iterations += per_worker * len(results)
+                logger.info(f"CFR iterations: {self.iterations}/{target}")
+
+                if checkpoint_path and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                    self.save_checkpoint(checkpoint_path)
+                    last_checkpoint = time.monotonic()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if checkpoint_path:
+            self.save_checkpoint(checkpoint_path)
+
+    def average_strategy(self) -> np.ndarray:
+        """平均戦略（訪問のない情報集合はコール/チェックのみ）"""
+        totals = self.strategy_sum.sum(axis=1, keepdims=True)
+        strategy = np.zeros_like(self.strategy_sum)
+        strategy[:, ABSTRACT_CALL] = 1.0
+        visited = totals[:, 0] > 0
+        strategy[visited] = self.strategy_sum[visited] / totals[visited]
+        return strategy
+
+    def save_checkpoint(self, path: str) -> None:
+        """チェックポイントを保存（書き込み途中で中断されても前回分を壊さない）"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                regret_sum=self.regret_sum,
+                strategy_sum=self.strategy_sum,
+                iterations=self.iterations,
+                stack=self.stack,
+                seed=self.seed,
+            )
+        os.replace(temp_path, path)
+        logger.info(f"CFR checkpoint saved: {path} ({self.iterations} iterations)")
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> "CFRTrainer":
+        """チェックポイントから学習を再開する"""
+        with np.load(path) as data:
+            trainer = cls(seed=int(data["seed"]))
+            trainer.stack = int(data["stack"])
+            trainer.iterations = int(data["iterations"])
+            trainer.regret_sum = data["regret_sum"].copy()
+            trainer.strategy_sum = data["strategy_sum"].copy()
+        return trainer
+
+    def write_strategy(self, path: str) -> None:
+        """平均戦略を戦略ファイルとして書き出す"""
+        write_strategy_file(path, self.average_strategy())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ヘッズアップCFR戦略の学習")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-iterations", type=int, default=1000)
+    parser.add_argument("--stack-bb", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--checkpoint", default=None, help="チェックポイント（存在すれば再開）")
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0)
+    parser.add_argument("--output", default="cfr_strategy.bin")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        trainer = CFRTrainer.load_checkpoint(args.checkpoint)
+        logger.info(f"Resuming from {args.checkpoint} ({trainer.iterations} iterations)")
+    else:
+        trainer = CFRTrainer(stack_bb=args.stack_bb, seed=args.seed)
+
+    trainer.train(
+        args.iterations,
+        workers=args.workers,
+        batch_iterations=args.batch_iterations,
+        checkpoint_path=args.checkpoint,
+        checkpoint_interval=args.checkpoint_interval
+    )
+    trainer.write_strategy(args.output)
+    logger.info(f"Strategy written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""ハンドエクイティ推定 - 時間予算つきモンテカルロ（treys Evaluator を使用）"""
+from dataclasses import dataclass
+from typing import List, Optional
+import random
+import time
+from treys import Card as TreysCard, Evaluator
+from ..domain.deck import Card
+
+# 52枚の treys 表現（モジュール読み込み時に1回だけ生成）
+_FULL_DECK: List[int] = [
+    TreysCard.new(rank + suit)
+    for suit in Card.suit_map.keys()
+    for rank in Card.rank_order
+]
+
+
+@dataclass(frozen=True)
+class EquityResult:
+    """エクイティ推定の結果"""
+    equity: float   # 0.0〜1.0（引き分けは人数で按分）
+    samples: int    # 試行回数
+
+
+class EquityCalculator:
+    """
+    相手のハンドをランダムに仮定し、残りのボードを配り切って勝率を推定する
+
+    時間予算が尽きるまで試行を重ねる（anytime）ため、予算を増やすほど推定の
+    ばらつきが小さくなる。
+    """
+
+    def __init__(self, batch_size: int = 32) -> None:
+        self.evaluator = Evaluator()
+        self.batch_size = batch_size
+
+    def estimate(
+        self,
+        hole_cards: List[Card],
+        community_cards: List[Card],
+        num_opponents: int,
+        time_budget: float,
+        min_samples: int = 32,
+        max_samples: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ) -> EquityResult:
+        """
+        エクイティを推定する
+
+        Args:
+            hole_cards: 自分のホールカード（2枚）
+            community_cards: 公開済みのコミュニティカード（0〜5枚）
+            num_opponents: ハンドに残っている相手の人数
+            time_budget: 推定に使う時間（秒）
+            min_samples: 予算に関わらず行う最低試行回数
+            max_samples: 試行回数の上限（省略時は無制限）
+            rng: 乱数生成器（再現性が必要な場合に指定）
+
+        Returns:
+            EquityResult: 推定エクイティと試行回数
+        """
+        if len(hole_cards) != 2:
+            raise ValueError("ホールカードは2枚である必要があります")
+        if num_opponents < 1:
+            return EquityResult(equity=1.0, samples=0)
+
+        rng = rng or random
+        hero = [card.to_treys_int() for card in hole_cards]
+        board = [card.to_treys_int() for card in community_cards]
+        known = set(hero) | set(board)
+        remaining = [card for card in _FULL_DECK if card not in known]
+
+        board_missing = 5 - len(board)
+        draw_count = board_missing + 2 * num_opponents
+        evaluate = self.evaluator.evaluate
+        sample = rng.sample
+
+        deadline = time.perf_counter() + time_budget
+        total = 0.0
+        samples = 0
+        while True:
+            for _ in range(self.batch_size):
+                drawn = sample(remaining, draw_count)
+                full_board = board + drawn[:board_missing]
+                hero_score = evaluate(full_board, hero)
+
+                best = hero_score
+                ties = 1
+                for i in range(board_missing, draw_count, 2):
+                    score = evaluate(full_board, drawn[i:i + 2])
+                    if score < best:
+                        best = score
+                        break
+                    if score == best:
+                        ties += 1
+                else:
+                    total += 1.0 / ties
+                samples += 1
+
+            if max_samples is not None and samples >= max_samples:
+                break
+            if samples >= min_samples and time.perf_counter() >= deadline:
+                break
+
+        return EquityResult(equity=total / samples, samples=samples)
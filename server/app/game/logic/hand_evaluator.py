@@ -1,5 +1,5 @@
 """ハンド評価（最小実装） - treys Evaluator を使用"""
-from typing import List
+from typing import Dict, List
 from treys import Evaluator
 from ..domain.deck import Card
 
@@ -33,14 +33,52 @@ class HandEvaluator:
         treys_community = [card.to_treys_int() for card in community_cards]
         return self.evaluator.evaluate(treys_community, treys_hole)
 
+    def evaluate_runouts(
+        self,
+        hole_cards_by_seat: Dict[int, List[Card]],
+        boards: List[List[Card]]
+    ) -> Dict[int, List[int]]:
+        """
+        複数ボード（ラン・イット・N回）に対して全座席を一括評価する
+
+        カードの treys 変換は1枚につき1回だけ行い、各ボード×各座席を評価する。
+
+        Args:
+            hole_cards_by_seat: {座席インデックス: ホールカード}
+            boards: 5枚ずつのボードのリスト
+
+        Returns:
+            {座席インデックス: [ボードごとの評価値]}（低いほど強い）
+        """
+        for board in boards:
+            if len(board) != 5:
+                raise ValueError("ボードは5枚である必要があります")
+
+        treys_holes = {}
+        for seat_index, hole_cards in hole_cards_by_seat.items():
+            if len(hole_cards) != 2:
+                raise ValueError("ホールカードは2枚である必要があります")
+            treys_holes[seat_index] = [card.to_treys_int() for card in hole_cards]
+        treys_boards = [[card.to_treys_int() for card in board] for board in boards]
+
+        evaluate = self.evaluator.evaluate
+        return {
+            seat_index: [evaluate(board, hole) for board in treys_boards]
+            for seat_index, hole in treys_holes.items()
+        }
+
+    def get_hand_name_from_score(self, hand_rank: int, locale: str = "ja") -> str:
+        """評価値から役名を返す（再評価を行わない）"""
+        cls = self.evaluator.get_rank_class(hand_rank)
+        if locale.lower() == "ja":
+            return self._JA_HAND_NAMES.get(cls, "不明")
+        return self.evaluator.class_to_string(cls)
+
     def get_hand_name(self, hole_cards: List[Card], community_cards: List[Card], locale: str = "ja") -> str:
         """
         役名を返す。
         locale="ja" で日本語、その他は treys の英語表記を返却。
         """
         hand_rank = self.evaluate_hand(hole_cards, community_cards)
-        cls = self.evaluator.get_rank_class(hand_rank)  # 1..9（小さいほど強い）
-        if locale.lower() == "ja":
-            return self._JA_HAND_NAMES.get(cls, "不明")
-        # 英語名称（例: "Straight Flush"）
-        return self.evaluator.class_to_string(cls)
\ No newline at end of file
+        # 1..9（小さいほど強い）。英語名称は "Straight Flush" などの表記
+        return self.get_hand_name_from_score(hand_rank, locale)
\ No newline at end of file
@@ -181,6 +181,60 @@ class PotManager:
         
         return distributions
 
+    @staticmethod
+    def calculate_runout_distribution(
+        game: GameState,
+        scores_by_seat: Dict[int, List[int]],
+        run_count: int
+    ) -> List[dict]:
+        """
+        ラン・イット・N回のポット分配を計算（実際の分配は行わない）
+
+        各ポットをrun_count個に等分し（余りは最初のランアウトから1チップずつ）、
+        ランアウトごとにそのボードでの評価値で勝者を決めて分配する。
+
+        Args:
+            game: ゲーム状態
+            scores_by_seat: {座席インデックス: [ランアウトごとの評価値]}
+            run_count: ランアウト数
+
+        Returns:
+            [{"seat_index": int, "amount": int, "pot_type": str, "runout": int}]
+        """
+        distributions = []
+
+        for pot_index, pot in enumerate(game.table.pots):
+            if pot.amount == 0:
+                continue
+
+            eligible_in_hand = [
+                seat_index for seat_index in pot.eligible_seats
+                if game.table.seats[seat_index].in_hand and seat_index in scores_by_seat
+            ]
+            if not eligible_in_hand:
+                continue
+
+            share_per_runout = pot.amount // run_count
+            remainder = pot.amount % run_count
+
+            for runout in range(run_count):
+                runout_pot = Pot()
+                runout_pot.amount = share_per_runout + (1 if runout < remainder else 0)
+                if runout_pot.amount == 0:
+                    continue
+
+                best_score = min(scores_by_seat[idx][runout] for idx in eligible_in_hand)
+                winners = [
+                    idx for idx in eligible_in_hand
+                    if scores_by_seat[idx][runout] == best_score
+                ]
+
+                for dist in PotManager._split_pot_among_winners(runout_pot, winners, pot_index):
+                    dist["runout"] = runout
+                    distributions.append(dist)
+
+        return distributions
+
     @staticmethod
     def _distribute_single_pot(
         game: GameState, 
@@ -5,6 +5,14 @@ from .action_service import ActionService
 from .turn_manager import TurnManager
 from .dealer_service import DealerService
 from .ai_service import AIService
+from .tournament_service import TournamentService
+from .timer_service import TimerService
+from .ai_executor import AIExecutor
+from .player_stats_service import PlayerStatsService, PlayerStats
+from .decision_cache import DecisionCache
+from .table_actor import TableActor, TableActorRegistry
+from .game_state_pool import GameStatePool
+from .game_lifecycle import GameLifecycleManager, GameCapacityError
 
 __all__ = [
     "GameService",
@@ -13,5 +21,16 @@ __all__ = [
     "ActionService",
     "TurnManager",
     "DealerService",
-    "AIService"
+    "AIService",
+    "TournamentService",
+    "TimerService",
+    "AIExecutor",
+    "PlayerStatsService",
+    "PlayerStats",
+    "DecisionCache",
+    "TableActor",
+    "TableActorRegistry",
+    "GameStatePool",
+    "GameLifecycleManager",
+    "GameCapacityError"
 ]
\ No newline at end of file
@@ -32,6 +32,9 @@ class ActionService:
         elif action.action_type == ActionType.BET:
             if action.amount > game.current_bet:
                 bet_amount = seat.pay(action.amount)
+                game.current_bet = seat.bet_in_round
+                game.last_aggressive_actor_index = seat.index
+                game.bets_in_round += 1
                 seat.last_action = ActionType.BET
                 seat.acted = True
                 if bet_amount >= game.big_blind:
@@ -45,6 +48,7 @@ class ActionService:
                 raise_amount = total_bet - seat.bet_in_round
                 game.current_bet = total_bet
                 game.last_aggressive_actor_index = seat.index
+                game.bets_in_round += 1
                 seat.last_action = ActionType.RAISE
                 seat.pay(raise_amount)
                 seat.acted = True
@@ -64,7 +68,9 @@ class ActionService:
             return False
         
         # アクション固有の検証
-        if action.action_type == ActionType.CALL:
+        if action.action_type == ActionType.FOLD:
+            return True
+        elif action.action_type == ActionType.CALL:
             return seat.stack > 0
         elif action.action_type == ActionType.CHECK:
             # ベット額が合っている場合のみチェック可能
@@ -0,0 +1,349 @@
+"""全テーブルのAI決定をティックごとにまとめ、NumPyで一括スコアリングする"""
+from typing import Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import logging
+import numpy as np
+from ..domain.game_state import GameState
+from ..domain.seat import Seat
+from ..domain.enum import ActionType, GameStatus
+from ..logic.hand_evaluator import HandEvaluator
+from .ai_executor import AIExecutor, ai_executor as default_ai_executor
+from .game_service import GameService, game_service as default_game_service
+
+logger = logging.getLogger(__name__)
+
+# 特徴量の列
+FEATURE_NAMES = (
+    "hand_strength",    # 0〜1（プリフロップは簡易式、フロップ以降はtreysの相対順位）
+    "pot_odds",         # コール額 / (ポット + コール額)
+    "position",         # ボタンからの相対位置（0〜1、1がボタン）
+    "stack_to_pot",     # スタック / ポット（20で頭打ちにして0〜1に正規化）
+    "facing_bet",       # コールが必要なら1
+    "can_raise",        # ベット/レイズが可能なら1
+    "opponents",        # ハンドに残っている相手の人数
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+# 一括スコアリングの結果コード
+ACTION_FOLD = 0
+ACTION_PASSIVE = 1      # チェックまたはコール
+ACTION_AGGRESSIVE = 2   # ベットまたはレイズ
+
+# AIのアクション適用後に呼ばれるリスナー (game_id)
+StateListener = Callable[[str], Awaitable[None]]
+
+# 保留中の決定 (game_id, game, 手番の座席, 集めたときのゲームのバージョン)
+PendingDecision = Tuple[str, GameState, Seat, int]
+
+_MAX_TREYS_RANK = 7462
+
+
+class BatchPolicy:
+    """
+    特徴量行列を一括でスコアリングする方策
+
+    score = hand_strength - pot_odds * facing_bet + position_weight * position
+    - score >= raise_threshold かつレイズ可能ならベット/レイズ
+    - コール不要、または score >= call_threshold ならチェック/コール
+    - それ以外はフォールド
+    """
+
+    def __init__(
+        self,
+        raise_threshold: float = 0.62,
+        call_threshold: float = 0.30,
+        position_weight: float = 0.05,
+        opponent_penalty: float = 0.03
+    ):
+        self.raise_threshold = raise_threshold
+        self.call_threshold = call_threshold
+        self.position_weight = position_weight
+        self.opponent_penalty = opponent_penalty
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """
+        (n, NUM_FEATURES) の特徴量からアクションコード (n,) を返す
+
+        Args:
+            features: 特徴量行列
+
+        Returns:
+            np.ndarray: ACTION_FOLD / ACTION_PASSIVE / ACTION_AGGRESSIVE
+        """
+        strength = features[:, 0]
+        pot_odds = features[:, 1]
+        position = features[:, 2]
+        facing = features[:, 4]
+        can_raise = features[:, 5] > 0
+        opponents = features[:, 6]
+
+        score = (
+            strength
+            - pot_odds * facing
+            + self.position_weight * position
+            - self.opponent_penalty * np.maximum(opponents - 1, 0)
+        )
+
+        actions = np.full(features.shape[0], ACTION_FOLD, dtype=np.int8)
+        actions[(facing == 0) | (score >= self.call_threshold)] = ACTION_PASSIVE
+        actions[(score >= self.raise_threshold) & can_raise] = ACTION_AGGRESSIVE
+        return actions
+
+
+class AIBatchDispatcher:
+    """
+    全テーブルの保留中のAI決定をティックごとにまとめて処理するディスパッチャ
+
+    1. GameService.games からAIの手番になっているテーブルを集める
+    2. 特徴量を1つのNumPy配列にエンコードする
+    3. BatchPolicy で一括スコアリングし、ベット額もベクトル演算で求める
+    4. 各テーブルのアクターへ同時にアクションを適用する
+       （集めた後に状態が変わったテーブルは適用せず次のティックで決め直し、
+       拒否されたアクションは AITurnScheduler と同じくフォールバックのアクションにする）
+
+    AITurnScheduler の代わりに使うモードで、両方を同時に有効にしない。
+    """
+
+    def __init__(
+        self,
+        game_service: Optional[GameService] = None,
+        policy: Optional[BatchPolicy] = None,
+        interval: float = 0.05,
+        executor: Optional[AIExecutor] = None
+    ):
+        self.game_service = game_service or default_game_service
+        self.policy = policy or BatchPolicy()
+        self.executor = executor or default_ai_executor  # 拒否されたときのフォールバックに使う
+        self.interval: float = interval
+        self.hand_evaluator = HandEvaluator()
+        self._task: Optional[asyncio.Task] = None
+        self._state_listener: Optional[StateListener] = None
+
+    @property
+    def is_running(self) -> bool:
+        """ティックタスクが動作中かどうか"""
+        return self._task is not None and not self._task.done()
+
+    def set_state_listener(self, listener: StateListener) -> None:
+        """AIのアクション適用後に呼ばれるリスナーを設定"""
+        self._state_listener = listener
+
+    def start(self) -> None:
+        """ティックタスクを開始"""
+        if not self.is_running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """ティックタスクを停止"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """interval秒ごとにティックを実行"""
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"AI batch tick failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def collect_pending(self) -> List[PendingDecision]:
+        """AIの手番になっている全テーブルを、その時点のバージョンとともに集める"""
+        pending = []
+        for game_id, game in self.game_service.games.items():
+            if game.status != GameStatus.IN_PROGRESS or game.current_seat_index is None:
+                continue
+            seat = game.table.seats[game.current_seat_index]
+            if seat.is_occupied and seat.player.is_ai and seat.is_active:
+                pending.append((game_id, game, seat, game.version))
+        return pending
+
+    def encode(self, pending: List[PendingDecision]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        保留中の決定を特徴量行列とベット計算用の数値行列にエンコードする
+
+        Returns:
+            (features (n, NUM_FEATURES), amounts (n, 6))
+            amounts の列: pot, current_bet, bet_in_round, stack, min_raise_delta, big_blind
+        """
+        n = len(pending)
+        features = np.zeros((n, NUM_FEATURES), dtype=np.float64)
+        amounts = np.zeros((n, 6), dtype=np.int64)
+
+        for row, (_, game, seat, _) in enumerate(pending):
+            seats = game.table.seats
+            pot = game.table.total_pot + sum(s.bet_in_round for s in seats)
+            call_amount = max(game.current_bet - seat.bet_in_round, 0)
+            opponents = sum(1 for s in seats if s.in_hand) - 1
+
+            if game.current_bet == 0:
+                can_raise = seat.stack > 0
+            else:
+                can_raise = not seat.acted and seat.stack + seat.bet_in_round > game.current_bet
+
+            seat_count = len(seats)
+            dealer = game.dealer_seat_index if game.dealer_seat_index is not None else 0
+            position = ((seat.index - dealer - 1) % seat_count) / max(seat_count - 1, 1)
+
+            features[row, 0] = self._hand_strength(seat, game)
+            features[row, 1] = call_amount / (pot + call_amount) if call_amount > 0 else 0.0
+            features[row, 2] = position
+            features[row, 3] = min(seat.stack / pot, 20.0) / 20.0 if pot > 0 else 1.0
+            features[row, 4] = 1.0 if call_amount > 0 else 0.0
+            features[row, 5] = 1.0 if can_raise else 0.0
+            features[row, 6] = opponents
+
+            amounts[row] = (
+                pot,
+                game.current_bet,
+                seat.bet_in_round,
+                seat.stack,
+                max(game.last_raise_delta, game.big_blind),
+                game.big_blind,
+            )
+
+        return features, amounts
+
+    def decide(self, features: np.ndarray, amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        一括でアクションコードとベット額（RAISEは総額、BETは額）を求める
+
+        Returns:
+            (actions (n,), bet_amounts (n,))
+        """
+        actions = self.policy.score(features)
+
+        pot, current_bet, bet_in_round, stack, min_delta, big_blind = amounts.T
+        # ベットがない場合はポットの2/3（最低BB、スタックまで）
+        bet_sizes = np.minimum(np.maximum(pot * 2 // 3, big_blind), stack)
+        # レイズはポットサイズ（最小レイズ以上、オールインまで）
+        raise_totals = np.minimum(
+            np.maximum(current_bet + pot, current_bet + min_delta),
+            stack + bet_in_round
+        )
+        bet_amounts = np.where(current_bet == 0, bet_sizes, raise_totals)
+        return actions, bet_amounts
+
+    async def tick(self) -> int:
+        """
+        1ティック分の保留中の決定をまとめて処理する
+
+        Returns:
+            int: 適用したアクション数
+        """
+        pending = self.collect_pending()
+        if not pending:
+            return 0
+
+        features, amounts = self.encode(pending)
+        actions, bet_amounts = self.decide(features, amounts)
+
+        # テーブルごとのアクターへ同時に投入し、各テーブルの適用を並行に待つ
+        results = await asyncio.gather(*(
+            self._apply_on_table(game_id, game, seat, version, action_code, bet_amount, facing > 0)
+            for (game_id, game, seat, version), action_code, bet_amount, facing in zip(
+                pending, actions.tolist(), bet_amounts.tolist(), features[:, 4].tolist()
+            )
+        ))
+        return sum(results)
+
+    async def _apply_on_table(
+        self,
+        game_id: str,
+        game: GameState,
+        seat: Seat,
+        version: int,
+        action_code: int,
+        bet_amount: int,
+        facing_bet: bool
+    ) -> bool:
+        """手番の確認と適用をテーブルのアクター上で行い、適用できたらリスナーを呼ぶ"""
+        success = await self.game_service.run_on_table(
+            game_id, self._apply, game_id, game, seat, version, action_code, bet_amount, facing_bet
+        )
+        if not success:
+            return False
+        if self._state_listener is not None:
+            await self._state_listener(game_id)
+        return True
+
+    async def _apply(
+        self,
+        game_id: str,
+        game: GameState,
+        seat: Seat,
+        version: int,
+        action_code: int,
+        bet_amount: int,
+        facing_bet: bool
+    ) -> bool:
+        """
+        決定したアクションを適用する（テーブルのアクター上で実行）
+
+        集めたときからバージョンが変わっていれば適用しない（次のティックで決め直す）。
+        拒否されたらフォールバックのアクション（チェックかフォールド）を適用する。
+        """
+        if game.version != version or seat.player is None or game.current_seat_index != seat.index:
+            return False
+        action_type, amount = self._to_action(game, action_code, bet_amount, facing_bet)
+        success = await self.game_service.process_player_action(
+            game_id, seat.player.id, action_type, amount
+        )
+        if not success:
+            fallback = self.executor.fallback_action(game, seat)
+            logger.warning(
+                f"Batched AI action {action_type.value} rejected in game {game_id}, "
+                f"falling back to {fallback.action_type.value}"
+            )
+            success = await self.game_service.process_player_action(
+                game_id, fallback.player_id, fallback.action_type, fallback.amount
+            )
+        return success
+
+    @staticmethod
+    def _to_action(game: GameState, action_code: int, bet_amount: int, facing_bet: bool) -> Tuple[ActionType, int]:
+        """アクションコードを ActionType と額に変換する"""
+        if action_code == ACTION_AGGRESSIVE:
+            if game.current_bet == 0:
+                return ActionType.BET, bet_amount
+            return ActionType.RAISE, bet_amount
+        if action_code == ACTION_PASSIVE:
+            return (ActionType.CALL, 0) if facing_bet else (ActionType.CHECK, 0)
+        return ActionType.FOLD, 0
+
+    def _hand_strength(self, seat: Seat, game: GameState) -> float:
+        """ハンド強度（0〜1）"""
+        if len(seat.hole_cards) != 2:
+            return 0.0
+        if len(game.table.community_cards) >= 3:
+            score = self.hand_evaluator.evaluate_hand(seat.hole_cards, game.table.community_cards)
+            return 1.0 - (score - 1) / (_MAX_TREYS_RANK - 1)
+        return self._preflop_strength(seat)
+
+    @staticmethod
+    def _preflop_strength(seat: Seat) -> float:
+        """プリフロップの簡易ハンド強度（ペア・ハイカード・スーテッド・コネクター）"""
+        first, second = seat.hole_cards
+        high = max(first.rank_order.index(first.rank), second.rank_order.index(second.rank))
+        low = min(first.rank_order.index(first.rank), second.rank_order.index(second.rank))
+        if high == low:
+            return 0.5 + 0.5 * high / 12
+        strength = 0.35 * high / 12 + 0.15 * low / 12
+        if first.suit == second.suit:
+            strength += 0.06
+        gap = high - low
+        if gap == 1:
+            strength += 0.04
+        elif gap == 2:
+            strength += 0.02
+        return min(strength, 1.0)
+
+
+# グローバルインスタンス
+ai_batch_dispatcher = AIBatchDispatcher()
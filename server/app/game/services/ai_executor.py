@@ -0,0 +1,206 @@
+"""AIのアクション決定をイベントループ外（スレッド/プロセスプール）で実行する"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+from ..domain.game_state import GameState
+from ..domain.action import PlayerAction
+from ..domain.seat import Seat
+from ..domain.enum import ActionType
+from .ai_service import AIService
+
+logger = logging.getLogger(__name__)
+
+# プロセスプールの各ワーカーが保持するAIService
+_worker_ai_service: Optional[AIService] = None
+
+
+def _init_worker(ai_service_factory: Callable[[], AIService]) -> None:
+    """ワーカープロセスの初期化（AIServiceを1回だけ生成）"""
+    global _worker_ai_service
+    _worker_ai_service = ai_service_factory()
+
+
+def _decide_in_worker(
+    game: GameState, seat_index: int
+) -> Tuple[Optional[PlayerAction], int, Dict[str, Any]]:
+    """ワーカープロセスでアクションを決定（ワーカーの決定キャッシュの統計も返す）"""
+    action = _worker_ai_service.decide_action(game, game.table.seats[seat_index])
+    return action, os.getpid(), _worker_ai_service.decision_cache.stats()
+
+
+class AIExecutor:
+    """
+    AIのアクション決定をエグゼキュータで実行するサービス
+
+    - mode="thread": スレッドプール（GILを解放する評価ライブラリ向け、起動が軽い）
+    - mode="process": プロセスプール（純Pythonの重い戦略向け）
+
+    決定ごとに締め切りを設け、間に合わない場合はフォールバックアクション
+    （チェック可能ならチェック、それ以外はフォールド）を返す。
+    複数テーブルのAIターンはプール内で並列に実行される。
+    """
+
+    def __init__(
+        self,
+        ai_service_factory: Callable[[], AIService] = AIService,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        decision_timeout: float = 2.0
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.ai_service_factory = ai_service_factory
+        self.mode: str = mode
+        self.max_workers: Optional[int] = max_workers
+        self.decision_timeout: float = decision_timeout
+        self._ai_service: AIService = ai_service_factory()
+        self._executor: Optional[Executor] = None
+        # プロセスモードのワーカーごとの決定キャッシュの統計（pid → 直近の決定時点の stats）
+        self._worker_cache_stats: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def strategy(self) -> str:
+        """メインプロセスのAIServiceの戦略"""
+        return self._ai_service.strategy
+
+    def configure(
+        self,
+        ai_service_factory: Optional[Callable[[], AIService]] = None,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> None:
+        """
+        AIServiceの生成方法と実行モードを変更する（起動時の設定用、作成済みのプールは作り直す）
+
+        Args:
+            ai_service_factory: AIServiceを生成する関数（プロセスモードではpickle可能なもの、
+                functools.partial(AIService, strategy="equity") など）
+            mode: "thread" または "process"
+            max_workers: プールのワーカー数
+        """
+        if mode is not None and mode not in ("thread", "process"):
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.shutdown()
+        if ai_service_factory is not None:
+            self.ai_service_factory = ai_service_factory
+            self._ai_service = ai_service_factory()
+        if mode is not None:
+            self.mode = mode
+        if max_workers is not None:
+            self.max_workers = max_workers
+
+    def _get_executor(self) -> Executor:
+        """エグゼキュータを遅延生成"""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.ai_service_factory,)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ai-decision"
+                )
+        return self._executor
+
+    async def decide_action(
+        self,
+        game: GameState,
+        seat: Seat,
+        timeout: Optional[float] = None
+    ) -> Optional[PlayerAction]:
+        """
+        AIのアクションをエグゼキュータで決定する
+
+        ゲーム状態は GameState.snapshot()（履歴を含まない軽量なコピー）を渡すため、
+        決定中にテーブルが進行しても影響せず、イベントループ上のコピーの時間もテーブルが長く続いても増えない。
+
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            timeout: 締め切り（秒）。省略時は decision_timeout
+
+        Returns:
+            PlayerAction: 決定されたアクション（締め切り超過時はフォールバック）
+        """
+        if not seat or not seat.is_occupied or not seat.player:
+            return None
+
+        loop = asyncio.get_running_loop()
+        snapshot = game.snapshot()
+        if self.mode == "process":
+            future = asyncio.ensure_future(
+                loop.run_in_executor(self._get_executor(), _decide_in_worker, snapshot, seat.index)
+            )
+            future.add_done_callback(self._unpack_worker_result)
+        else:
+            future = loop.run_in_executor(
+                self._get_executor(),
+                self._ai_service.decide_action,
+                snapshot,
+                snapshot.table.seats[seat.index]
+            )
+
+        try:
+            result = await asyncio.wait_for(
+                future, timeout if timeout is not None else self.decision_timeout
+            )
+            return result[0] if self.mode == "process" else result
+        except asyncio.TimeoutError:
+            logger.warning(f"AI decision timed out for {seat.player.name}, using fallback")
+        except Exception as e:
+            logger.error(f"AI decision failed for {seat.player.name}: {e}", exc_info=True)
+        return self.fallback_action(game, seat)
+
+    def _unpack_worker_result(self, future: "asyncio.Future") -> None:
+        """ワーカーから返った決定キャッシュの統計を控える"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, pid, stats = future.result()
+        self._worker_cache_stats[pid] = stats
+
+    def decision_cache_stats(self) -> Dict[str, Any]:
+        """
+        決定キャッシュの統計（プロセスモードではメインプロセスと各ワーカーの合計）
+
+        Returns:
+            Dict[str, Any]: entries/hits/misses/hit_rate と戦略・実行モード・ワーカーごとの統計
+        """
+        main_stats = self._ai_service.decision_cache.stats()
+        sources = [main_stats] + list(self._worker_cache_stats.values())
+        hits = sum(stats["hits"] for stats in sources)
+        misses = sum(stats["misses"] for stats in sources)
+        lookups = hits + misses
+        return {
+            "strategy": self.strategy,
+            "mode": self.mode,
+            "entries": sum(stats["entries"] for stats in sources),
+            "max_entries": main_stats["max_entries"],
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "workers": {str(pid): stats for pid, stats in self._worker_cache_stats.items()},
+        }
+
+    @staticmethod
+    def fallback_action(game: GameState, seat: Seat) -> PlayerAction:
+        """締め切り超過時のアクション（チェック可能ならチェック、それ以外はフォールド）"""
+        if seat.bet_in_round == game.current_bet:
+            return PlayerAction(player_id=seat.player.id, action_type=ActionType.CHECK, amount=0)
+        return PlayerAction(player_id=seat.player.id, action_type=ActionType.FOLD, amount=0)
+
+    def shutdown(self) -> None:
+        """エグゼキュータを停止（実行中の決定は待たない）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # ワーカーと一緒にキャッシュも無くなる
+        self._worker_cache_stats.clear()
+
+
+# グローバルサービスインスタンス
+ai_executor = AIExecutor()
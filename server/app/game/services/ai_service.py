@@ -1,17 +1,344 @@
 """AIプレイヤーのアクション決定ロジック"""
-from typing import Optional
+from typing import List, Optional
+import logging
+import random
+import struct
 from ..domain.game_state import GameState
 from ..domain.action import PlayerAction
 from ..domain.seat import Seat
-from ..domain.enum import ActionType
+from ..domain.enum import ActionType, Round
+from ..logic.equity import EquityCalculator
+from ..logic.hand_evaluator import HandEvaluator
+from ..logic.abstraction import InfoSetAbstraction
+from ..logic.cfr import (
+    ABSTRACT_ALL_IN,
+    ABSTRACT_CALL,
+    ABSTRACT_FOLD,
+    BET_FRACTIONS,
+    MAX_BETS,
+    StrategyTable,
+    infoset_from_game,
+)
+from .player_stats_service import PlayerStats, PlayerStatsService, player_stats_service
+from .decision_cache import CachedDecision, DecisionCache, decision_cache as default_decision_cache
+
+logger = logging.getLogger(__name__)
 
 
 class AIService:
-    """AIプレイヤーのアクション決定を行うサービス"""
+    """AIプレイヤーのアクション決定を行うサービス
+
+    Args:
+        strategy: "conservative"（チェック/コール/フォールドのみ）または
+            "equity"（モンテカルロによるエクイティとポットオッズで判断）または
+            "cfr"（学習済みのヘッズアップ戦略ファイルを参照、ヘッズアップ以外はequity）
+        time_budget: equity戦略で1回の決定に使う時間（秒）。
+            テーブルごとに GameState.ai_time_budget で上書きできる
+        stats_service: 相手の対戦統計（VPIP/PFR/AFなど）の参照先
+        strategy_path: cfr戦略で使う戦略ファイル（cfr_trainer.py の出力）。
+            指定がない・開けない場合は警告を出して equity と同じ判断になる
+        decision_cache: equity戦略の決定を情報集合キーで共有するキャッシュ
+            （max_entries=0 のキャッシュを渡すと無効）
+    """
+
+    def __init__(
+        self,
+        strategy: str = "conservative",
+        time_budget: float = 0.05,
+        stats_service: Optional[PlayerStatsService] = None,
+        strategy_path: Optional[str] = None,
+        decision_cache: Optional[DecisionCache] = None
+    ):
+        if strategy not in ("conservative", "equity", "cfr"):
+            raise ValueError(f"Unknown AI strategy: {strategy}")
+        self.strategy: str = strategy
+        self.time_budget: float = time_budget
+        self.equity_calculator = EquityCalculator()
+        self.hand_evaluator = HandEvaluator()
+        self.stats_service = stats_service or player_stats_service
+        self.strategy_table: Optional[StrategyTable] = self._load_strategy_table(strategy, strategy_path)
+        self.rng = random.Random()
+        self.abstraction = InfoSetAbstraction()
+        self.decision_cache = decision_cache if decision_cache is not None else default_decision_cache
+
+    def get_opponent_stats(self, game: GameState, seat: Seat) -> List[PlayerStats]:
+        """
+        ハンドに残っている相手の対戦統計を取得（統計サービスのオブジェクトをそのまま返す）
+        
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            
+        Returns:
+            List[PlayerStats]: 統計が存在する相手の統計
+        """
+        opponent_stats = []
+        for other in game.table.in_hand_seats():
+            if other.index == seat.index or other.player is None:
+                continue
+            stats = self.stats_service.get(other.player.id)
+            if stats is not None:
+                opponent_stats.append(stats)
+        return opponent_stats
+
+    @staticmethod
+    def _load_strategy_table(strategy: str, strategy_path: Optional[str]) -> Optional[StrategyTable]:
+        """
+        戦略ファイルを開く（cfr戦略で開けない場合は警告を出してNone = equityにフォールバック）
+
+        Args:
+            strategy: AIの戦略
+            strategy_path: 戦略ファイルのパス
+
+        Returns:
+            Optional[StrategyTable]: 戦略テーブル（指定なし・開けない場合はNone）
+        """
+        if not strategy_path:
+            if strategy == "cfr":
+                logger.warning("cfr strategy without strategy_path; falling back to equity")
+            return None
+        try:
+            return StrategyTable(strategy_path)
+        except (OSError, ValueError, struct.error) as e:
+            if strategy != "cfr":
+                raise
+            logger.warning(f"Could not load CFR strategy {strategy_path}: {e}; falling back to equity")
+            return None
 
     def decide_action(self, game: GameState, seat: Seat) -> Optional[PlayerAction]:
         """
-        AIのアクション決定ロジック
+        AIのアクション決定ロジック（設定された戦略に振り分ける）
+        
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            
+        Returns:
+            PlayerAction: 決定されたアクション
+        """
+        if self.strategy == "cfr":
+            return self.decide_cfr_action(game, seat)
+        if self.strategy == "equity":
+            return self.decide_cached_action(game, seat)
+        return self.decide_conservative_action(game, seat)
+
+    def decide_cached_action(self, game: GameState, seat: Seat) -> Optional[PlayerAction]:
+        """
+        情報集合キーでキャッシュを引き、なければequity戦略で決定して保存する
+        
+        キーはハンド強度・ポットオッズ・ポジション・ストリートなどのバケットと、
+        攻撃的な相手のベットに直面しているかどうかで構成される。
+        
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            
+        Returns:
+            PlayerAction: 決定されたアクション
+        """
+        if not seat or not seat.is_occupied or not seat.player:
+            return None
+        if not self.decision_cache.enabled:
+            return self.decide_equity_action(game, seat)
+
+        key = self.abstraction.key(game, seat)
+        if key is None:
+            return self.decide_equity_action(game, seat)
+        key = key + (int(self._facing_aggressive_opponent(game)),)
+
+        call_amount = max(game.current_bet - seat.bet_in_round, 0)
+        pot = game.table.total_pot + sum(s.bet_in_round for s in game.table.seats)
+
+        cached = self.decision_cache.get(key)
+        if cached is not None:
+            return self._from_cached_decision(game, seat, cached, pot, call_amount)
+
+        action = self.decide_equity_action(game, seat)
+        if action is not None:
+            if action.action_type == ActionType.BET:
+                size = action.amount
+            elif action.action_type == ActionType.RAISE:
+                size = action.amount - game.current_bet
+            else:
+                size = 0
+            self.decision_cache.put(key, CachedDecision(action.action_type, size / max(pot + call_amount, 1)))
+        return action
+
+    def _from_cached_decision(
+        self,
+        game: GameState,
+        seat: Seat,
+        cached: CachedDecision,
+        pot: int,
+        call_amount: int
+    ) -> PlayerAction:
+        """キャッシュされた決定を現在の座席と額でアクションに戻す"""
+        player_id = seat.player.id
+        if cached.action_type in (ActionType.BET, ActionType.RAISE):
+            return self._aggressive_action(game, seat, int(cached.size_ratio * (pot + call_amount)))
+        if cached.action_type == ActionType.CALL:
+            return PlayerAction(player_id=player_id, action_type=ActionType.CALL, amount=call_amount)
+        return PlayerAction(player_id=player_id, action_type=cached.action_type, amount=0)
+
+    def decide_cfr_action(self, game: GameState, seat: Seat) -> Optional[PlayerAction]:
+        """
+        学習済みCFR戦略によるアクション決定（ヘッズアップのみ）
+        
+        戦略:
+        1. ゲーム状態を抽象化した情報集合の行番号を求める（カードバケット/ベット回数/ポジション）
+        2. 戦略テーブルの該当行から合法な抽象アクションをサンプリング（O(1)参照）
+        3. 抽象アクションを実際のチェック/コール/ベット/レイズに変換
+        
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            
+        Returns:
+            PlayerAction: 決定されたアクション
+        """
+        if not seat or not seat.is_occupied or not seat.player:
+            return None
+        if self.strategy_table is None or len(game.table.in_hand_seats()) != 2:
+            return self.decide_equity_action(game, seat)
+
+        index = infoset_from_game(game, seat, self.hand_evaluator.evaluator)
+        if index is None:
+            return self.decide_conservative_action(game, seat)
+
+        player_id = seat.player.id
+        call_amount = game.current_bet - seat.bet_in_round
+        bets = game.bets_in_round + (1 if game.current_round == Round.PREFLOP else 0)
+
+        legal = [ABSTRACT_FOLD] if call_amount > 0 else []
+        legal.append(ABSTRACT_CALL)
+        if bets < MAX_BETS and self._can_raise(game, seat):
+            legal.extend(BET_FRACTIONS.keys())
+            legal.append(ABSTRACT_ALL_IN)
+
+        action = self.strategy_table.sample(index, legal, self.rng)
+        if action == ABSTRACT_FOLD:
+            return PlayerAction(player_id=player_id, action_type=ActionType.FOLD, amount=0)
+        if action == ABSTRACT_CALL:
+            if call_amount > 0:
+                return PlayerAction(player_id=player_id, action_type=ActionType.CALL, amount=call_amount)
+            return PlayerAction(player_id=player_id, action_type=ActionType.CHECK, amount=0)
+        if action == ABSTRACT_ALL_IN:
+            return self._aggressive_action(game, seat, seat.stack + seat.bet_in_round)
+
+        pot = game.table.total_pot + sum(s.bet_in_round for s in game.table.seats)
+        return self._aggressive_action(game, seat, int((pot + call_amount) * BET_FRACTIONS[action]))
+
+    def decide_equity_action(self, game: GameState, seat: Seat) -> Optional[PlayerAction]:
+        """
+        エクイティ戦略によるアクション決定
+        
+        戦略:
+        1. ハンドに残っている相手に対するエクイティを時間予算内で推定
+        2. コール不要: エクイティが高ければポットの2/3〜1倍をベット/レイズ、それ以外はチェック
+        3. コール必要: エクイティが十分高ければレイズ、ポットオッズを上回ればコール、それ以外はフォールド
+        
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            
+        Returns:
+            PlayerAction: 決定されたアクション
+        """
+        if not seat or not seat.is_occupied or not seat.player:
+            return None
+        if len(seat.hole_cards) != 2:
+            return self.decide_conservative_action(game, seat)
+
+        player_id = seat.player.id
+        call_amount = game.current_bet - seat.bet_in_round
+        pot = game.table.total_pot + sum(s.bet_in_round for s in game.table.seats)
+        opponents = len(game.table.in_hand_seats()) - 1
+
+        time_budget = game.ai_time_budget if game.ai_time_budget is not None else self.time_budget
+        equity = self.equity_calculator.estimate(
+            seat.hole_cards,
+            game.table.community_cards,
+            opponents,
+            time_budget
+        ).equity
+
+        # 相手の人数が多いほど、強気に出るためのエクイティの基準を下げる
+        value_threshold = max(0.5, 1.0 / (opponents + 1) + 0.25)
+
+        if call_amount <= 0:
+            if equity >= value_threshold and self._can_raise(game, seat):
+                size = pot if equity >= value_threshold + 0.15 else pot * 2 // 3
+                return self._aggressive_action(game, seat, size)
+            return PlayerAction(player_id=player_id, action_type=ActionType.CHECK, amount=0)
+
+        pot_odds = call_amount / (pot + call_amount)
+
+        # 最後にアグレッションした相手が攻撃的ならブラフを考慮してコール基準を下げる
+        call_threshold = pot_odds
+        if self._facing_aggressive_opponent(game):
+            call_threshold = max(pot_odds - 0.05, 0.0)
+
+        if equity >= max(value_threshold + 0.1, pot_odds + 0.2) and self._can_raise(game, seat):
+            return self._aggressive_action(game, seat, pot + call_amount)
+        if equity >= call_threshold and self._can_call(seat, call_amount):
+            return PlayerAction(player_id=player_id, action_type=ActionType.CALL, amount=call_amount)
+        return PlayerAction(player_id=player_id, action_type=ActionType.FOLD, amount=0)
+
+    def _facing_aggressive_opponent(self, game: GameState) -> bool:
+        """
+        最後にアグレッションした相手が攻撃的（20ハンド以上観測してAF 3以上）かどうか
+        
+        Args:
+            game: ゲーム状態
+            
+        Returns:
+            bool: 攻撃的な相手のベット/レイズに直面していればTrue
+        """
+        aggressor_index = game.last_aggressive_actor_index
+        if aggressor_index is None or game.table.seats[aggressor_index].player is None:
+            return False
+        aggressor_stats = self.stats_service.get(game.table.seats[aggressor_index].player.id)
+        return aggressor_stats is not None and aggressor_stats.hands >= 20 and aggressor_stats.aggression_factor >= 3
+
+    def _aggressive_action(self, game: GameState, seat: Seat, size: int) -> PlayerAction:
+        """
+        ベット/レイズのアクションを作成（サイズは最小レイズとスタックで丸める）
+        
+        Args:
+            game: ゲーム状態
+            seat: AIプレイヤーの座席
+            size: 上乗せしたい額
+            
+        Returns:
+            PlayerAction: BET（ベットがない場合）または RAISE（総額指定）
+        """
+        max_total = seat.stack + seat.bet_in_round
+        if game.current_bet == 0:
+            amount = min(max(int(size), game.big_blind), seat.stack)
+            return PlayerAction(player_id=seat.player.id, action_type=ActionType.BET, amount=amount)
+
+        min_total = game.current_bet + max(game.last_raise_delta, game.big_blind)
+        total = min(max(game.current_bet + int(size), min_total), max_total)
+        return PlayerAction(player_id=seat.player.id, action_type=ActionType.RAISE, amount=total)
+
+    def _can_raise(self, game: GameState, seat: Seat) -> bool:
+        """
+        ベット/レイズが可能かチェック（ActionService.is_valid_action と同じ条件）
+        
+        Args:
+            game: ゲーム状態
+            seat: プレイヤーの座席
+            
+        Returns:
+            bool: ベット/レイズ可能ならTrue
+        """
+        if game.current_bet == 0:
+            return seat.stack > 0
+        return not seat.acted and seat.stack + seat.bet_in_round > game.current_bet
+
+    def decide_conservative_action(self, game: GameState, seat: Seat) -> Optional[PlayerAction]:
+        """
+        保守的戦略によるアクション決定
         
         戦略:
         1. チェックできるならチェック
@@ -1,6 +1,7 @@
 # app/game/services/dealer_service.py
 from typing import List, Optional
 from ..domain.game_state import GameState
+from ..domain.deck import Card
 from ..domain.enum import SeatStatus, Round
 from ..logic.pot_manager import PotManager
 
@@ -114,6 +115,36 @@ class DealerService:
         river_card = game.table.deck.draw(1)
         game.table.community_cards.extend(river_card)
     
+    def deal_remaining_board(self, game: GameState) -> None:
+        """ベッティングが終わった場合にボードを5枚まで配り切る"""
+        missing = 5 - len(game.table.community_cards)
+        if missing > 0:
+            game.table.community_cards.extend(game.table.deck.draw(missing))
+        game.table.runouts = [list(game.table.community_cards)]
+
+    def deal_runouts(self, game: GameState, run_count: int) -> List[List[Card]]:
+        """
+        残りのデッキから互いに重複しないランアウトをrun_count個配る
+
+        デッキが足りない場合は配れる数までランアウト数を減らす。
+        1つ目のランアウトを community_cards に反映する。
+
+        Returns:
+            5枚ずつのボードのリスト
+        """
+        board = list(game.table.community_cards)
+        missing = 5 - len(board)
+        if missing <= 0:
+            game.table.runouts = [board]
+            return game.table.runouts
+
+        run_count = max(1, min(run_count, len(game.table.deck.cards) // missing))
+        runouts = [board + game.table.deck.draw(missing) for _ in range(run_count)]
+
+        game.table.community_cards = list(runouts[0])
+        game.table.runouts = runouts
+        return runouts
+
     def setup_new_hand(self, game: GameState) -> bool:
         """新しいハンドのセットアップ"""
         active_seats = [seat for seat in game.table.seats if seat.is_active]
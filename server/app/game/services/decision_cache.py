@@ -0,0 +1,92 @@
+"""情報集合キーごとにAIの決定を保持する上限つきLRUキャッシュ"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+import threading
+from ..domain.enum import ActionType
+
+
+@dataclass(frozen=True)
+class CachedDecision:
+    """
+    プレイヤーや額に依存しない形で保存した決定
+
+    size_ratio はベット/レイズの上乗せ額を (ポット + コール額) に対する比で表す。
+    """
+    action_type: ActionType
+    size_ratio: float = 0.0
+
+
+class DecisionCache:
+    """
+    AIの決定を情報集合キーで共有するLRUキャッシュ
+
+    AIExecutor のスレッドプールから同時に参照されるためロックで保護する。
+    ヒット率は stats() で確認できる。
+
+    Args:
+        max_entries: 保持する決定の上限（0でキャッシュを無効化）
+    """
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[Hashable, CachedDecision]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """キャッシュが有効かどうか"""
+        return self.max_entries > 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（0〜1、参照がなければ0）"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedDecision]:
+        """キャッシュされた決定を取得（ヒット/ミスを記録）"""
+        with self._lock:
+            decision = self._entries.get(key)
+            if decision is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decision
+
+    def put(self, key: Hashable, decision: CachedDecision) -> None:
+        """決定を保存（上限を超えたら最も古いものを破棄）"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = decision
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """キャッシュと統計をリセット"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュの統計"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+# グローバルインスタンス
+decision_cache = DecisionCache()
@@ -0,0 +1,307 @@
+"""
+ゲームのライフサイクル管理
+人間の操作がないゲーム（idle）と、人間が誰も接続していないゲーム（abandoned）を期限で破棄し、
+ゲーム数の上限に達したら最も長く使われていない（LRU）ゲームから破棄する。
+
+破棄はゲームに紐づくリソース（テーブルのアクター・タイマー・統計）をまとめて解放し、
+WebSocket側のリソース（接続・AIスケジューラ・フレームキャッシュなど）は close リスナーが解放する。
+期限の確認は共有タイマーホイールの1つのタイマーで定期的に行う。
+"""
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+import time
+
+from app.core.memory import deep_sizeof
+from app.core.timer_wheel import TimerHandle
+from .game_service import GameService, game_service
+from .player_stats_service import player_stats_service
+from .timer_service import timer_service
+
+logger = logging.getLogger(__name__)
+
+# 破棄の理由
+CLOSE_DELETED = "deleted"      # DELETE /api/games/{game_id}
+CLOSE_IDLE = "idle"            # 人間の操作が idle_ttl 秒ない
+CLOSE_ABANDONED = "abandoned"  # 人間の接続が abandoned_ttl 秒ない
+CLOSE_CAPACITY = "capacity"    # ゲーム数の上限（LRU）
+CLOSE_TABLE_BROKEN = "table_broken"  # トーナメントのテーブル解散
+
+# ゲームを破棄したときに呼ばれるリスナー (game_id, reason)
+CloseListener = Callable[[str, str], Awaitable[None]]
+# ゲームに紐づくメモリ（バイト）を返す関数
+MemoryProbe = Callable[[str], int]
+
+
+class GameCapacityError(RuntimeError):
+    """ゲーム数が上限で、破棄できる（人間が接続していない）ゲームもない"""
+
+
+class _GameRecord:
+    """1ゲーム分の利用状況"""
+
+    __slots__ = ("created_at", "last_active", "humans", "abandoned_since", "pinned")
+
+    def __init__(self, now: float, pinned: bool = False):
+        self.created_at: float = now
+        self.last_active: float = now
+        self.humans: int = 0
+        self.abandoned_since: Optional[float] = now  # 人間が接続していなければその開始時刻
+        self.pinned: bool = pinned  # 期限切れ・上限による破棄の対象外（進行中のトーナメントのテーブル）
+
+
+class GameLifecycleManager:
+    """
+    ゲームの登録・利用状況の記録・期限切れと上限による破棄
+
+    Args:
+        service: 管理するゲームサービス
+        idle_ttl: 人間の操作がないゲームを破棄するまでの秒数（0で無効）
+        abandoned_ttl: 人間が接続していないゲームを破棄するまでの秒数（0で無効）
+        max_games: ゲーム数の上限（0で無制限）
+        sweep_interval: 期限を確認する間隔（秒）
+    """
+
+    def __init__(
+        self,
+        service: GameService,
+        idle_ttl: float = 1800.0,
+        abandoned_ttl: float = 300.0,
+        max_games: int = 10000,
+        sweep_interval: float = 30.0
+    ):
+        self.service = service
+        self.idle_ttl: float = idle_ttl
+        self.abandoned_ttl: float = abandoned_ttl
+        self.max_games: int = max_games
+        self.sweep_interval: float = sweep_interval
+        self.evictions: Dict[str, int] = {
+            CLOSE_DELETED: 0, CLOSE_IDLE: 0, CLOSE_ABANDONED: 0, CLOSE_CAPACITY: 0,
+            CLOSE_TABLE_BROKEN: 0,
+        }
+        # 古い順（LRU）に並ぶ
+        self._records: "OrderedDict[str, _GameRecord]" = OrderedDict()
+        self._close_listeners: List[CloseListener] = []
+        self._memory_probes: Dict[str, MemoryProbe] = {}
+        self._timer: Optional[TimerHandle] = None
+        self._running: bool = False
+
+    def start(self) -> None:
+        """期限の定期確認を開始（共有タイマーホイールが動いている必要がある）"""
+        self._running = True
+        if self.sweep_interval > 0 and self._timer is None:
+            self._timer = timer_service.call_later(self.sweep_interval, self._on_tick)
+
+    def stop(self) -> None:
+        """期限の定期確認を停止"""
+        self._running = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def add_close_listener(self, listener: CloseListener) -> None:
+        """ゲームを破棄したときに呼ばれるリスナーを追加（接続の切断・キャッシュの破棄など）"""
+        self._close_listeners.append(listener)
+
+    def add_memory_probe(self, name: str, probe: MemoryProbe) -> None:
+        """ゲームごとのメモリ計測に含める項目を追加（フレームキャッシュなど）"""
+        self._memory_probes[name] = probe
+
+    async def admit(self, count: int = 1) -> None:
+        """
+        ゲームを count 個作れるように空きを作る（上限なら人間が接続していない最も古いゲームを破棄）
+
+        Args:
+            count: 作成するゲーム数
+
+        Raises:
+            GameCapacityError: 上限で、破棄できるゲームがない
+        """
+        if self.max_games <= 0:
+            return
+        if count > self.max_games:
+            raise GameCapacityError(f"Game limit reached ({self.max_games})")
+        while len(self.service.games) + count > self.max_games:
+            self._adopt_untracked()
+            victim = next(
+                (game_id for game_id, record in self._records.items()
+                 if record.humans == 0 and not record.pinned),
+                None
+            )
+            if victim is None:
+                raise GameCapacityError(f"Game limit reached ({self.max_games})")
+            await self.close_game(victim, CLOSE_CAPACITY)
+
+    def register(self, game_id: str, pinned: bool = False) -> None:
+        """
+        作成したゲームを登録（人間が接続するまでは abandoned の期限が進む）
+
+        Args:
+            game_id: ゲームID
+            pinned: Trueなら unpin されるまで期限切れ・上限による破棄の対象にしない
+        """
+        self._records[game_id] = _GameRecord(time.monotonic(), pinned)
+
+    def unpin(self, game_id: str) -> None:
+        """破棄の対象に戻す（期限はこの時点から数える）"""
+        record = self._records.get(game_id)
+        if record is not None and record.pinned:
+            now = time.monotonic()
+            record.pinned = False
+            record.last_active = now
+            if record.humans == 0:
+                record.abandoned_since = now
+
+    def touch(self, game_id: str) -> None:
+        """人間の操作を記録（idle の期限と LRU の順序を更新）"""
+        record = self._records.get(game_id)
+        if record is not None:
+            record.last_active = time.monotonic()
+            self._records.move_to_end(game_id)
+
+    def attach(self, game_id: str) -> None:
+        """人間の接続を記録"""
+        record = self._records.get(game_id)
+        if record is not None:
+            record.humans += 1
+            record.abandoned_since = None
+            self.touch(game_id)
+
+    def detach(self, game_id: str) -> None:
+        """人間の切断を記録（誰もいなくなれば abandoned の期限が進む）"""
+        record = self._records.get(game_id)
+        if record is not None:
+            record.humans = max(0, record.humans - 1)
+            if record.humans == 0:
+                record.abandoned_since = time.monotonic()
+
+    async def close_game(self, game_id: str, reason: str = CLOSE_DELETED) -> bool:
+        """
+        ゲームを破棄し、紐づくリソースをすべて解放する
+
+        Args:
+            game_id: ゲームID
+            reason: 破棄の理由
+
+        Returns:
+            bool: 破棄したらTrue（存在しなければFalse）
+        """
+        self._records.pop(game_id, None)
+        game = self.service.delete_game(game_id)
+        if game is None:
+            return False
+        timer_service.cancel_game(game_id)
+        player_stats_service.forget_game(game_id)
+        for listener in self._close_listeners:
+            try:
+                await listener(game_id, reason)
+            except Exception as e:
+                logger.error(f"Game close listener failed for {game_id}: {e}", exc_info=True)
+        # リスナーがAIのタスクなどを止めた後で、GameState をプールに戻す
+        await self.service.release_game(game)
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        logger.info(f"Game closed: {game_id} ({reason})")
+        return True
+
+    async def sweep(self) -> int:
+        """
+        期限切れのゲームを破棄
+
+        Returns:
+            int: 破棄したゲーム数
+        """
+        self._adopt_untracked()
+        now = time.monotonic()
+        expired = []
+        for game_id, record in self._records.items():
+            if record.pinned:
+                continue
+            if self.abandoned_ttl > 0 and record.abandoned_since is not None \
+                    and now - record.abandoned_since > self.abandoned_ttl:
+                expired.append((game_id, CLOSE_ABANDONED))
+            elif self.idle_ttl > 0 and now - record.last_active > self.idle_ttl:
+                expired.append((game_id, CLOSE_IDLE))
+        for game_id, reason in expired:
+            await self.close_game(game_id, reason)
+        return len(expired)
+
+    def memory_usage(self, game_id: str) -> Optional[Dict[str, int]]:
+        """
+        ゲームごとのメモリ使用量の概算（バイト）
+
+        Args:
+            game_id: ゲームID
+
+        Returns:
+            Optional[Dict[str, int]]: 項目ごとのバイト数と合計（ゲームがなければNone）
+        """
+        game = self.service.get_game_state(game_id)
+        if game is None:
+            return None
+        usage = {"state": deep_sizeof(game)}
+        for name, probe in self._memory_probes.items():
+            usage[name] = probe(game_id)
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def memory_report(self, limit: int = 20) -> Dict[str, Any]:
+        """
+        全ゲームのメモリ使用量と、使用量の多いゲームの一覧
+
+        Args:
+            limit: 一覧に含めるゲーム数
+
+        Returns:
+            Dict[str, Any]: 合計と上位のゲーム
+        """
+        now = time.monotonic()
+        games = []
+        for game_id in list(self.service.games):
+            usage = self.memory_usage(game_id)
+            record = self._records.get(game_id)
+            games.append({
+                "game_id": game_id,
+                "bytes": usage,
+                "humans": record.humans if record else 0,
+                "idle_seconds": round(now - record.last_active, 1) if record else None,
+            })
+        games.sort(key=lambda entry: entry["bytes"]["total"], reverse=True)
+        return {
+            "games": len(games),
+            "total_bytes": sum(entry["bytes"]["total"] for entry in games),
+            "largest": games[:limit],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """ゲーム数・人間が接続中のゲーム数・理由ごとの破棄数・GameStateプールの状況"""
+        return {
+            "games": len(self.service.games),
+            "with_humans": sum(1 for record in self._records.values() if record.humans > 0),
+            "max_games": self.max_games,
+            "idle_ttl": self.idle_ttl,
+            "abandoned_ttl": self.abandoned_ttl,
+            "evictions": dict(self.evictions),
+            "state_pool": self.service.state_pool.stats(),
+        }
+
+    def _adopt_untracked(self) -> None:
+        """APIを経由せずに作られたゲームも管理対象にし、消えたゲームの記録を捨てる"""
+        for game_id in self.service.games:
+            if game_id not in self._records:
+                self.register(game_id)
+        for game_id in [game_id for game_id in self._records if game_id not in self.service.games]:
+            del self._records[game_id]
+
+    async def _on_tick(self) -> None:
+        """タイマーから呼ばれる定期確認（次の確認を登録し直す）"""
+        self._timer = None
+        try:
+            await self.sweep()
+        except Exception as e:
+            logger.error(f"Game lifecycle sweep failed: {e}", exc_info=True)
+        if self._running:
+            self.start()
+
+
+# グローバルサービスインスタンス
+game_lifecycle = GameLifecycleManager(game_service)
@@ -1,32 +1,137 @@
 # server/app/game/services/game_service.py
-from typing import Dict, Optional, List
+from typing import Any, Awaitable, Callable, Dict, Optional, List
 import asyncio
+import logging
+import time
 import uuid
 from ..domain.game_state import GameState
 from ..domain.player import Player
 from ..domain.action import PlayerAction
 from ..domain.enum import ActionType, GameStatus
+from .game_state_pool import GameStatePool
 from .poker_engine import PokerEngine
+from .table_actor import TableActor, TableActorRegistry
+from app.sharding.ring import shard_config
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# アクションの処理時間（テーブルのアクターの待ちを含む、/metrics）
+action_latency = metrics.histogram(
+    "poker_action_latency_seconds",
+    "Time to apply a player action, including the wait for the table actor",
+)
+actions_rejected = metrics.counter("poker_actions_rejected_total", "Player actions rejected as invalid")
+
+# ハンドが終了したときに呼ばれるリスナー (game_id)
+HandCompleteListener = Callable[[str], Awaitable[None]]
 
 
 class GameService:
-    """ゲーム管理の中心的なサービス"""
+    """
+    ゲーム管理の中心的なサービス
+    
+    テーブルの状態を変更する処理（着席・ハンド開始・アクション・退席）は
+    テーブルごとのアクター上で到着順に1つずつ実行される。
+    """
     
     def __init__(self):
         self.games: Dict[str, GameState] = {}
         self.poker_engine = PokerEngine()
+        # 存在しない・削除済みのゲームIDにはアクターを作らない
+        self.table_actors = TableActorRegistry(is_open=lambda game_id: game_id in self.games)
+        self.state_pool = GameStatePool()
+        self._hand_complete_listeners: List[HandCompleteListener] = []
+        # 破棄済みでプールに戻す前の GameState と、止めたテーブルのアクター
+        self._closing: Dict[GameState, Optional[TableActor]] = {}
+    
+    def add_hand_complete_listener(self, listener: HandCompleteListener) -> None:
+        """
+        ハンドが終了したときに呼ばれるリスナーを追加（トーナメントの進行など）
+        
+        リスナーはテーブルのアクター上で呼ばれるため、他のテーブルのアクターを待たずに戻ること。
+        """
+        self._hand_complete_listeners.append(listener)
+    
+    async def run_on_table(self, game_id: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        fn(*args) をテーブルのアクター上で実行する（同じテーブルの他の変更とは重ならない）
+        
+        Args:
+            game_id: ゲームID
+            fn: 実行するコルーチン関数
+            *args: fnの引数
+            
+        Returns:
+            Any: fnの戻り値（ゲームが存在しなければNone）
+        """
+        return await self.table_actors.run(game_id, fn, *args)
+    
+    def close_table(self, game_id: str) -> Optional[TableActor]:
+        """テーブルのアクターを止める（ゲーム削除時）"""
+        return self.table_actors.close(game_id)
+    
+    def delete_game(self, game_id: str) -> Optional[GameState]:
+        """
+        ゲームを破棄してテーブルのアクターを止める
+        
+        GameState はまだプールに戻さない。参照している処理（AIのタスクなど）を止めてから
+        release_game に渡すと、アクターの終了を待ってプールに戻す。
+        
+        Args:
+            game_id: ゲームID
+            
+        Returns:
+            Optional[GameState]: 破棄したゲームの状態（存在しなければNone）
+        """
+        game = self.games.pop(game_id, None)
+        if game is None:
+            return None
+        self._closing[game] = self.close_table(game_id)
+        return game
+    
+    async def release_game(self, game: GameState) -> None:
+        """
+        delete_game で破棄した GameState を、テーブルのアクターが止まってからプールに戻す
+        
+        Args:
+            game: delete_game が返したゲームの状態（以降は参照しないこと）
+        """
+        actor = self._closing.pop(game, None)
+        if actor is not None:
+            if actor.in_actor():
+                # 自分のテーブルのコマンドから破棄された場合は終了を待てないので、プールには戻さない
+                return
+            await actor.wait_closed()
+        self.state_pool.release(game)
     
-    async def create_game(self, game_id: str, big_blind: int = 100) -> GameState:
+    async def create_game(
+        self,
+        game_id: str,
+        big_blind: int = 100,
+        seat_count: int = 3,
+        run_it_times: int = 1
+    ) -> GameState:
         """新しいゲームを作成"""
         if game_id in self.games:
             raise ValueError(f"Game {game_id} already exists")
         
-        game = GameState(big_blind=big_blind, small_blind=big_blind//2)
+        game = self.state_pool.acquire(
+            big_blind=big_blind,
+            small_blind=big_blind//2,
+            seat_count=seat_count,
+            run_it_times=run_it_times
+        )
+        # gamesのキーとGameState.idを一致させる
+        game.id = game_id
         self.games[game_id] = game
         return game
     
     async def join_game(self, game_id: str, player: Player) -> bool:
         """プレイヤーをゲームに参加させる"""
+        return await self.run_on_table(game_id, self._join_game, game_id, player)
+    
+    async def _join_game(self, game_id: str, player: Player) -> bool:
         game = self.games.get(game_id)
         if not game:
             return False
@@ -37,16 +142,23 @@ class GameService:
     
     async def start_game(self, game_id: str) -> bool:
         """ゲームを開始"""
+        return await self.run_on_table(game_id, self._start_game, game_id)
+    
+    async def _start_game(self, game_id: str) -> bool:
         game = self.games.get(game_id)
         if not game:
             return False
         
         # 最低2人のプレイヤーが必要
-        active_players = [seat for seat in game.table.seats if seat.is_active]
+        active_players = [seat for seat in game.table.seats if seat.is_occupied and seat.stack > 0]
         if len(active_players) < 2:
             return False
         
-        return self.poker_engine.start_new_hand(game)
+        started = self.poker_engine.start_new_hand(game)
+        # ブラインドだけでオールインになり、開始と同時に決着したハンド
+        if started and game.status == GameStatus.HAND_COMPLETE:
+            await self.notify_hand_complete(game_id)
+        return started
     
     async def process_player_action(
         self, 
@@ -56,12 +168,54 @@ class GameService:
         amount: Optional[int] = None
     ) -> bool:
         """プレイヤーアクションを処理"""
+        action = PlayerAction(player_id=player_id, action_type=action_type, amount=amount or 0)
+        start = time.perf_counter()
+        success = await self.run_on_table(game_id, self._process_action, game_id, action)
+        action_latency.observe(time.perf_counter() - start)
+        if not success:
+            actions_rejected.inc()
+        return bool(success)
+    
+    async def _process_action(self, game_id: str, action: PlayerAction) -> bool:
         game = self.games.get(game_id)
         if not game:
             return False
         
-        action = PlayerAction(player_id=player_id, action_type=action_type, amount=amount or 0)
-        return await self.poker_engine.process_action(game, action)
+        was_complete = game.status == GameStatus.HAND_COMPLETE
+        success = await self.poker_engine.process_action(game, action)
+        # このアクションでハンドが終わったときだけ通知する（1ハンドにつき1回）
+        if success and not was_complete and game.status == GameStatus.HAND_COMPLETE:
+            await self.notify_hand_complete(game_id)
+        return success
+    
+    async def notify_hand_complete(self, game_id: str) -> None:
+        """ハンド終了のリスナーを呼ぶ（テーブルのアクター上）"""
+        for listener in self._hand_complete_listeners:
+            try:
+                await listener(game_id)
+            except Exception as e:
+                logger.error(f"Hand complete listener failed for {game_id}: {e}", exc_info=True)
+    
+    async def remove_player(self, game_id: str, player_id: str) -> bool:
+        """
+        プレイヤーをゲームから退席させる
+        
+        Args:
+            game_id: ゲームID
+            player_id: プレイヤーID
+            
+        Returns:
+            bool: ゲームが存在した場合True
+        """
+        return await self.run_on_table(game_id, self._remove_player, game_id, player_id)
+    
+    async def _remove_player(self, game_id: str, player_id: str) -> bool:
+        game = self.games.get(game_id)
+        if not game:
+            return False
+        
+        game.remove_player_by_id(player_id)
+        return True
     
     def get_game_state(self, game_id: str) -> Optional[GameState]:
         """ゲーム状態を取得"""
@@ -75,22 +229,31 @@ class GameService:
         
         return self.poker_engine.get_valid_actions(game, player_id)
     
-    async def create_single_play_game(self, big_blind: int = 100, buy_in: int = 10000) -> GameState:
+    async def create_single_play_game(
+        self,
+        big_blind: int = 100,
+        buy_in: int = 10000,
+        ai_time_budget: Optional[float] = None,
+        run_it_times: int = 1
+    ) -> GameState:
         """
         シングルプレイ用のゲームを作成（AI 2名を自動追加）
         
         Args:
             big_blind: ビッグブラインド額
             buy_in: 各プレイヤーの初期スタック
+            ai_time_budget: このテーブルのAIの1決定あたりの時間予算（秒、Noneはサービス既定）
+            run_it_times: オールインで決着したときにボードを走らせる回数
             
         Returns:
             GameState: 作成されたゲーム状態
         """
-        # ユニークなゲームIDを生成
-        game_id = str(uuid.uuid4())
+        # ユニークなゲームIDを生成（シャーディング時はこのプロセスの担当になるID）
+        game_id = shard_config.new_game_id()
         
         # ゲーム作成
-        game = await self.create_game(game_id, big_blind)
+        game = await self.create_game(game_id, big_blind, run_it_times=run_it_times)
+        game.ai_time_budget = ai_time_budget
         
         # AI プレイヤーを2名作成して追加
         ai1 = Player(player_id=str(uuid.uuid4()), name="AI_Player_1", is_ai=True)
@@ -122,6 +285,9 @@ class GameService:
         Returns:
             bool: 成功した場合True
         """
+        return await self.run_on_table(game_id, self._setup_single_play_seats, game_id, human_player, buy_in)
+    
+    async def _setup_single_play_seats(self, game_id: str, human_player: Player, buy_in: int) -> bool:
         game = self.games.get(game_id)
         if not game:
             return False
@@ -136,4 +302,20 @@ class GameService:
 
 
 # グローバルサービスインスタンス
-game_service = GameService()
\ No newline at end of file
+game_service = GameService()
+
+def _seated_players():
+    """着席中のプレイヤー数（人間/AI別、スクレイプ時に集計）"""
+    humans = ai = 0
+    for game in game_service.games.values():
+        for seat in game.table.seats:
+            if seat.player is not None:
+                if seat.player.is_ai:
+                    ai += 1
+                else:
+                    humans += 1
+    return [({"kind": "human"}, humans), ({"kind": "ai"}, ai)]
+
+
+metrics.gauge("poker_active_games", "Games currently held by this process", collector=lambda: [({}, len(game_service.games))])
+metrics.gauge("poker_seated_players", "Players sitting at a table", collector=_seated_players)
@@ -0,0 +1,72 @@
+"""
+GameState のプール
+破棄したゲームの GameState を座席数ごとに保持し、新しいゲームの作成時に作り直さずに使い回す。
+再利用時はテーブル（デッキ・座席・ポット）も空にして使い回す。
+"""
+from typing import Any, Dict, List
+
+from ..domain.game_state import GameState
+
+
+class GameStatePool:
+    """
+    破棄したゲームの GameState を使い回すプール
+
+    Args:
+        max_size: 保持する GameState の上限（0でプールを無効にする）
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size: int = max_size
+        self.created: int = 0    # 新しく作った数
+        self.reused: int = 0     # プールから再利用した数
+        self.discarded: int = 0  # プールが一杯で捨てた数
+        # 座席数ごとの空き
+        self._free: Dict[int, List[GameState]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(free) for free in self._free.values())
+
+    def acquire(self, big_blind: int = 100, small_blind: int = 50, seat_count: int = 3, run_it_times: int = 1) -> GameState:
+        """
+        作成直後の状態の GameState を返す（同じ座席数の空きがあれば再利用）
+
+        Args:
+            big_blind: ビッグブラインド
+            small_blind: スモールブラインド
+            seat_count: 座席数
+            run_it_times: オールイン時にボードを走らせる回数
+
+        Returns:
+            GameState: 新しいゲームの状態
+        """
+        free = self._free.get(seat_count)
+        if free:
+            game = free.pop()
+            game.reset(big_blind, small_blind, seat_count, run_it_times)
+            self.reused += 1
+            return game
+        self.created += 1
+        return GameState(big_blind=big_blind, small_blind=small_blind, seat_count=seat_count, run_it_times=run_it_times)
+
+    def release(self, game: GameState) -> None:
+        """
+        破棄したゲームの GameState をプールに戻す（中身は再利用時にリセットする）
+
+        Args:
+            game: 破棄したゲームの状態（以降は参照しないこと）
+        """
+        if len(self) >= self.max_size:
+            self.discarded += 1
+            return
+        self._free.setdefault(len(game.table.seats), []).append(game)
+
+    def stats(self) -> Dict[str, Any]:
+        """保持数・作成数・再利用数・破棄数"""
+        return {
+            "pooled": len(self),
+            "max_size": self.max_size,
+            "created": self.created,
+            "reused": self.reused,
+            "discarded": self.discarded,
+        }
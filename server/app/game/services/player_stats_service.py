@@ -0,0 +1,185 @@
+"""プレイヤーごとの対戦統計（VPIP/PFR/AF/Fold to C-bet）を増分で集計する"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from ..domain.game_state import GameState
+from ..domain.action import PlayerAction
+from ..domain.enum import ActionType, Round
+
+
+class PlayerStats:
+    """
+    1プレイヤーの統計カウンタ（固定サイズ）
+
+    各アクションでO(1)更新し、比率はプロパティで計算する。
+    """
+
+    __slots__ = (
+        "hands", "vpip_hands", "pfr_hands",
+        "aggressive_actions", "calls",
+        "cbet_opportunities", "cbet_folds",
+        "_vpip_token", "_pfr_token",
+    )
+
+    def __init__(self) -> None:
+        self.hands: int = 0                 # 配られたハンド数
+        self.vpip_hands: int = 0            # プリフロップで自発的にチップを入れたハンド数
+        self.pfr_hands: int = 0             # プリフロップでレイズしたハンド数
+        self.aggressive_actions: int = 0    # BET/RAISE の回数
+        self.calls: int = 0                 # CALL の回数
+        self.cbet_opportunities: int = 0    # フロップでC-betに直面した回数
+        self.cbet_folds: int = 0            # C-betにフォールドした回数
+        self._vpip_token: Optional[Tuple[str, int]] = None
+        self._pfr_token: Optional[Tuple[str, int]] = None
+
+    @property
+    def vpip(self) -> float:
+        """VPIP（0〜1）"""
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        """PFR（0〜1）"""
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    @property
+    def aggression_factor(self) -> float:
+        """アグレッションファクター（(BET+RAISE) / CALL）"""
+        if self.calls == 0:
+            return float(self.aggressive_actions)
+        return self.aggressive_actions / self.calls
+
+    @property
+    def fold_to_cbet(self) -> float:
+        """C-betに対するフォールド率（0〜1）"""
+        return self.cbet_folds / self.cbet_opportunities if self.cbet_opportunities else 0.0
+
+
+class _HandContext:
+    """テーブルごとの現在ハンドの文脈（C-bet判定用）"""
+
+    __slots__ = ("hand_no", "preflop_aggressor", "cbet_open", "cbettor")
+
+    def __init__(self) -> None:
+        self.hand_no: int = 0
+        self.preflop_aggressor: Optional[str] = None
+        self.cbet_open: bool = False    # C-betが出ていて、まだレイズされていない
+        self.cbettor: Optional[str] = None
+
+
+class PlayerStatsService:
+    """
+    プレイヤー統計をメモリ上で増分管理するサービス
+
+    PokerEngine.process_action が履歴にアクションを追加するたびに record_action を呼ぶ。
+    保持するプレイヤー数は max_players で上限を設け、古いものからLRUで破棄する。
+    get() は内部のPlayerStatsをそのまま返す（コピーしない、読み取り専用として扱う）。
+    """
+
+    def __init__(self, max_players: int = 100_000):
+        self.max_players: int = max_players
+        self._stats: "OrderedDict[str, PlayerStats]" = OrderedDict()
+        self._contexts: Dict[str, _HandContext] = {}
+
+    def __len__(self) -> int:
+        """統計を保持しているプレイヤー数"""
+        return len(self._stats)
+
+    def get(self, player_id: str) -> Optional[PlayerStats]:
+        """プレイヤーの統計を取得（コピーしない）"""
+        return self._stats.get(player_id)
+
+    def forget_game(self, game_id: str) -> None:
+        """テーブル削除時にハンド文脈を破棄"""
+        self._contexts.pop(game_id, None)
+
+    def on_hand_start(self, game: GameState) -> None:
+        """
+        新しいハンドの開始を記録する（カードを配られた座席のhandsを加算）
+
+        Args:
+            game: ゲーム状態
+        """
+        context = self._contexts.get(game.id)
+        if context is None:
+            context = _HandContext()
+            self._contexts[game.id] = context
+        context.hand_no += 1
+        context.preflop_aggressor = None
+        context.cbet_open = False
+        context.cbettor = None
+
+        for seat in game.table.seats:
+            if seat.in_hand and seat.player is not None:
+                self._touch(seat.player.id).hands += 1
+
+    def record_action(
+        self,
+        game: GameState,
+        action: PlayerAction,
+        street: Round,
+        facing_bet: bool
+    ) -> None:
+        """
+        適用済みのアクションで統計をO(1)更新する
+
+        Args:
+            game: ゲーム状態
+            action: 適用されたアクション
+            street: アクション時のラウンド（適用前の current_round）
+            facing_bet: アクション時にコールが必要だったか
+        """
+        context = self._contexts.get(game.id)
+        if context is None:
+            context = _HandContext()
+            self._contexts[game.id] = context
+
+        stats = self._touch(action.player_id)
+        token = (game.id, context.hand_no)
+        action_type = action.action_type
+        aggressive = action_type in (ActionType.BET, ActionType.RAISE)
+
+        if aggressive:
+            stats.aggressive_actions += 1
+        elif action_type == ActionType.CALL:
+            stats.calls += 1
+
+        if street == Round.PREFLOP:
+            if (aggressive or action_type == ActionType.CALL) and stats._vpip_token != token:
+                stats._vpip_token = token
+                stats.vpip_hands += 1
+            if aggressive:
+                context.preflop_aggressor = action.player_id
+                if stats._pfr_token != token:
+                    stats._pfr_token = token
+                    stats.pfr_hands += 1
+            return
+
+        if street != Round.FLOP:
+            return
+
+        if context.cbet_open:
+            if action.player_id != context.cbettor:
+                stats.cbet_opportunities += 1
+                if action_type == ActionType.FOLD:
+                    stats.cbet_folds += 1
+            if action_type == ActionType.RAISE:
+                context.cbet_open = False
+        elif aggressive and not facing_bet and action.player_id == context.preflop_aggressor:
+            context.cbet_open = True
+            context.cbettor = action.player_id
+
+    def _touch(self, player_id: str) -> PlayerStats:
+        """プレイヤーの統計を取得（なければ作成）し、LRUの末尾に移動"""
+        stats = self._stats.get(player_id)
+        if stats is None:
+            stats = PlayerStats()
+            self._stats[player_id] = stats
+            if len(self._stats) > self.max_players:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(player_id)
+        return stats
+
+
+# グローバルサービスインスタンス
+player_stats_service = PlayerStatsService()
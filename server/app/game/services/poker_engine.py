@@ -8,50 +8,92 @@ from .action_service import ActionService
 from .turn_manager import TurnManager
 from .dealer_service import DealerService
 from .showdown_service import ShowdownService
+from .player_stats_service import PlayerStatsService, player_stats_service
+from app.core.metrics import RateMeter, metrics
+
+# 開始したハンド数（/metrics）
+hands_started = metrics.counter("poker_hands_started_total", "Hands dealt across all tables")
+hand_rate = RateMeter(window=60)
+metrics.gauge(
+    "poker_hands_per_second",
+    "Hands dealt per second over the last 60 seconds",
+    collector=lambda: [({}, hand_rate.rate())],
+)
 
 class PokerEngine:
     """ポーカーの核となるゲームロジック"""
     
-    def __init__(self):
+    def __init__(self, stats_service: Optional[PlayerStatsService] = None):
         self.action_service = ActionService()
         self.turn_manager = TurnManager()
         self.dealer_service = DealerService()
         self.showdown_service = ShowdownService()
+        self.stats_service = stats_service or player_stats_service
     
     def start_new_hand(self, game: GameState) -> bool:
         """新しいハンドを開始"""
-        active_seats = [seat for seat in game.table.seats if seat.is_active]
-        if len(active_seats) < 2:
+        # 開始できないときは前のハンドの状態（勝者・ボード）を残したままにする
+        # （FOLDED/ALL_INの座席もリセット後はスタックがあればACTIVEになるので、スタックで数える）
+        playable_seats = [seat for seat in game.table.seats if seat.is_occupied and seat.stack > 0]
+        if len(playable_seats) < 2:
             return False
-        
-        # テーブル状態をリセット
-        game.table.reset_for_new_hand()
-        
+
+        # テーブル状態とアクション履歴をリセット（履歴は1ハンド分だけ持つ）
+        game.clear_for_new_hand()
+
         # DealerServiceで新ハンドセットアップ
         if not self.dealer_service.setup_new_hand(game):
+            # リセット済みの状態を配信し直させる
+            game.touch()
             return False
         
         # ゲーム状態を更新
+        game.hand_number += 1
         game.status = GameStatus.IN_PROGRESS
         game.current_round = Round.PREFLOP
         
         # 最初のアクター設定
         self.turn_manager.set_first_actor_for_round(game)
-        
+
+        # 対戦統計にハンド開始を記録
+        self.stats_service.on_hand_start(game)
+        hands_started.inc()
+        hand_rate.mark()
+
+        # ブラインドでオールインになり誰もアクションできない場合は、ボードを配り切って決着させる
+        if self._no_action_possible(game):
+            game.current_seat_index = None
+            game.winners = self.showdown_service.handle_hand_resolution(game, self.dealer_service)
+
+        game.touch()
         return True
 
+    @staticmethod
+    def _no_action_possible(game: GameState) -> bool:
+        """アクションできる座席が1つ以下で、その座席もコールする必要がないか"""
+        if not game.table.is_betting_over:
+            return False
+        return all(seat.bet_in_round >= game.current_bet for seat in game.table.active_seats())
+
     async def process_action(self, game: GameState, action: PlayerAction) -> bool:
         """プレイヤーアクションを処理"""
         if not self.action_service.is_valid_action(game, action):
             return False
         
+        # 統計用にアクション前の文脈を控える
+        street = game.current_round
+        seat = self._find_player_seat(game, action.player_id)
+        facing_bet = seat is not None and game.current_bet > seat.bet_in_round
+
         # アクションを実行
         success = await self.action_service.execute_action(game, action)
         if not success:
             return False
         
-        # アクション履歴に追加
+        # アクション履歴に追加し、対戦統計を増分更新
         game.history.append(action)
+        self.stats_service.record_action(game, action, street, facing_bet)
+        game.touch()
         
         # ハンド終了チェック（誰か1人だけが残った場合）
         if game.table.is_hand_over:
@@ -59,8 +101,8 @@ class PokerEngine:
             game.winners = winners
             return True
         
-        # ベッティング終了チェック（アクティブ1人 + オールイン）
-        if game.table.is_betting_over:
+        # ベッティング終了チェック（アクティブ1人以下 + オールイン、かつコール待ちがいない）
+        if game.table.is_betting_over and self.turn_manager.get_next_actionable_seat_index(game) is None:
             winners = self.showdown_service.handle_hand_resolution(game, self.dealer_service)
             game.winners = winners
             return True
@@ -103,7 +145,8 @@ class PokerEngine:
         # ゲームのプレイヤーリストに追加
         if player not in game.players:
             game.players.append(player)
-        
+
+        game.touch()
         return True
     
     def get_valid_actions(self, game: GameState, player_id: str) -> List[ActionType]:
@@ -120,19 +163,18 @@ class PokerEngine:
         # ベットをポットに回収
         self.dealer_service.collect_bets_to_pots(game)
         
-        # 次のラウンドに進む
-        if game.current_round == Round.PREFLOP:
-            game.current_round = Round.FLOP
-            self.dealer_service.deal_community_cards(game)
-        elif game.current_round == Round.FLOP:
-            game.current_round = Round.TURN
-            self.dealer_service.deal_community_cards(game)
-        elif game.current_round == Round.TURN:
-            game.current_round = Round.RIVER
-            self.dealer_service.deal_community_cards(game)
-        elif game.current_round == Round.RIVER:
+        # リバー終了ならショーダウンへ
+        if game.current_round == Round.RIVER:
             self._proceed_to_showdown(game)
             return
+
+        # 次のストリートを配る（DealerServiceがcurrent_roundを進める）
+        self.dealer_service.deal_community_cards(game)
+
+        # ベッティングラウンドの状態をリセット
+        game.current_bet = 0
+        game.table.reset_for_new_round()
+        game.clear_for_new_round()
         
         # 新しいラウンドの最初のアクター設定
         self.turn_manager.set_first_actor_for_round(game)
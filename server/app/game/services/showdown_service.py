@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Optional
 from ..domain.game_state import GameState
 from ..domain.enum import GameStatus, Round
 from ..logic.hand_evaluator import HandEvaluator
+from ..logic.pot_manager import PotManager
 
 
 class ShowdownService:
@@ -40,7 +41,6 @@ class ShowdownService:
                 seat.show_hand = True
         
         # ポット分配を計算（PotManagerを使用）
-        from ..logic.pot_manager import PotManager
         distributions = PotManager.calculate_pot_distribution(game)
         
         # 実際にスタックに分配
@@ -78,20 +78,96 @@ class ShowdownService:
         
         return winners
     
+    def evaluate_multi_runout(
+        self,
+        game: GameState,
+        dealer_service: Any,
+        run_count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        ラン・イット・N回のショーダウン
+
+        残りのデッキから重複しないランアウトを配り、全座席×全ボードを
+        一括評価したうえで、各ポットをランアウト数で分割して分配する。
+        勝者情報は座席×ポットごとに集約するため、通常のショーダウンと同じ大きさになる。
+
+        Args:
+            game: ゲーム状態
+            dealer_service: ランアウトを配るDealerService
+            run_count: ランアウト数
+
+        Returns:
+            勝者情報のリスト（"runouts" に勝ったランアウトのインデックス）
+        """
+        runouts = dealer_service.deal_runouts(game, run_count)
+        run_count = len(runouts)
+
+        in_hand_seats = [
+            seat for seat in game.table.in_hand_seats() if len(seat.hole_cards) == 2
+        ]
+        scores_by_seat = self.hand_evaluator.evaluate_runouts(
+            {seat.index: seat.hole_cards for seat in in_hand_seats},
+            runouts
+        )
+        for seat in in_hand_seats:
+            seat.hand_score = min(scores_by_seat[seat.index])
+            seat.show_hand = True
+
+        distributions = PotManager.calculate_runout_distribution(game, scores_by_seat, run_count)
+
+        # 座席×ポット単位で集約して分配
+        aggregated: Dict[tuple, Dict[str, Any]] = {}
+        for dist in distributions:
+            seat_index = dist["seat_index"]
+            game.table.seats[seat_index].refund(dist["amount"])
+
+            key = (seat_index, dist["pot_type"])
+            entry = aggregated.get(key)
+            if entry is None:
+                seat = game.table.seats[seat_index]
+                score = scores_by_seat[seat_index][dist["runout"]]
+                entry = {
+                    "seat_index": seat_index,
+                    "player_id": seat.player.id if seat.player else "",
+                    "player_name": seat.player.name if seat.player else "",
+                    "amount": 0,
+                    "pot_type": dist["pot_type"],
+                    "hand_name": self.hand_evaluator.get_hand_name_from_score(score, locale="ja"),
+                    "hand_score": score,
+                    "hole_cards": [str(card) for card in seat.hole_cards],
+                    "runouts": [],
+                }
+                aggregated[key] = entry
+            entry["amount"] += dist["amount"]
+            if dist["runout"] not in entry["runouts"]:
+                entry["runouts"].append(dist["runout"])
+
+        game.current_round = Round.SHOWDOWN
+        game.status = GameStatus.HAND_COMPLETE
+
+        return list(aggregated.values())
+
     def handle_hand_resolution(
         self, 
         game: GameState,
-        dealer_service: Optional[Any] = None
+        dealer_service: Optional[Any] = None,
+        run_count: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         ハンド終了時の処理（フォールドによる終了またはショーダウン）
         
         Args:
             game: ゲーム状態
+            dealer_service: ベット回収・ボード配布に使うDealerService
+            run_count: ランアウト数（省略時は game.run_it_times）
             
         Returns:
             勝者情報のリスト
         """
+        # 現在のラウンドのベットをポットに回収
+        if dealer_service is not None:
+            dealer_service.collect_bets_to_pots(game)
+
         in_hand_seats = game.table.in_hand_seats()
         
         if len(in_hand_seats) == 1:
@@ -118,9 +194,14 @@ class ShowdownService:
             
             return winners
         
+        # オールインでボードが残っている場合、指定回数ならランアウトを複数回走らせる
+        run_count = run_count or game.run_it_times
+        if dealer_service is not None and len(game.table.community_cards) < 5 and run_count > 1:
+            return self.evaluate_multi_runout(game, dealer_service, run_count)
+
         # コミュニティカードが5枚未満の場合、残りを配る
-        while len(game.table.community_cards) < 5:
-            dealer_service.deal_community_card(game)
+        if dealer_service is not None:
+            dealer_service.deal_remaining_board(game)
         
         # ショーダウン評価
         game.current_round = Round.SHOWDOWN
@@ -0,0 +1,185 @@
+"""
+テーブルごとのアクター
+1テーブルの状態を変更する処理（アクション・ハンド開始・着席・タイムアウト）を
+受信箱に積み、テーブル専用の1つのタスクが到着順に適用する。
+テーブル同士は別のタスクなので並行に進み、全体のロックは使わない。
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 受信箱に積むコマンド（引数なしで呼ぶとコルーチンを返す）
+Command = Callable[[], Awaitable[Any]]
+
+
+class TableActor:
+    """
+    1テーブル分の受信箱と、それを順に処理するタスク
+
+    Args:
+        game_id: ゲームID
+    """
+
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.processed: int = 0
+        self._inbox: "asyncio.Queue[Optional[Tuple[Command, asyncio.Future]]]" = asyncio.Queue()
+        self._task: asyncio.Task = asyncio.get_running_loop().create_task(
+            self._run(), name=f"table-actor-{game_id}"
+        )
+
+    @property
+    def pending(self) -> int:
+        """受信箱で待っているコマンド数"""
+        return self._inbox.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        """タスクが動作中かどうか"""
+        return not self._task.done()
+
+    def in_actor(self) -> bool:
+        """現在のタスクがこのアクター自身かどうか（再入の判定）"""
+        return asyncio.current_task() is self._task
+
+    def submit(self, command: Command) -> "asyncio.Future[Any]":
+        """
+        コマンドを受信箱に積む
+
+        Returns:
+            asyncio.Future: コマンドの戻り値（例外はそのまま伝わる）
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._inbox.put_nowait((command, future))
+        return future
+
+    def stop(self) -> None:
+        """積まれているコマンドを処理し終えたらタスクを終了する"""
+        self._inbox.put_nowait(None)
+
+    def cancel(self) -> None:
+        """
+        タスクを止め、実行中と未処理のコマンドの結果をNoneにする
+
+        待っている呼び出し側には、テーブルが存在しない場合と同じNoneを返す
+        （CancelledError を受信ループなどに伝えない）。
+        """
+        self._task.cancel()
+        while not self._inbox.empty():
+            item = self._inbox.get_nowait()
+            if item is not None and not item[1].done():
+                item[1].set_result(None)
+
+    async def wait_closed(self) -> None:
+        """タスクの終了を待つ"""
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """受信箱のコマンドを1つずつ適用する"""
+        while True:
+            item = await self._inbox.get()
+            if item is None:
+                return
+            command, future = item
+            if future.cancelled():
+                continue
+            try:
+                result = await command()
+            except asyncio.CancelledError:
+                # アクターの停止で中断した: 呼び出し側はキャンセルせずNoneで再開させる
+                if not future.done():
+                    future.set_result(None)
+                raise
+            except Exception as e:
+                if future.cancelled():
+                    logger.error(f"Table command failed in game {self.game_id}: {e}", exc_info=True)
+                else:
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self.processed += 1
+
+
+class TableActorRegistry:
+    """
+    テーブルIDごとのアクターを管理する
+
+    - run(game_id, fn, *args) で fn をテーブルのアクター上で実行し、結果を待つ
+    - アクター上で実行中のコマンドから同じテーブルに run した場合は、受信箱に積まずにその場で実行する
+      （自分自身の完了を待つデッドロックを防ぐ）
+    - close(game_id) でテーブル削除時にアクターを止める
+    - is_open が False を返すテーブル（存在しない・削除済み）にはアクターを作らない
+
+    Args:
+        is_open: テーブルが存在するかを返す関数（Noneなら常に作成する）
+    """
+
+    def __init__(self, is_open: Optional[Callable[[str], bool]] = None):
+        self.is_open = is_open
+        self._actors: Dict[str, TableActor] = {}
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def get(self, game_id: str) -> Optional[TableActor]:
+        """テーブルのアクターを取得（なければ作成、テーブルが存在しなければNone）"""
+        actor = self._actors.get(game_id)
+        if actor is not None and actor.is_running:
+            return actor
+        if self.is_open is not None and not self.is_open(game_id):
+            return None
+        actor = TableActor(game_id)
+        self._actors[game_id] = actor
+        return actor
+
+    async def run(self, game_id: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        fn(*args) をテーブルのアクター上で実行する
+
+        Args:
+            game_id: ゲームID
+            fn: 実行するコルーチン関数
+            *args: fnの引数
+
+        Returns:
+            Any: fnの戻り値（テーブルが存在しなければ実行せずNone）
+        """
+        actor = self.get(game_id)
+        if actor is None:
+            return None
+        if actor.in_actor():
+            return await fn(*args)
+        return await actor.submit(lambda: fn(*args))
+
+    def close(self, game_id: str) -> Optional[TableActor]:
+        """
+        テーブルのアクターを止める（テーブル削除時）
+
+        Returns:
+            Optional[TableActor]: 止めたアクター（終了は wait_closed で待つ）
+        """
+        actor = self._actors.pop(game_id, None)
+        if actor is not None:
+            actor.cancel()
+        return actor
+
+    async def shutdown(self) -> None:
+        """積まれているコマンドを処理し終えてから全アクターを止める"""
+        actors = list(self._actors.values())
+        self._actors.clear()
+        for actor in actors:
+            actor.stop()
+        for actor in actors:
+            await actor.wait_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        """アクターの統計"""
+        return {
+            "tables": len(self._actors),
+            "pending": sum(actor.pending for actor in self._actors.values()),
+            "processed": sum(actor.processed for actor in self._actors.values()),
+        }
@@ -0,0 +1,180 @@
+# server/app/game/services/timer_service.py
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+from app.core.timer_wheel import TimerWheelScheduler, TimerHandle
+from ..domain.game_state import GameState
+from ..domain.enum import ActionType, GameStatus
+from .game_service import GameService, game_service as default_game_service
+
+logger = logging.getLogger(__name__)
+
+# タイムアウト時に呼ばれるリスナー (game_id, player_id, action_type)
+TimeoutListener = Callable[[str, str, ActionType], Awaitable[None]]
+# ブラインドレベルを1つ上げる関数（次のレベルがあればTrue）
+BlindLevelUp = Callable[[], bool]
+# 手番を識別するトークン（ハンド番号・座席・ラウンド・ハンド内のアクション数）
+TurnToken = Tuple[int, int, str, int]
+
+
+class TimerService:
+    """
+    全テーブル共有のタイマーサービス
+
+    ターンの制限時間とブラインドスケジュールを、1つの階層型タイマーホイールで
+    駆動する。テーブルごとにasyncioタスクやcall_laterハンドルは作らない。
+    """
+
+    def __init__(
+        self,
+        game_service: Optional[GameService] = None,
+        scheduler: Optional[TimerWheelScheduler] = None,
+        turn_timeout: float = 30.0
+    ):
+        self.game_service = game_service or default_game_service
+        self.scheduler = scheduler or TimerWheelScheduler()
+        self.turn_timeout: float = turn_timeout
+
+        self._turn_clocks: Dict[str, TimerHandle] = {}   # game_id -> ターン制限タイマー
+        self._blind_timers: Dict[str, TimerHandle] = {}  # スケジュールのキー -> ブラインドレベルタイマー
+        self._timeout_listeners: List[TimeoutListener] = []
+
+    def start(self) -> None:
+        """タイマーの駆動を開始（イベントループ起動後に呼ぶ）"""
+        self.scheduler.start()
+
+    async def stop(self) -> None:
+        """タイマーの駆動を停止"""
+        await self.scheduler.stop()
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """共有ホイールに任意のタイマーを登録する"""
+        return self.scheduler.call_later(delay, callback, *args)
+
+    def add_timeout_listener(self, listener: TimeoutListener) -> None:
+        """タイムアウトによる自動アクション後に呼ばれるリスナーを登録"""
+        self._timeout_listeners.append(listener)
+
+    # === ターン制限時間 ===
+
+    def arm_turn_clock(self, game_id: str, timeout: Optional[float] = None) -> None:
+        """
+        現在の手番プレイヤーのターン制限時間を（再）設定する
+
+        状態が変わるたびに呼び出す。前のタイマーはキャンセルされる。
+
+        Args:
+            game_id: ゲームID
+            timeout: 制限時間（秒）。省略時は turn_timeout
+        """
+        self.cancel_turn_clock(game_id)
+
+        game = self.game_service.get_game_state(game_id)
+        if not game or game.status != GameStatus.IN_PROGRESS or game.current_seat_index is None:
+            return
+
+        seat = game.table.seats[game.current_seat_index]
+        if not seat.is_occupied or not seat.is_active:
+            return
+
+        self._turn_clocks[game_id] = self.scheduler.call_later(
+            timeout if timeout is not None else self.turn_timeout,
+            self._on_turn_timeout,
+            game_id,
+            self._turn_token(game)
+        )
+
+    def cancel_turn_clock(self, game_id: str) -> None:
+        """ターン制限時間のタイマーをキャンセル"""
+        handle = self._turn_clocks.pop(game_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    async def _on_turn_timeout(self, game_id: str, token: TurnToken) -> None:
+        """制限時間切れ: チェックできればチェック、できなければフォールド"""
+        self._turn_clocks.pop(game_id, None)
+        if not self.game_service.get_game_state(game_id):
+            return
+
+        # 手番の確認と自動アクションはテーブルのアクター上でまとめて行う
+        applied = await self.game_service.run_on_table(game_id, self._apply_turn_timeout, game_id, token)
+        if applied is None:
+            return
+
+        player_id, action_type = applied
+        self.arm_turn_clock(game_id)
+        for listener in self._timeout_listeners:
+            try:
+                await listener(game_id, player_id, action_type)
+            except Exception as e:
+                logger.error(f"Timeout listener failed: {e}", exc_info=True)
+
+    async def _apply_turn_timeout(
+        self, game_id: str, token: TurnToken
+    ) -> Optional[Tuple[str, ActionType]]:
+        """手番が変わっていなければ自動アクションを適用し、(player_id, action_type) を返す"""
+        game = self.game_service.get_game_state(game_id)
+        if not game or game.status != GameStatus.IN_PROGRESS or game.current_seat_index is None:
+            return None
+        # タイマー設定後に手番が進んでいれば何もしない
+        if self._turn_token(game) != token:
+            return None
+
+        seat = game.table.seats[game.current_seat_index]
+        if not seat.is_occupied:
+            return None
+
+        player_id = seat.player.id
+        valid_actions = self.game_service.get_valid_actions(game_id, player_id)
+        action_type = ActionType.CHECK if ActionType.CHECK in valid_actions else ActionType.FOLD
+
+        logger.info(f"Turn timeout in game {game_id}: {seat.player.name} auto {action_type.value}")
+        success = await self.game_service.process_player_action(game_id, player_id, action_type)
+        if not success:
+            return None
+        return player_id, action_type
+
+    @staticmethod
+    def _turn_token(game: GameState) -> TurnToken:
+        """手番を識別するトークン（前のハンドのタイマーが次のハンドに効かないようハンド番号を含む）"""
+        return (game.hand_number, game.current_seat_index, game.current_round.value, len(game.history))
+
+    # === ブラインドスケジュール ===
+
+    def schedule_blind_levels(self, key: str, interval: float, level_up: BlindLevelUp) -> None:
+        """
+        interval秒ごとに level_up を呼び、ブラインドレベルを上げる
+
+        ブラインドの値は level_up の側（トーナメント）が持ち、各テーブルへは次のハンドの開始時に反映する。
+        level_up が False を返したら（最後のレベルに達したら）スケジュールを終える。
+
+        Args:
+            key: スケジュールのキー（トーナメントID）
+            interval: レベルの長さ（秒）
+            level_up: レベルを1つ上げる関数
+        """
+        self.cancel_blind_schedule(key)
+        if interval > 0:
+            self._blind_timers[key] = self.scheduler.call_later(
+                interval, self._on_blind_level_up, key, interval, level_up
+            )
+
+    def cancel_blind_schedule(self, key: str) -> None:
+        """ブラインドスケジュールをキャンセル"""
+        handle = self._blind_timers.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _on_blind_level_up(self, key: str, interval: float, level_up: BlindLevelUp) -> None:
+        """レベルを上げ、次のレベルがあればタイマーを登録し直す"""
+        self._blind_timers.pop(key, None)
+        if level_up():
+            self.schedule_blind_levels(key, interval, level_up)
+
+    def cancel_game(self, game_id: str) -> None:
+        """ゲームに紐づく全タイマーをキャンセル"""
+        self.cancel_turn_clock(game_id)
+        self.cancel_blind_schedule(game_id)
+
+
+# グローバルサービスインスタンス
+timer_service = TimerService()
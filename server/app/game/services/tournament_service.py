@@ -0,0 +1,447 @@
+# server/app/game/services/tournament_service.py
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import math
+from app.core.timer_wheel import TimerHandle
+from app.sharding.ring import shard_config
+from ..domain.game_state import GameState
+from ..domain.player import Player
+from ..domain.seat import Seat
+from ..domain.tournament import Tournament, BlindLevel, TableMove
+from ..domain.enum import GameStatus, SeatStatus
+from .game_service import GameService, game_service as default_game_service
+from .game_lifecycle import GameLifecycleManager, game_lifecycle, CLOSE_TABLE_BROKEN
+from .timer_service import TimerService, timer_service
+
+logger = logging.getLogger(__name__)
+
+# テーブルの状態が変わったときに呼ばれるリスナー (table_id)
+TableListener = Callable[[str], Awaitable[None]]
+
+
+class TournamentService:
+    """マルチテーブルトーナメントの進行を管理するサービス
+
+    - テーブルの人数差が2以上にならないようにプレイヤーを移動する
+    - 残り人数が少ないテーブル数に収まるようになったらテーブルを解散する
+    - ブラインドレベルを全テーブルで同期する
+
+    ハンドごとの処理はハンドが終わったテーブルの座席だけを走査するため、
+    参加人数に比例するスキャンは行わない。
+
+    start_tournament の後は、テーブルのハンドが終わるたびに hand_interval 秒おいて
+    敗退・解散・人数調整を行い、次のハンドを開始する。ブラインドレベルは level_interval 秒ごとに
+    上がり、各テーブルには次のハンドの開始時に反映される（どちらも共有タイマーホイールで駆動）。
+    """
+
+    def __init__(
+        self,
+        game_service: Optional[GameService] = None,
+        timer: Optional[TimerService] = None,
+        lifecycle: Optional[GameLifecycleManager] = None,
+        hand_interval: float = 3.0,
+        level_interval: float = 600.0
+    ):
+        self.game_service = game_service or default_game_service
+        self.timer = timer or timer_service
+        self.lifecycle = lifecycle or game_lifecycle
+        self.hand_interval: float = hand_interval
+        self.level_interval: float = level_interval  # 作成時に指定がなければこの秒数でレベルを上げる
+        self.tournaments: Dict[str, Tournament] = {}
+        self.table_tournament: Dict[str, str] = {}  # table_id -> tournament_id
+        self._next_hand_timers: Dict[str, TimerHandle] = {}  # table_id -> 次のハンドのタイマー
+        self._seating_locks: Dict[str, asyncio.Lock] = {}  # tournament_id -> 席替えを1つずつ行うロック
+        self._hand_started_listener: Optional[TableListener] = None
+        self._seats_changed_listener: Optional[TableListener] = None
+
+    def set_hand_started_listener(self, listener: TableListener) -> None:
+        """テーブルでハンドを開始したときに呼ばれるリスナーを設定（ターン制限時間・配信・AI）"""
+        self._hand_started_listener = listener
+
+    def set_seats_changed_listener(self, listener: TableListener) -> None:
+        """ハンドを開始せずに着席者が変わったときに呼ばれるリスナーを設定（配信）"""
+        self._seats_changed_listener = listener
+
+    async def create_tournament(
+        self,
+        entrants: List[Player],
+        seats_per_table: int = 9,
+        starting_stack: int = 10000,
+        blind_levels: Optional[List[BlindLevel]] = None,
+        level_interval: Optional[float] = None
+    ) -> Tournament:
+        """
+        トーナメントを作成し、参加者をテーブルに均等に配置する
+
+        Args:
+            entrants: 参加プレイヤー
+            seats_per_table: 1テーブルあたりの座席数
+            starting_stack: 初期スタック
+            blind_levels: ブラインドレベルの一覧
+            level_interval: ブラインドレベルの長さ（秒、省略時は self.level_interval、0で上げない）
+
+        Returns:
+            Tournament: 作成されたトーナメント
+        """
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least 2 entrants")
+        if seats_per_table < 2:
+            raise ValueError("seats_per_table must be at least 2")
+
+        tournament = Tournament(
+            seats_per_table, starting_stack, blind_levels,
+            level_interval=self.level_interval if level_interval is None else level_interval
+        )
+        # シャーディング時はトーナメントもテーブルと同じくこのプロセスの担当になるID
+        tournament.id = shard_config.new_game_id()
+        self.tournaments[tournament.id] = tournament
+
+        table_count = math.ceil(len(entrants) / seats_per_table)
+        level = tournament.current_level
+        table_ids = []
+        for _ in range(table_count):
+            # シャーディング時はこのプロセスの担当になるID
+            table_id = shard_config.new_game_id()
+            game = await self.game_service.create_game(
+                table_id, big_blind=level.big_blind, seat_count=seats_per_table
+            )
+            game.small_blind = level.small_blind
+            tournament.add_table(table_id, game)
+            tournament.table_levels[table_id] = tournament.level_index
+            self.table_tournament[table_id] = tournament.id
+            table_ids.append(table_id)
+
+        # ラウンドロビンで配置して人数差を1以下にする
+        for i, player in enumerate(entrants):
+            table_id = table_ids[i % table_count]
+            await self._on_table(table_id, self._seat_player, tournament, table_id, player, starting_stack)
+
+        return tournament
+
+    def get_tournament(self, tournament_id: str) -> Optional[Tournament]:
+        """トーナメントを取得"""
+        return self.tournaments.get(tournament_id)
+
+    async def start_tournament(self, tournament_id: str) -> bool:
+        """
+        全テーブルで最初のハンドを開始する
+
+        Args:
+            tournament_id: トーナメントID
+
+        Returns:
+            bool: 開始したらTrue（存在しない・開始済み・終了済みならFalse）
+        """
+        tournament = self.tournaments.get(tournament_id)
+        if not tournament or tournament.is_started or tournament.is_finished:
+            return False
+        tournament.is_started = True
+        if len(tournament.blind_levels) > 1:
+            self.timer.schedule_blind_levels(
+                tournament.id, tournament.level_interval, lambda: self._on_blind_level_up(tournament.id)
+            )
+        for table_id in list(tournament.tables):
+            await self._start_table(table_id)
+        return True
+
+    def advance_blind_level(self, tournament_id: str) -> Optional[BlindLevel]:
+        """
+        ブラインドレベルを1つ進める
+
+        各テーブルへの反映は次のハンド開始時に行うため、この呼び出しはO(1)。
+        """
+        tournament = self.tournaments.get(tournament_id)
+        if not tournament or tournament.is_finished:
+            return None
+        if tournament.level_index < len(tournament.blind_levels) - 1:
+            tournament.level_index += 1
+        return tournament.current_level
+
+    def _on_blind_level_up(self, tournament_id: str) -> bool:
+        """ブラインドスケジュールのタイマーから呼ばれる: レベルを上げ、まだ上がる余地があればTrue"""
+        level = self.advance_blind_level(tournament_id)
+        if level is None:
+            return False
+        tournament = self.tournaments[tournament_id]
+        logger.info(f"Blinds up in tournament {tournament_id}: {level.small_blind}/{level.big_blind}")
+        return tournament.level_index < len(tournament.blind_levels) - 1
+
+    async def on_hand_complete(self, table_id: str) -> List[TableMove]:
+        """
+        テーブルのハンド終了時の処理
+
+        1. 敗退者（スタック0）を取り除く
+        2. テーブルを解散できるなら、全員を他のテーブルへ移動する
+        3. 人数差が2以上なら、このテーブルから最少テーブルへ移動する
+
+        各テーブルの GameState の変更は、そのテーブルのアクター上で行う。
+        解散したテーブルはトーナメントから外れるだけなので、ゲームの破棄は呼び出し側で行う。
+
+        Args:
+            table_id: ハンドが終了したテーブルID
+
+        Returns:
+            List[TableMove]: 実行したプレイヤー移動
+        """
+        tournament = self._get_tournament_for_table(table_id)
+        if not tournament or tournament.is_finished:
+            return []
+
+        # 移動の途中でアクターを待つ間に、他のテーブルの解散・人数調整が割り込まないようにする
+        lock = self._seating_locks.setdefault(tournament.id, asyncio.Lock())
+        async with lock:
+            return await self._reseat(tournament, table_id)
+
+    async def _reseat(self, tournament: Tournament, table_id: str) -> List[TableMove]:
+        """on_hand_complete の本体（トーナメントの席替えロックを持って呼ぶ）"""
+        if tournament.is_finished or table_id not in tournament.tables:
+            return []
+
+        game = tournament.tables[table_id]
+        await self._on_table(table_id, self._remove_busted_players, tournament, table_id, game)
+
+        if tournament.remaining_players <= 1:
+            tournament.is_finished = True
+            return []
+
+        if self._should_break_table(tournament, table_id):
+            return await self._break_table(tournament, table_id)
+
+        return await self._balance_from(tournament, table_id)
+
+    def start_next_hand(self, table_id: str) -> bool:
+        """ブラインドレベルを同期してテーブルの次のハンドを開始する"""
+        tournament = self._get_tournament_for_table(table_id)
+        if not tournament or tournament.is_finished:
+            return False
+
+        game = tournament.tables.get(table_id)
+        if not game:
+            return False
+
+        self._sync_blinds(tournament, table_id, game)
+        return self.game_service.poker_engine.start_new_hand(game)
+
+    async def _start_next_hand(self, table_id: str) -> bool:
+        started = self.start_next_hand(table_id)
+        game = self.game_service.get_game_state(table_id)
+        # ブラインドだけでオールインになり開始と同時に決着したら、ハンド終了として次へ進める
+        if started and game is not None and game.status == GameStatus.HAND_COMPLETE:
+            await self.game_service.notify_hand_complete(table_id)
+        return started
+
+    async def _start_table(self, table_id: str) -> bool:
+        """テーブルのアクター上で次のハンドを開始し、開始できたらリスナーに通知する"""
+        started = await self.game_service.run_on_table(table_id, self._start_next_hand, table_id)
+        if started and self._hand_started_listener is not None:
+            await self._hand_started_listener(table_id)
+        return bool(started)
+
+    async def _on_hand_complete(self, table_id: str) -> None:
+        """ハンド終了の通知（テーブルのアクター上）: hand_interval 秒後にハンド間の処理を行う"""
+        if table_id not in self.table_tournament or table_id in self._next_hand_timers:
+            return
+        self._next_hand_timers[table_id] = self.timer.call_later(
+            self.hand_interval, self._between_hands, table_id
+        )
+
+    async def _between_hands(self, table_id: str) -> None:
+        """敗退・解散・人数調整を行い、このテーブルと移動先の止まっているテーブルでハンドを開始する"""
+        self._next_hand_timers.pop(table_id, None)
+        tournament = self._get_tournament_for_table(table_id)
+        if not tournament or tournament.is_finished:
+            return
+
+        moves = await self.on_hand_complete(table_id)
+        if table_id not in tournament.tables:
+            await self.lifecycle.close_game(table_id, CLOSE_TABLE_BROKEN)
+
+        changed = [table_id] if table_id in tournament.tables else []
+        for move in moves:
+            if move.to_table_id not in changed:
+                changed.append(move.to_table_id)
+
+        if tournament.is_finished:
+            self._finish_tournament(tournament)
+            for changed_id in changed:
+                await self._notify_seats_changed(changed_id)
+            return
+
+        for changed_id in changed:
+            game = tournament.tables.get(changed_id)
+            if game is None:
+                continue
+            # ハンド中のテーブルと次のハンドを待っているテーブルは、着席者の変更だけを配信する
+            idle = game.status != GameStatus.IN_PROGRESS and changed_id not in self._next_hand_timers
+            if not idle or not await self._start_table(changed_id):
+                await self._notify_seats_changed(changed_id)
+
+    async def _on_table(self, table_id: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """同期関数 fn(*args) をテーブルのアクター上で実行する（テーブルが破棄済みならNone）"""
+        async def command() -> Any:
+            return fn(*args)
+        return await self.game_service.run_on_table(table_id, command)
+
+    async def _notify_seats_changed(self, table_id: str) -> None:
+        if self._seats_changed_listener is not None:
+            await self._seats_changed_listener(table_id)
+
+    def _finish_tournament(self, tournament: Tournament) -> None:
+        """終了したトーナメントのタイマーを止め、残ったテーブルを通常の破棄の対象に戻す"""
+        self.timer.cancel_blind_schedule(tournament.id)
+        self._seating_locks.pop(tournament.id, None)
+        for table_id in tournament.tables:
+            handle = self._next_hand_timers.pop(table_id, None)
+            if handle is not None:
+                handle.cancel()
+            self.lifecycle.unpin(table_id)
+        logger.info(f"Tournament {tournament.id} finished")
+
+    async def _on_game_closed(self, game_id: str, reason: str) -> None:
+        """トーナメントのテーブルが外部から破棄されたら、座っていたプレイヤーを敗退扱いで外す"""
+        tournament = self._get_tournament_for_table(game_id)
+        if tournament is None or game_id not in tournament.tables:
+            return
+        handle = self._next_hand_timers.pop(game_id, None)
+        if handle is not None:
+            handle.cancel()
+        for seat in tournament.tables[game_id].table.seats:
+            if seat.is_occupied and tournament.player_table.pop(seat.player.id, None) is not None:
+                tournament.finished_player_ids.append(seat.player.id)
+        tournament.remove_table(game_id)
+        self.table_tournament.pop(game_id, None)
+        if tournament.remaining_players <= 1 and not tournament.is_finished:
+            tournament.is_finished = True
+            self._finish_tournament(tournament)
+
+    def _get_tournament_for_table(self, table_id: str) -> Optional[Tournament]:
+        """テーブルIDから所属するトーナメントを取得"""
+        tournament_id = self.table_tournament.get(table_id)
+        if tournament_id is None:
+            return None
+        return self.tournaments.get(tournament_id)
+
+    def _sync_blinds(self, tournament: Tournament, table_id: str, game: GameState) -> None:
+        """テーブルのブラインドをトーナメントの現在レベルに合わせる"""
+        if tournament.table_levels.get(table_id) == tournament.level_index:
+            return
+        level = tournament.current_level
+        game.small_blind = level.small_blind
+        game.big_blind = level.big_blind
+        game.touch()
+        tournament.table_levels[table_id] = tournament.level_index
+
+    def _remove_busted_players(self, tournament: Tournament, table_id: str, game: GameState) -> None:
+        """スタックが0になったプレイヤーを敗退させる"""
+        for seat in game.table.seats:
+            if seat.is_occupied and seat.stack == 0:
+                player_id = seat.player.id
+                game.remove_player_by_id(player_id)
+                tournament.player_table.pop(player_id, None)
+                tournament.finished_player_ids.append(player_id)
+                tournament.change_count(table_id, -1)
+
+    def _should_break_table(self, tournament: Tournament, table_id: str) -> bool:
+        """このテーブルを解散しても残りのテーブルに全員が座れるか"""
+        table_count = len(tournament.tables)
+        if table_count <= 1:
+            return False
+        capacity_without = (table_count - 1) * tournament.seats_per_table
+        if tournament.remaining_players > capacity_without:
+            return False
+        # 最少人数のテーブルから解散する
+        return tournament.table_counts[table_id] <= tournament.smallest_count()
+
+    async def _break_table(self, tournament: Tournament, table_id: str) -> List[TableMove]:
+        """テーブルを解散し、全員を最少テーブルへ移動する"""
+        game = tournament.tables[table_id]
+        moves = []
+        for player_id in [seat.player.id for seat in game.table.seats if seat.is_occupied]:
+            if tournament.smallest_table_id(exclude=table_id) is None:
+                break
+            move = await self._move_player(tournament, table_id, player_id)
+            if move is not None:
+                moves.append(move)
+
+        tournament.remove_table(table_id)
+        self.table_tournament.pop(table_id, None)
+        return moves
+
+    async def _balance_from(self, tournament: Tournament, table_id: str) -> List[TableMove]:
+        """このテーブルの人数が最少テーブル+1を超えていれば移動する"""
+        game = tournament.tables[table_id]
+        moves = []
+        for player_id in [seat.player.id for seat in game.table.seats if seat.is_occupied]:
+            if tournament.table_counts[table_id] <= tournament.smallest_count(exclude=table_id) + 1:
+                break
+            if tournament.smallest_table_id(exclude=table_id) is None:
+                break
+            move = await self._move_player(tournament, table_id, player_id)
+            if move is not None:
+                moves.append(move)
+        return moves
+
+    async def _move_player(self, tournament: Tournament, from_table_id: str, player_id: str) -> Optional[TableMove]:
+        """
+        プレイヤーをスタックごと最少テーブルへ移動する
+
+        移動元で立たせてから移動先に座らせる。それぞれのテーブルのアクター上で変更する。
+
+        Returns:
+            Optional[TableMove]: 実行した移動（プレイヤーがすでに離席していればNone）
+        """
+        source = tournament.tables[from_table_id]
+        unseated = await self._on_table(from_table_id, self._unseat_player, source, player_id)
+        if unseated is None:
+            return None
+        player, stack = unseated
+        tournament.change_count(from_table_id, -1)
+
+        to_table_id = tournament.smallest_table_id(exclude=from_table_id) or from_table_id
+        tournament.player_table[player.id] = to_table_id
+        tournament.change_count(to_table_id, 1)
+        target = tournament.tables[to_table_id]
+        seat_index = await self._on_table(to_table_id, self._sit_down, to_table_id, target, player, stack)
+        return TableMove(
+            player_id=player.id,
+            from_table_id=from_table_id,
+            to_table_id=to_table_id,
+            seat_index=seat_index
+        )
+
+    def _unseat_player(self, game: GameState, player_id: str) -> Optional[Tuple[Player, int]]:
+        """プレイヤーを席から外し、(プレイヤー, スタック) を返す（座っていなければNone）"""
+        for seat in game.table.seats:
+            if seat.is_occupied and seat.player.id == player_id:
+                player, stack = seat.player, seat.stack
+                game.remove_player_by_id(player_id)
+                return player, stack
+        return None
+
+    def _seat_player(self, tournament: Tournament, table_id: str, player: Player, stack: int) -> int:
+        """プレイヤーを空席に座らせてトーナメントの人数に数える"""
+        seat_index = self._sit_down(table_id, tournament.tables[table_id], player, stack)
+        tournament.player_table[player.id] = table_id
+        tournament.change_count(table_id, 1)
+        return seat_index
+
+    def _sit_down(self, table_id: str, game: GameState, player: Player, stack: int) -> int:
+        """プレイヤーを空席に座らせる（ハンド中なら次のハンドから参加）"""
+        empty_seats = game.table.empty_seats()
+        if not empty_seats:
+            raise ValueError(f"Table {table_id} has no empty seat")
+
+        seat_index = empty_seats[0]
+        game.add_player(player)
+        self.game_service.poker_engine.seat_player(game, player, seat_index=seat_index, buy_in=stack)
+        if game.status == GameStatus.IN_PROGRESS:
+            game.table.seats[seat_index].status = SeatStatus.SITTING_OUT
+            game.touch()
+        return seat_index
+
+
+# グローバルサービスインスタンス
+tournament_service = TournamentService()
+default_game_service.add_hand_complete_listener(tournament_service._on_hand_complete)
+game_lifecycle.add_close_listener(tournament_service._on_game_closed)
@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Any, Literal
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from typing import Annotated, Optional, Any, Literal, Union
+
+from app.game.domain.enum import ActionType
 
 # WebSocket message types used by client/server
 
@@ -15,6 +17,18 @@ class GetStateMessage(BaseWSMessage):
     type: Literal["get_state"] = "get_state"
 
 
+class ResyncMessage(BaseWSMessage):
+    type: Literal["resync"] = "resync"
+
+
+class PingMessage(BaseWSMessage):
+    type: Literal["ping"] = "ping"
+
+
+class PongMessage(BaseWSMessage):
+    type: Literal["pong"] = "pong"
+
+
 class ChatMessage(BaseWSMessage):
     type: Literal["chat"] = "chat"
     message: str = Field(..., min_length=0)
@@ -22,9 +36,20 @@ class ChatMessage(BaseWSMessage):
 
 class PlayerActionMessage(BaseWSMessage):
     type: Literal["player_action"] = "player_action"
-    action: Literal["FOLD", "CHECK", "CALL", "BET", "RAISE", "ALL_IN"]
+    action: ActionType
     amount: int = Field(0, ge=0)
 
+    @field_validator("action", mode="before")
+    @classmethod
+    def _upper_action(cls, value: Any) -> Any:
+        # Action names are case-insensitive on the wire
+        return value.upper() if isinstance(value, str) else value
+
+    @field_validator("amount", mode="before")
+    @classmethod
+    def _default_amount(cls, value: Any) -> Any:
+        return 0 if value is None else value
+
 
 class ErrorMessage(BaseWSMessage):
     type: Literal["error"] = "error"
@@ -35,3 +60,20 @@ class ServerMessage(BaseModel):
     type: str
     data: Optional[Any] = None
     error: Optional[str] = None
+
+
+# Messages the server accepts from game clients, selected by "type"
+ClientMessage = Annotated[
+    Union[
+        StartGameMessage,
+        PlayerActionMessage,
+        GetStateMessage,
+        ResyncMessage,
+        PingMessage,
+        PongMessage,
+    ],
+    Field(discriminator="type"),
+]
+
+# Built once at import; validates raw JSON or decoded dicts in a single pass
+client_message_adapter: TypeAdapter[ClientMessage] = TypeAdapter(ClientMessage)
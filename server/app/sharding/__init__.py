@@ -0,0 +1,18 @@
+"""
+複数プロセスへのシャーディング（game_id ごとに担当ワーカーを決める）
+"""
+from .ring import shard_for, ShardConfig, shard_config
+from .bus import MessageBus, InProcessMessageBus, LocalMessageBus, MessageBusHub
+from .node import shard_node, ShardNode
+
+__all__ = [
+    "shard_for",
+    "ShardConfig",
+    "shard_config",
+    "MessageBus",
+    "InProcessMessageBus",
+    "LocalMessageBus",
+    "MessageBusHub",
+    "shard_node",
+    "ShardNode"
+]
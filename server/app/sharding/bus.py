@@ -0,0 +1,184 @@
+"""
+ワーカープロセス間のメッセージバス
+
+- InProcessMessageBus: 単一プロセス用（購読者をその場で呼ぶ）
+- MessageBusHub / LocalMessageBus: 1台のマシン上で複数プロセスをつなぐローカル版。
+  ハブがTCPで待ち受け、JSONを1行ずつやり取りする（本番ではRedisやNATSなどに置き換える想定）
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 購読ハンドラ (topic, data)
+Handler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """'host:port' を (host, port) に分解"""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class MessageBus:
+    """メッセージバスの基底クラス"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        """トピックにメッセージを送る"""
+        raise NotImplementedError
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """トピックを購読"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def close(self) -> None:
+        """接続を閉じる"""
+
+    async def _dispatch(self, topic: str, data: Dict[str, Any]) -> None:
+        """購読ハンドラを呼ぶ（例外はログに残して続行）"""
+        for handler in list(self._handlers.get(topic, [])):
+            try:
+                await handler(topic, data)
+            except Exception as e:
+                logger.error(f"Message handler failed for topic {topic}: {e}", exc_info=True)
+
+
+class InProcessMessageBus(MessageBus):
+    """同じプロセス内の購読者にだけ届けるメッセージバス"""
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        await self._dispatch(topic, data)
+
+
+class MessageBusHub:
+    """
+    LocalMessageBus をつなぐハブ（ランチャープロセスで動かす）
+
+    クライアントからの1行は {"op": "subscribe", "topic": ...} または
+    {"op": "publish", "topic": ..., "data": ...}。
+    publish は送信元を除くそのトピックの購読者に {"topic": ..., "data": ...} として転送する。
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._subscribers: Dict[str, Set[asyncio.StreamWriter]] = {}
+
+    @property
+    def address(self) -> str:
+        """待ち受けアドレス（'host:port'）"""
+        return f"{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """待ち受けを開始（port=0なら空いているポートを使う）"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Message bus hub listening on {self.address}")
+
+    async def stop(self) -> None:
+        """待ち受けを停止"""
+        if self._server is None:
+            return
+        self._server.close()
+        for writers in self._subscribers.values():
+            for writer in writers:
+                writer.close()
+        self._subscribers.clear()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get("op") == "subscribe":
+                    self._subscribers.setdefault(message["topic"], set()).add(writer)
+                elif message.get("op") == "publish":
+                    await self._forward(writer, message["topic"], message.get("data", {}))
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logger.warning(f"Message bus client error: {e}")
+        finally:
+            for writers in self._subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    async def _forward(self, sender: asyncio.StreamWriter, topic: str, data: Dict[str, Any]) -> None:
+        line = json.dumps({"topic": topic, "data": data}).encode() + b"\n"
+        for writer in list(self._subscribers.get(topic, ())):
+            if writer is sender:
+                continue
+            try:
+                writer.write(line)
+                await writer.drain()
+            except ConnectionError:
+                self._subscribers[topic].discard(writer)
+
+
+class LocalMessageBus(MessageBus):
+    """
+    MessageBusHub 経由で他のプロセスとつながるメッセージバス
+
+    自分が publish したメッセージは同じプロセスの購読者にも届く。
+
+    Args:
+        address: ハブのアドレス（'host:port'）
+    """
+
+    def __init__(self, address: str):
+        super().__init__()
+        self.address = address
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """ハブに接続し、登録済みのトピックを購読する"""
+        host, port = parse_address(self.address)
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        for topic in self._handlers:
+            await self._send({"op": "subscribe", "topic": topic})
+        self._task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        first = topic not in self._handlers
+        super().subscribe(topic, handler)
+        if first and self._writer is not None:
+            self._writer.write(json.dumps({"op": "subscribe", "topic": topic}).encode() + b"\n")
+
+    async def publish(self, topic: str, data: Dict[str, Any]) -> None:
+        await self._dispatch(topic, data)
+        if self._writer is not None:
+            await self._send({"op": "publish", "topic": topic, "data": data})
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    logger.warning(f"Message bus hub {self.address} closed the connection")
+                    return
+                message = json.loads(line)
+                await self._dispatch(message["topic"], message.get("data", {}))
+        except asyncio.CancelledError:
+            pass
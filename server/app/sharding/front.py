@@ -0,0 +1,198 @@
+"""
+ルーティングフロント
+REST API と WebSocket を、game_id を担当するワーカープロセスに転送する。
+
+- /api/games/{game_id}... と /ws/game/{game_id}、/ws/spectate/{game_id} は shard_for(game_id) のワーカーへ
+- /api/tournaments/{tournament_id}... も同様（トーナメントとそのテーブルは同じワーカーが担当する）
+- ゲーム作成などゲームに紐づかないリクエストはラウンドロビン
+  （ワーカーは自分の担当になるIDでゲームを作るので、以降は担当ワーカーに届く）
+- GET /api/shards でワーカーごとのゲーム数（メッセージバスで集計）を返す
+"""
+from fastapi import FastAPI, Request, Response, WebSocket, status
+from typing import Dict, List, Optional, Set
+import asyncio
+import itertools
+import logging
+
+import httpx
+import websockets
+from websockets.exceptions import ConnectionClosed
+
+from .bus import LocalMessageBus, MessageBus
+from .node import GAMES_TOPIC
+from .ring import shard_for
+
+logger = logging.getLogger(__name__)
+
+# 転送しないヘッダー（ホップごと、またはhttpxが付け直すもの）
+_HOP_HEADERS = {
+    "host", "connection", "keep-alive", "transfer-encoding", "upgrade",
+    "content-length", "content-encoding",
+}
+
+
+class ShardRouter:
+    """
+    ワーカーのURLと担当の対応
+
+    Args:
+        worker_urls: シャード番号順のワーカーのベースURL（例: http://127.0.0.1:8101）
+    """
+
+    def __init__(self, worker_urls: List[str]):
+        if not worker_urls:
+            raise ValueError("At least one worker is required")
+        self.worker_urls = [url.rstrip("/") for url in worker_urls]
+        self._round_robin = itertools.cycle(range(len(self.worker_urls)))
+
+    def url_for_game(self, game_id: str) -> str:
+        """game_id を担当するワーカーのURL"""
+        return self.worker_urls[shard_for(game_id, len(self.worker_urls))]
+
+    def next_url(self) -> str:
+        """ゲームに紐づかないリクエストの転送先（ラウンドロビン）"""
+        return self.worker_urls[next(self._round_robin)]
+
+    def url_for_path(self, path: str) -> str:
+        """パスから転送先を決める"""
+        parts = path.strip("/").split("/")
+        if len(parts) >= 3 and parts[:2] == ["api", "games"] and parts[2] != "single-play":
+            return self.url_for_game(parts[2])
+        if len(parts) >= 3 and parts[:2] == ["api", "tournaments"]:
+            return self.url_for_game(parts[2])
+        return self.next_url()
+
+
+def create_front_app(worker_urls: List[str], bus_address: Optional[str] = None) -> FastAPI:
+    """
+    ルーティングフロントのアプリを作成
+
+    Args:
+        worker_urls: シャード番号順のワーカーのベースURL
+        bus_address: メッセージバスのハブのアドレス（省略時は /api/shards の集計なし）
+
+    Returns:
+        FastAPI: フロントのアプリ
+    """
+    router = ShardRouter(worker_urls)
+    app = FastAPI(title="Online Poker Game (routing front)")
+    state: Dict[str, object] = {}
+    games_by_shard: Dict[int, Set[str]] = {index: set() for index in range(len(worker_urls))}
+
+    async def on_games_event(topic: str, data: dict) -> None:
+        games = games_by_shard.setdefault(data["shard"], set())
+        if data["event"] == "created":
+            games.add(data["game_id"])
+        elif data["event"] == "deleted":
+            games.discard(data["game_id"])
+
+    @app.on_event("startup")
+    async def on_startup():
+        """転送用のHTTPクライアントとメッセージバスを準備"""
+        state["client"] = httpx.AsyncClient(timeout=30.0)
+        if bus_address:
+            bus = LocalMessageBus(bus_address)
+            bus.subscribe(GAMES_TOPIC, on_games_event)
+            try:
+                await bus.connect()
+                state["bus"] = bus
+            except OSError as e:
+                logger.error(f"Could not connect to message bus {bus_address}: {e}")
+
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        """HTTPクライアントとメッセージバスを閉じる"""
+        await state["client"].aclose()
+        bus: Optional[MessageBus] = state.get("bus")
+        if bus is not None:
+            await bus.close()
+
+    @app.get("/api/shards")
+    async def shards():
+        """ワーカーごとの担当ゲーム数"""
+        return {
+            "shards": [
+                {"index": index, "url": url, "games": len(games_by_shard.get(index, ()))}
+                for index, url in enumerate(router.worker_urls)
+            ]
+        }
+
+    @app.websocket("/ws/game/{game_id}")
+    async def proxy_game_websocket(websocket: WebSocket, game_id: str):
+        """ゲーム用WebSocketを担当ワーカーに中継する"""
+        await proxy_websocket(websocket, game_id, f"/ws/game/{game_id}")
+
+    @app.websocket("/ws/spectate/{game_id}")
+    async def proxy_spectate_websocket(websocket: WebSocket, game_id: str):
+        """観戦用WebSocketを担当ワーカーに中継する"""
+        await proxy_websocket(websocket, game_id, f"/ws/spectate/{game_id}")
+
+    async def proxy_websocket(websocket: WebSocket, game_id: str, path: str) -> None:
+        """担当ワーカーのWebSocketにつなぎ、双方向に中継する"""
+        upstream_url = router.url_for_game(game_id).replace("http", "ws", 1) + path
+        if websocket.url.query:
+            upstream_url += f"?{websocket.url.query}"
+        try:
+            upstream = await websockets.connect(upstream_url, max_size=None)
+        except Exception as e:
+            logger.warning(f"Upstream websocket for game {game_id} rejected: {e}")
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+        await websocket.accept()
+        to_upstream = asyncio.create_task(_client_to_upstream(websocket, upstream))
+        to_client = asyncio.create_task(_upstream_to_client(upstream, websocket))
+        done, pending = await asyncio.wait({to_upstream, to_client}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await upstream.close()
+        if to_client in done and not to_client.cancelled():
+            # ワーカー側が閉じた場合は同じコードでクライアントを閉じる
+            try:
+                await websocket.close(code=upstream.close_code or status.WS_1000_NORMAL_CLOSURE)
+            except RuntimeError:
+                pass
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+    async def proxy_http(request: Request, path: str):
+        """担当ワーカー（ゲームに紐づかなければラウンドロビン）にHTTPリクエストを転送"""
+        client: httpx.AsyncClient = state["client"]
+        url = router.url_for_path(path) + "/" + path
+        headers = {key: value for key, value in request.headers.items() if key.lower() not in _HOP_HEADERS}
+        try:
+            upstream = await client.request(
+                request.method, url, params=request.query_params, headers=headers, content=await request.body()
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Upstream request to {url} failed: {e}")
+            return Response(status_code=status.HTTP_502_BAD_GATEWAY)
+        response_headers = {
+            key: value for key, value in upstream.headers.items() if key.lower() not in _HOP_HEADERS
+        }
+        return Response(content=upstream.content, status_code=upstream.status_code, headers=response_headers)
+
+    return app
+
+
+async def _client_to_upstream(websocket: WebSocket, upstream) -> None:
+    """クライアント → ワーカー（テキスト/バイナリをそのまま）"""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if message.get("bytes") is not None:
+            await upstream.send(message["bytes"])
+        else:
+            await upstream.send(message["text"])
+
+
+async def _upstream_to_client(upstream, websocket: WebSocket) -> None:
+    """ワーカー → クライアント（テキスト/バイナリをそのまま）"""
+    try:
+        async for message in upstream:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(message)
+    except ConnectionClosed:
+        pass
@@ -0,0 +1,96 @@
+"""
+シャーディング構成のランチャー
+メッセージバスのハブ、ワーカープロセス（main:app）、ルーティングフロントを1台のマシンで起動する。
+
+実行方法（serverディレクトリで）:
+    python -m app.sharding.launcher --workers 4 --port 8000
+"""
+from typing import List
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+
+import uvicorn
+
+from .bus import MessageBusHub
+from .front import create_front_app
+from .node import BUS_ADDRESS_ENV
+from .ring import SHARD_COUNT_ENV, SHARD_INDEX_ENV
+
+logger = logging.getLogger(__name__)
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def spawn_workers(count: int, host: str, base_port: int, bus_address: str) -> List[subprocess.Popen]:
+    """
+    ワーカープロセスを起動（シャード番号 i のワーカーは base_port + i で待ち受ける）
+
+    Returns:
+        List[subprocess.Popen]: ワーカープロセス
+    """
+    workers = []
+    for index in range(count):
+        env = dict(os.environ)
+        env[SHARD_INDEX_ENV] = str(index)
+        env[SHARD_COUNT_ENV] = str(count)
+        env[BUS_ADDRESS_ENV] = bus_address
+        workers.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", str(base_port + index)],
+            cwd=SERVER_DIR,
+            env=env,
+        ))
+        logger.info(f"Started shard {index} on {host}:{base_port + index}")
+    return workers
+
+
+def stop_workers(workers: List[subprocess.Popen], timeout: float = 10.0) -> None:
+    """ワーカープロセスを停止"""
+    for worker in workers:
+        worker.terminate()
+    for worker in workers:
+        try:
+            worker.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+
+async def run(args: argparse.Namespace) -> None:
+    """ハブ・ワーカー・フロントを起動し、フロントが終了するまで待つ"""
+    hub = MessageBusHub(args.host, args.bus_port)
+    await hub.start()
+    workers = spawn_workers(args.workers, args.host, args.worker_base_port, hub.address)
+    worker_urls = [f"http://{args.host}:{args.worker_base_port + index}" for index in range(args.workers)]
+    # uvicorn は終了後に受け取ったシグナルを元のハンドラで送り直すため、
+    # 既定のハンドラのままだとワーカーを止める前にプロセスが終了してしまう
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: None)
+    try:
+        front = create_front_app(worker_urls, bus_address=hub.address)
+        server = uvicorn.Server(uvicorn.Config(front, host=args.front_host, port=args.port, log_level="info"))
+        await server.serve()
+    finally:
+        stop_workers(workers)
+        await hub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="game_id でシャーディングした複数ワーカー構成を起動")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="ワーカープロセス数")
+    parser.add_argument("--port", type=int, default=8000, help="ルーティングフロントのポート")
+    parser.add_argument("--front-host", default="0.0.0.0", help="ルーティングフロントの待ち受けアドレス")
+    parser.add_argument("--host", default="127.0.0.1", help="ワーカーとハブの待ち受けアドレス")
+    parser.add_argument("--worker-base-port", type=int, default=8101, help="シャード0のワーカーのポート")
+    parser.add_argument("--bus-port", type=int, default=8100, help="メッセージバスのハブのポート")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
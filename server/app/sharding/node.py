@@ -0,0 +1,68 @@
+"""
+このワーカープロセス（シャード）の情報と、他のプロセスとのメッセージバス
+"""
+from typing import Optional
+import logging
+import os
+
+from .bus import InProcessMessageBus, LocalMessageBus, MessageBus
+from .ring import ShardConfig, shard_config
+
+logger = logging.getLogger(__name__)
+
+BUS_ADDRESS_ENV = "POKER_BUS_ADDRESS"
+
+# ゲームの作成・削除を知らせるトピック
+GAMES_TOPIC = "games"
+
+
+class ShardNode:
+    """
+    ワーカープロセス1つ分のシャード
+
+    環境変数 POKER_BUS_ADDRESS があればハブに接続し、なければプロセス内のバスを使う。
+
+    Args:
+        config: シャード設定
+        bus_address: メッセージバスのハブのアドレス（'host:port'）
+    """
+
+    def __init__(self, config: Optional[ShardConfig] = None, bus_address: Optional[str] = None):
+        self.config = config or shard_config
+        self.bus_address = bus_address if bus_address is not None else os.getenv(BUS_ADDRESS_ENV)
+        self.bus: MessageBus = InProcessMessageBus()
+
+    async def start(self) -> None:
+        """メッセージバスに接続（ハブが指定されている場合）"""
+        if not self.bus_address:
+            return
+        bus = LocalMessageBus(self.bus_address)
+        try:
+            await bus.connect()
+        except OSError as e:
+            logger.error(f"Could not connect to message bus {self.bus_address}: {e}")
+            return
+        self.bus = bus
+        logger.info(f"Shard {self.config.index}/{self.config.count} connected to message bus {self.bus_address}")
+
+    async def stop(self) -> None:
+        """メッセージバスとの接続を閉じる"""
+        await self.bus.close()
+
+    async def announce_game(self, event: str, game_id: str) -> None:
+        """
+        ゲームの作成・削除を他のプロセスに知らせる
+
+        Args:
+            event: "created" または "deleted"
+            game_id: ゲームID
+        """
+        await self.bus.publish(GAMES_TOPIC, {
+            "event": event,
+            "game_id": game_id,
+            "shard": self.config.index,
+        })
+
+
+# グローバルインスタンス
+shard_node = ShardNode()
@@ -0,0 +1,69 @@
+"""
+game_id からゲームを担当するワーカープロセス（シャード）を決める
+ルーティングフロントとワーカーが同じ関数を使うため、担当表を共有する必要はない。
+"""
+from dataclasses import dataclass
+import os
+import uuid
+import zlib
+
+SHARD_INDEX_ENV = "POKER_SHARD_INDEX"
+SHARD_COUNT_ENV = "POKER_SHARD_COUNT"
+
+
+def shard_for(game_id: str, shard_count: int) -> int:
+    """
+    game_id を担当するシャード番号
+
+    Args:
+        game_id: ゲームID
+        shard_count: シャード数
+
+    Returns:
+        int: 0 〜 shard_count-1
+    """
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(game_id.encode()) % shard_count
+
+
+@dataclass(frozen=True)
+class ShardConfig:
+    """
+    このプロセスのシャード設定（単一プロセスでは index=0, count=1）
+
+    Args:
+        index: このプロセスのシャード番号
+        count: シャード数
+    """
+    index: int = 0
+    count: int = 1
+
+    @classmethod
+    def from_env(cls) -> "ShardConfig":
+        """環境変数 POKER_SHARD_INDEX / POKER_SHARD_COUNT から読み込む"""
+        count = max(1, int(os.getenv(SHARD_COUNT_ENV, "1")))
+        index = int(os.getenv(SHARD_INDEX_ENV, "0"))
+        if not 0 <= index < count:
+            raise ValueError(f"{SHARD_INDEX_ENV}={index} is out of range for {count} shards")
+        return cls(index=index, count=count)
+
+    @property
+    def enabled(self) -> bool:
+        """複数プロセスに分割されているかどうか"""
+        return self.count > 1
+
+    def owns(self, game_id: str) -> bool:
+        """このプロセスが game_id を担当しているかどうか"""
+        return shard_for(game_id, self.count) == self.index
+
+    def new_game_id(self) -> str:
+        """このプロセスの担当になる新しいゲームIDを生成"""
+        while True:
+            game_id = str(uuid.uuid4())
+            if self.owns(game_id):
+                return game_id
+
+
+# グローバルインスタンス
+shard_config = ShardConfig.from_env()
@@ -2,10 +2,30 @@
 WebSocket関連のモジュール
 """
 from .connection_manager import connection_manager, ConnectionManager
+from .client_connection import ClientConnection
+from .ai_turn_scheduler import ai_turn_scheduler, AITurnScheduler
+from .broadcast_coalescer import broadcast_coalescer, BroadcastCoalescer
+from .spectators import spectator_hub, SpectatorHub
+from .sessions import session_manager, SessionManager
+from .event_log import game_event_log, GameEventLog
+from .heartbeat import heartbeat_monitor, HeartbeatMonitor
 from .routes import router
 
 __all__ = [
     "connection_manager",
     "ConnectionManager",
+    "ClientConnection",
+    "ai_turn_scheduler",
+    "AITurnScheduler",
+    "broadcast_coalescer",
+    "BroadcastCoalescer",
+    "spectator_hub",
+    "SpectatorHub",
+    "session_manager",
+    "SessionManager",
+    "game_event_log",
+    "GameEventLog",
+    "heartbeat_monitor",
+    "HeartbeatMonitor",
     "router"
 ]
@@ -0,0 +1,178 @@
+"""
+テーブルごとのAIターンスケジューラ
+AIの進行はテーブル専用のタスクが担当し、人間プレイヤーのメッセージ処理は待たない
+"""
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+
+from app.game.services.game_service import game_service
+from app.game.services.ai_executor import ai_executor, AIExecutor
+from app.game.domain.action import PlayerAction
+from app.game.domain.enum import GameStatus
+from app.game.domain.game_state import GameState
+from app.game.domain.seat import Seat
+
+logger = logging.getLogger(__name__)
+
+# AIのアクション適用後に呼ばれるリスナー (game_id)
+StateListener = Callable[[str], Awaitable[None]]
+
+
+class AITurnScheduler:
+    """
+    テーブルごとに1つのタスクでAIターンを進めるスケジューラ
+
+    - notify(game_id) でテーブルのタスクを起こす（即座に戻る）
+    - AIの手番が続く限りアクションを適用し、上限回数は設けない
+    - 思考時間はデフォルト値とテーブルごとの上書きで設定可能（0で待たない）
+    - cancel(game_id) でテーブル削除時にタスクを停止する
+    """
+
+    def __init__(self, executor: Optional[AIExecutor] = None, think_time: float = 1.5):
+        self.executor = executor or ai_executor
+        self.think_time: float = think_time
+        self.enabled: bool = True  # 一括ディスパッチャ使用時はFalse
+        self._think_times: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._state_listener: Optional[StateListener] = None
+
+    def set_state_listener(self, listener: StateListener) -> None:
+        """AIのアクション適用後に呼ばれるリスナーを設定（ブロードキャスト等）"""
+        self._state_listener = listener
+
+    def set_think_time(self, game_id: str, seconds: float) -> None:
+        """テーブルごとの思考時間を設定"""
+        self._think_times[game_id] = max(0.0, seconds)
+
+    def notify(self, game_id: str) -> None:
+        """テーブルの状態が変わったことを通知し、AIの手番なら進める"""
+        if not self.enabled:
+            return
+        wakeup = self._wakeups.get(game_id)
+        task = self._tasks.get(game_id)
+        if wakeup is None or task is None or task.done():
+            wakeup = asyncio.Event()
+            self._wakeups[game_id] = wakeup
+            self._tasks[game_id] = asyncio.get_running_loop().create_task(
+                self._run(game_id, wakeup), name=f"ai-turns-{game_id}"
+            )
+        wakeup.set()
+
+    def cancel(self, game_id: str) -> None:
+        """テーブルのタスクを停止（テーブル削除時）"""
+        self._wakeups.pop(game_id, None)
+        self._think_times.pop(game_id, None)
+        task = self._tasks.pop(game_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def close(self, game_id: str) -> None:
+        """テーブルのタスクを停止し、終了を待つ（テーブル削除時）"""
+        task = self._tasks.get(game_id)
+        self.cancel(game_id)
+        if task is not None and task is not asyncio.current_task():
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def shutdown(self) -> None:
+        """全テーブルのタスクを停止"""
+        tasks = list(self._tasks.values())
+        for game_id in list(self._tasks.keys()):
+            self.cancel(game_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, game_id: str, wakeup: asyncio.Event) -> None:
+        """通知を待ち、AIの手番が続く限りアクションを適用する"""
+        try:
+            while True:
+                await wakeup.wait()
+                wakeup.clear()
+                await self._play_ai_turns(game_id)
+        except asyncio.CancelledError:
+            logger.info(f"AI turn scheduler cancelled for game {game_id}")
+            raise
+
+    async def _play_ai_turns(self, game_id: str) -> None:
+        """現在の手番がAIである間、アクションを決定・適用する"""
+        while True:
+            game = game_service.get_game_state(game_id)
+            if not game:
+                self.cancel(game_id)
+                return
+            seat = self._ai_seat_to_act(game)
+            if seat is None:
+                return
+
+            think_time = self._think_times.get(game_id, self.think_time)
+            if think_time > 0:
+                await asyncio.sleep(think_time)
+                if game_service.get_game_state(game_id) is not game or self._ai_seat_to_act(game) is not seat:
+                    continue  # 思考中に手番が変わった
+
+            # 決定はアクターの外で行い（その間も人間のアクションやタイムアウトは処理される）、
+            # 適用だけをアクター上で、決定したときのバージョンのままかを確かめてから行う
+            version = game.version
+            ai_action = await self.executor.decide_action(game, seat)
+            if not ai_action:
+                logger.warning(f"AI could not decide action for seat {seat.index}")
+                return
+            result = await game_service.run_on_table(
+                game_id, self._apply_decision, game_id, version, seat.index, ai_action
+            )
+            if result is None:
+                continue  # 決定中に状態が変わったので決め直す
+            if not result:
+                return
+
+            if self._state_listener is not None:
+                await self._state_listener(game_id)
+
+    @staticmethod
+    def _ai_seat_to_act(game: GameState) -> Optional[Seat]:
+        """現在の手番がAIならその座席を返す"""
+        if game.status in [GameStatus.HAND_COMPLETE, GameStatus.WAITING]:
+            return None
+        if game.current_seat_index is None:
+            return None
+        seat = game.table.seats[game.current_seat_index]
+        if not seat.is_occupied or not seat.player.is_ai or not seat.is_active:
+            return None
+        return seat
+
+    async def _apply_decision(
+        self, game_id: str, version: int, seat_index: int, ai_action: PlayerAction
+    ) -> Optional[bool]:
+        """
+        アクターの外で決定したAIのアクションを適用する（テーブルのアクター上で実行）
+
+        Args:
+            game_id: ゲームID
+            version: 決定したときのゲームのバージョン
+            seat_index: 決定したAIの座席
+            ai_action: 決定したアクション
+
+        Returns:
+            Optional[bool]: 適用できたらTrue、できなければFalse、決定後に状態が変わっていればNone
+        """
+        game = game_service.get_game_state(game_id)
+        if not game:
+            return False
+        if game.version != version or game.current_seat_index != seat_index:
+            return None
+        seat = game.table.seats[seat_index]
+
+        logger.info(f"AI {seat.player.name} action: {ai_action.action_type.value}")
+        success = await game_service.process_player_action(
+            game_id, ai_action.player_id, ai_action.action_type, ai_action.amount
+        )
+        if not success:
+            fallback = self.executor.fallback_action(game, seat)
+            logger.error(f"AI action failed for {seat.player.name}, falling back to {fallback.action_type.value}")
+            success = await game_service.process_player_action(
+                game_id, fallback.player_id, fallback.action_type, fallback.amount
+            )
+        return success
+
+# グローバルインスタンス
+ai_turn_scheduler = AITurnScheduler()
@@ -0,0 +1,136 @@
+"""
+テーブルごとのブロードキャストの間引き
+AIの連続アクションやオールイン後のランアウトなど状態が立て続けに変わる間は、
+テーブルを「更新あり」として印を付け、フレーム間隔ごとに最大1回だけ送る。
+ハンド終了・勝者の確定・人間プレイヤーの手番はすぐに送る。
+"""
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import logging
+import time
+
+from app.game.services.game_service import game_service
+from app.game.domain.game_state import GameState
+from app.game.domain.enum import GameStatus
+
+logger = logging.getLogger(__name__)
+
+# 実際にブロードキャストする関数 (game_id)
+FlushCallback = Callable[[str], Awaitable[None]]
+
+
+class BroadcastCoalescer:
+    """
+    テーブルごとにブロードキャストをまとめる
+
+    - publish(game_id) で更新を通知する。前回の送信から interval 秒経っていればすぐ送り、
+      そうでなければ間隔の終わりに1回だけ送る（その間の通知はまとめられる）
+    - 重要なイベント（ハンド終了・勝者・人間プレイヤーの手番）は待たずに送る
+    - interval が0なら毎回すぐ送る
+
+    Args:
+        interval: フレーム間隔（秒）
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval: float = interval
+        self.published: int = 0
+        self.flushed: int = 0
+        self._flush: Optional[FlushCallback] = None
+        self._pending: Dict[str, asyncio.TimerHandle] = {}
+        self._last_flush: Dict[str, float] = {}
+        # 間隔の終わりに始めた送信タスク（完了までイベントループに回収されないよう参照を持つ）
+        self._flushing: Set[asyncio.Task] = set()
+
+    def set_flush(self, callback: FlushCallback) -> None:
+        """実際にブロードキャストする関数を設定"""
+        self._flush = callback
+
+    @property
+    def coalesced(self) -> int:
+        """まとめられて送信されなかった通知の数"""
+        return self.published - self.flushed
+
+    async def publish(self, game_id: str, urgent: bool = False) -> None:
+        """
+        テーブルの状態が変わったことを通知する
+
+        Args:
+            game_id: ゲームID
+            urgent: 間引かずにすぐ送る場合True（省略時は状態から判定）
+        """
+        self.published += 1
+        if urgent or self.interval <= 0 or self._is_urgent(game_id):
+            await self._flush_now(game_id)
+            return
+
+        if game_id in self._pending:
+            return  # 間隔の終わりに送信済みの予約がある
+
+        delay = self._last_flush.get(game_id, float("-inf")) + self.interval - time.monotonic()
+        if delay <= 0:
+            await self._flush_now(game_id)
+            return
+        self._pending[game_id] = asyncio.get_running_loop().call_later(delay, self._on_interval, game_id)
+
+    def forget(self, game_id: str) -> None:
+        """テーブルの予約と記録を破棄（テーブル削除時）"""
+        handle = self._pending.pop(game_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._last_flush.pop(game_id, None)
+
+    def shutdown(self) -> None:
+        """全テーブルの予約を破棄"""
+        for game_id in list(self._pending.keys()):
+            self.forget(game_id)
+        self._last_flush.clear()
+        for task in list(self._flushing):
+            task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """送信と間引きの統計"""
+        return {
+            "published": self.published,
+            "flushed": self.flushed,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+        }
+
+    @staticmethod
+    def _is_urgent(game_id: str) -> bool:
+        """すぐに送るべき状態か（ハンド終了と勝者・人間プレイヤーの手番）"""
+        game: Optional[GameState] = game_service.get_game_state(game_id)
+        if not game:
+            return False
+        if game.status == GameStatus.HAND_COMPLETE:
+            return True  # 勝者はハンド終了と同時に確定する
+        if game.status != GameStatus.IN_PROGRESS or game.current_seat_index is None:
+            return False
+        seat = game.table.seats[game.current_seat_index]
+        return seat.is_occupied and not seat.player.is_ai
+
+    def _on_interval(self, game_id: str) -> None:
+        """フレーム間隔の終わりにまとめて送る"""
+        self._pending.pop(game_id, None)
+        task = asyncio.get_running_loop().create_task(self._flush_now(game_id))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _flush_now(self, game_id: str) -> None:
+        """予約を取り消してすぐに送る"""
+        handle = self._pending.pop(game_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._last_flush[game_id] = time.monotonic()
+        self.flushed += 1
+        if self._flush is None:
+            return
+        try:
+            await self._flush(game_id)
+        except Exception as e:
+            logger.error(f"Broadcast failed for game {game_id}: {e}", exc_info=True)
+
+
+# グローバルインスタンス
+broadcast_coalescer = BroadcastCoalescer()
@@ -0,0 +1,234 @@
+"""
+クライアント接続
+WebSocketと、その接続ごとの配信設定・送信済みの状態・送信キューを保持
+
+送信は接続ごとのライタータスクが行い、配信側はキューに積むだけで待たない。
+遅いクライアントがいても他のプレイヤーへの配信は遅れない。
+"""
+from collections import deque
+from fastapi import WebSocket, WebSocketDisconnect, status
+from typing import TYPE_CHECKING, Any, Deque, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from .codecs import Codec, Frame, negotiate_codec
+from .inbound import MAX_MESSAGE_SIZE, parse_client_message
+
+if TYPE_CHECKING:
+    from app.schemas.websocket import ClientMessage
+    from .serializers import DeltaFrame, StateFrame
+
+logger = logging.getLogger(__name__)
+
+# 送信キューの上限（フレーム数）
+DEFAULT_SEND_QUEUE_SIZE = 64
+
+# キューが溢れたときの方針
+# drop_stale: キュー内の古い状態フレームを捨てて最新の完全な状態だけを残す
+# disconnect: 接続を切断する
+OVERFLOW_DROP_STALE = "drop_stale"
+OVERFLOW_DISCONNECT = "disconnect"
+DEFAULT_OVERFLOW_POLICY = OVERFLOW_DROP_STALE
+
+# (フレーム, 状態フレームならそのバージョン / それ以外はNone)
+_QueueItem = Tuple[Frame, Optional[int]]
+
+
+class ClientConnection:
+    """
+    1つのWebSocket接続
+
+    Args:
+        websocket: WebSocket接続
+        game_id: ゲームID
+        player_id: プレイヤーID
+        delta: 差分配信（game_state_delta）を受け取るかどうか
+        codec: ワイヤーフォーマット（省略時はJSON）
+        send_queue_size: 送信キューの上限（フレーム数）
+        overflow_policy: キューが溢れたときの方針（drop_stale / disconnect）
+        max_message_size: 受信フレームの上限（バイト）
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        game_id: str,
+        player_id: str,
+        delta: bool = False,
+        codec: Optional[Codec] = None,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        overflow_policy: str = DEFAULT_OVERFLOW_POLICY,
+        max_message_size: int = MAX_MESSAGE_SIZE
+    ):
+        if overflow_policy not in (OVERFLOW_DROP_STALE, OVERFLOW_DISCONNECT):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.websocket = websocket
+        self.game_id = game_id
+        self.player_id = player_id
+        self.delta = delta
+        self.codec: Codec = codec or negotiate_codec(None)
+        self.send_queue_size: int = max(1, send_queue_size)
+        self.overflow_policy: str = overflow_policy
+        self.max_message_size: int = max_message_size
+        # 最後にキューへ積んだ状態のバージョン（キューが空になればクライアントはこのバージョンになる）
+        self.last_version: Optional[int] = None
+        self.dropped_frames: int = 0
+        self.closed: bool = False
+        # 最後にクライアントから何か受信した時刻（time.monotonic、ハートビートの判定に使う）
+        self.last_seen: float = time.monotonic()
+        self._queue: Deque[_QueueItem] = deque()
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    @property
+    def queued(self) -> int:
+        """送信待ちのフレーム数"""
+        return len(self._queue)
+
+    def start(self) -> None:
+        """ライタータスクを起動"""
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    def close(self) -> None:
+        """ライタータスクを止め、未送信のフレームを破棄"""
+        self.closed = True
+        self._queue.clear()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._writer = None
+
+    def enqueue_message(self, message: dict) -> bool:
+        """
+        メッセージを接続のコーデックでエンコードしてキューに積む
+
+        Returns:
+            bool: 積めたらTrue
+        """
+        return self.enqueue_frame(self.codec.encode(message))
+
+    def enqueue_frame(self, frame: Frame, version: Optional[int] = None) -> bool:
+        """
+        エンコード済みのフレームをキューに積む
+
+        Args:
+            frame: エンコード済みのフレーム
+            version: 状態フレームならそのバージョン（溢れたときに捨ててよいフレームの目印）
+
+        Returns:
+            bool: 積めたらTrue
+        """
+        if self.closed:
+            return False
+        if len(self._queue) >= self.send_queue_size and not self._make_room():
+            return False
+        self._queue.append((frame, version))
+        if version is not None:
+            self.last_version = version
+        self._wakeup.set()
+        return True
+
+    def enqueue_state(self, frame: "StateFrame", delta: Optional["DeltaFrame"] = None) -> bool:
+        """
+        ゲーム状態をキューに積む
+
+        差分配信の接続には、直前のバージョンを積んでいれば差分を、そうでなければ完全な状態を積む。
+        溢れて古い状態が捨てられた場合は、差分の前提が崩れるため完全な状態を積む。
+
+        Args:
+            frame: 最新の状態フレーム
+            delta: 直前のバージョンからの差分
+
+        Returns:
+            bool: 積めたら（または送信済みのバージョンなら）True
+        """
+        if self.delta and self.last_version == frame.version:
+            return True  # このバージョンは送信済み
+        if len(self._queue) >= self.send_queue_size and not self._make_room():
+            return False
+        if self.delta and delta is not None and self.last_version == delta.from_version:
+            payload = delta.encode(self.player_id, self.codec)
+        else:
+            payload = frame.encode(self.player_id, self.codec)
+        return self.enqueue_frame(payload, frame.version)
+
+    def _make_room(self) -> bool:
+        """
+        キューが溢れたときに方針に従って空きを作る
+
+        Returns:
+            bool: 空きができたらTrue（切断した場合はFalse）
+        """
+        if self.overflow_policy == OVERFLOW_DROP_STALE:
+            kept = deque(item for item in self._queue if item[1] is None)
+            dropped = len(self._queue) - len(kept)
+            if dropped and len(kept) < self.send_queue_size:
+                self._queue = kept
+                self.dropped_frames += dropped
+                # 捨てた状態はクライアントに届かないので、次は完全な状態を送る
+                self.last_version = None
+                logger.warning(
+                    f"Send queue overflow for player {self.player_id}: dropped {dropped} stale state frames"
+                )
+                return True
+        logger.warning(f"Send queue overflow for player {self.player_id}: disconnecting")
+        self._overflow_disconnect()
+        return False
+
+    def _overflow_disconnect(self) -> None:
+        """キューの溢れで接続を閉じる（受信ループには切断として届く）"""
+        self.close()
+        asyncio.get_running_loop().create_task(self._close_websocket())
+
+    async def _close_websocket(self) -> None:
+        try:
+            await self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Send queue overflow")
+        except Exception as e:
+            logger.debug(f"Error closing websocket for player {self.player_id}: {e}")
+
+    async def _write_loop(self) -> None:
+        """キューのフレームを順に送信するライタータスク"""
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                frame, _ = self._queue.popleft()
+                await self.send_frame(frame)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending message to player {self.player_id}: {e}")
+            self.close()
+
+    async def send_message(self, message: dict) -> None:
+        """メッセージを接続のコーデックでエンコードして直接送信（キューを経由しない）"""
+        await self.send_frame(self.codec.encode(message))
+
+    async def send_frame(self, frame: Frame) -> None:
+        """エンコード済みのフレームを直接送信（バイナリはbytes、テキストはstr）"""
+        if isinstance(frame, bytes):
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
+
+    async def receive_message(self) -> "ClientMessage":
+        """
+        メッセージを受信して検証（テキスト/バイナリのどちらも受け付ける）
+
+        Returns:
+            ClientMessage: 検証済みのメッセージ
+
+        Raises:
+            WebSocketDisconnect: 切断された場合
+            InvalidMessageError: サイズ超過・壊れたフレーム・未知の type・不正なフィールド（接続は維持）
+        """
+        message = await self.websocket.receive()
+        self.last_seen = time.monotonic()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        raw = message["bytes"] if message.get("bytes") is not None else message["text"]
+        # テキストフレームはバイナリコーデックの接続でもJSONとして扱う
+        return parse_client_message(raw, self.codec, self.max_message_size)
@@ -0,0 +1,188 @@
+"""
+WebSocketのワイヤーフォーマット（コーデック）
+接続時にクライアントが選択し、既定は標準ライブラリのJSON
+
+- json: 標準ライブラリのJSON（テキストフレーム）
+- orjson: orjson による高速なJSON（テキストフレーム、orjson がインストールされている場合）
+- msgpack: MessagePack（バイナリフレーム、msgpack がインストールされている場合）
+
+エンコード済みの部品を連結して map / array を組み立てられるため、共通部分を1回だけ
+エンコードしたフレームに閲覧者ごとの部品を差し込める（serializers.StateFrame を参照）。
+"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+import json
+import logging
+import struct
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 任意の依存
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 任意の依存
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# エンコード済みのフレーム（テキストコーデックは str、バイナリコーデックは bytes）
+Frame = Union[str, bytes]
+
+DEFAULT_CODEC = "json"
+
+
+class Codec:
+    """コーデックの基底クラス"""
+
+    name: str = ""
+    binary: bool = False
+
+    def encode(self, obj: Any) -> Frame:
+        """オブジェクトをエンコード"""
+        raise NotImplementedError
+
+    def decode(self, data: Frame) -> Any:
+        """受信したフレームをデコード"""
+        raise NotImplementedError
+
+    def join_map(self, entries: List[Tuple[str, Frame]]) -> Frame:
+        """エンコード済みの値から map を組み立てる"""
+        raise NotImplementedError
+
+    def join_array(self, items: List[Frame]) -> Frame:
+        """エンコード済みの要素から array を組み立てる"""
+        raise NotImplementedError
+
+    def map_prefix(self, entries: List[Tuple[str, Frame]], last_key: str) -> Tuple[Frame, Frame]:
+        """
+        最後の値だけを後から差し込める map の前後を組み立てる
+
+        prefix + 最後の値 + suffix が join_map(entries + [(last_key, 最後の値)]) と一致する。
+        """
+        raise NotImplementedError
+
+    def concat(self, parts: List[Frame]) -> Frame:
+        """エンコード済みの部品を連結"""
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """標準ライブラリのJSON（WebSocket.send_json と同じ形式）"""
+
+    name = "json"
+
+    def encode(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+    def decode(self, data: Frame) -> Any:
+        return json.loads(data)
+
+    def _key(self, key: str) -> str:
+        return self.encode(key)
+
+    def join_map(self, entries: List[Tuple[str, Frame]]) -> str:
+        return "{" + ",".join(f"{self._key(key)}:{value}" for key, value in entries) + "}"
+
+    def join_array(self, items: List[Frame]) -> str:
+        return "[" + ",".join(items) + "]"
+
+    def map_prefix(self, entries: List[Tuple[str, Frame]], last_key: str) -> Tuple[str, str]:
+        head = "".join(f"{self._key(key)}:{value}," for key, value in entries)
+        return "{" + head + self._key(last_key) + ":", "}"
+
+    def concat(self, parts: List[Frame]) -> str:
+        return "".join(parts)
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson による高速なJSON（テキストフレーム）"""
+
+    name = "orjson"
+
+    def encode(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def decode(self, data: Frame) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack（バイナリフレーム）"""
+
+    name = "msgpack"
+    binary = True
+
+    def encode(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data: Frame) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+    @staticmethod
+    def _map_header(count: int) -> bytes:
+        if count < 16:
+            return bytes((0x80 | count,))
+        if count < 0x10000:
+            return b"\xde" + struct.pack(">H", count)
+        return b"\xdf" + struct.pack(">I", count)
+
+    @staticmethod
+    def _array_header(count: int) -> bytes:
+        if count < 16:
+            return bytes((0x90 | count,))
+        if count < 0x10000:
+            return b"\xdc" + struct.pack(">H", count)
+        return b"\xdd" + struct.pack(">I", count)
+
+    def join_map(self, entries: List[Tuple[str, Frame]]) -> bytes:
+        parts = [self._map_header(len(entries))]
+        for key, value in entries:
+            parts.append(self.encode(key))
+            parts.append(value)
+        return b"".join(parts)
+
+    def join_array(self, items: List[Frame]) -> bytes:
+        return self._array_header(len(items)) + b"".join(items)
+
+    def map_prefix(self, entries: List[Tuple[str, Frame]], last_key: str) -> Tuple[bytes, bytes]:
+        parts = [self._map_header(len(entries) + 1)]
+        for key, value in entries:
+            parts.append(self.encode(key))
+            parts.append(value)
+        parts.append(self.encode(last_key))
+        return b"".join(parts), b""
+
+    def concat(self, parts: List[Frame]) -> bytes:
+        return b"".join(parts)
+
+
+def _available_codecs() -> Dict[str, Codec]:
+    """インストールされている依存に応じて使えるコーデック"""
+    codecs: Dict[str, Codec] = {JsonCodec.name: JsonCodec()}
+    if orjson is not None:
+        codecs[OrjsonCodec.name] = OrjsonCodec()
+    if msgpack is not None:
+        codecs[MsgpackCodec.name] = MsgpackCodec()
+    return codecs
+
+
+CODECS: Dict[str, Codec] = _available_codecs()
+
+
+def negotiate_codec(requested: Optional[str]) -> Codec:
+    """
+    クライアントが要求したコーデックを選ぶ（使えなければJSON）
+
+    Args:
+        requested: 要求されたコーデック名
+
+    Returns:
+        Codec: 使用するコーデック
+    """
+    if requested:
+        codec = CODECS.get(requested.lower())
+        if codec is not None:
+            return codec
+        logger.warning(f"Codec {requested} is not available, falling back to {DEFAULT_CODEC}")
+    return CODECS[DEFAULT_CODEC]
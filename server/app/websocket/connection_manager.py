@@ -1,24 +1,52 @@
 """
 WebSocket接続管理
 接続の追加・削除・メッセージ送信を一元管理
+
+送信は接続ごとの送信キューに積むだけで、実際の送信は各接続のライタータスクが行う。
 """
 from fastapi import WebSocket
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import logging
 
+from .client_connection import (
+    ClientConnection,
+    DEFAULT_OVERFLOW_POLICY,
+    DEFAULT_SEND_QUEUE_SIZE,
+)
+from .codecs import Codec, Frame
+
 logger = logging.getLogger(__name__)
 
 
 class ConnectionManager:
-    """WebSocket接続を管理するクラス"""
+    """
+    WebSocket接続を管理するクラス
+    
+    Args:
+        send_queue_size: 接続ごとの送信キューの上限（フレーム数）
+        overflow_policy: 送信キューが溢れたときの方針（drop_stale / disconnect）
+    """
     
-    def __init__(self):
-        # game_id -> {player_id: websocket}
-        self._connections: Dict[str, Dict[str, WebSocket]] = {}
-        # websocket -> (game_id, player_id)
-        self._reverse_lookup: Dict[WebSocket, tuple[str, str]] = {}
+    def __init__(
+        self,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        overflow_policy: str = DEFAULT_OVERFLOW_POLICY
+    ):
+        self.send_queue_size: int = send_queue_size
+        self.overflow_policy: str = overflow_policy
+        # game_id -> {player_id: connection}
+        self._connections: Dict[str, Dict[str, ClientConnection]] = {}
+        # websocket -> connection
+        self._reverse_lookup: Dict[WebSocket, ClientConnection] = {}
     
-    async def connect(self, websocket: WebSocket, game_id: str, player_id: str) -> None:
+    async def connect(
+        self,
+        websocket: WebSocket,
+        game_id: str,
+        player_id: str,
+        delta: bool = False,
+        codec: Optional[Codec] = None
+    ) -> ClientConnection:
         """
         プレイヤーをゲームに接続
         
@@ -26,16 +54,27 @@ class ConnectionManager:
             websocket: WebSocket接続
             game_id: ゲームID
             player_id: プレイヤーID
+            delta: 差分配信を受け取るかどうか
+            codec: ワイヤーフォーマット（省略時はJSON）
+            
+        Returns:
+            ClientConnection: 作成された接続
         """
         await websocket.accept()
         
         if game_id not in self._connections:
             self._connections[game_id] = {}
         
-        self._connections[game_id][player_id] = websocket
-        self._reverse_lookup[websocket] = (game_id, player_id)
+        connection = ClientConnection(
+            websocket, game_id, player_id, delta=delta, codec=codec,
+            send_queue_size=self.send_queue_size, overflow_policy=self.overflow_policy
+        )
+        connection.start()
+        self._connections[game_id][player_id] = connection
+        self._reverse_lookup[websocket] = connection
         
         logger.info(f"Player {player_id} connected to game {game_id}")
+        return connection
     
     def disconnect(self, websocket: WebSocket) -> Optional[tuple[str, str]]:
         """
@@ -50,24 +89,26 @@ class ConnectionManager:
         if websocket not in self._reverse_lookup:
             return None
         
-        game_id, player_id = self._reverse_lookup[websocket]
+        connection = self._reverse_lookup[websocket]
+        game_id, player_id = connection.game_id, connection.player_id
         
-        # 接続情報を削除
-        if game_id in self._connections:
-            self._connections[game_id].pop(player_id, None)
+        # 接続情報を削除（同じプレイヤーの新しい接続は残す）
+        if game_id in self._connections and self._connections[game_id].get(player_id) is connection:
+            del self._connections[game_id][player_id]
             
             # ゲームに誰もいなくなったら削除
             if not self._connections[game_id]:
                 del self._connections[game_id]
         
         del self._reverse_lookup[websocket]
+        connection.close()
         
         logger.info(f"Player {player_id} disconnected from game {game_id}")
         return game_id, player_id
     
     async def send_personal(self, game_id: str, player_id: str, message: dict) -> bool:
         """
-        特定のプレイヤーにメッセージを送信
+        特定のプレイヤーにメッセージを送信（送信キューに積むだけで送信完了は待たない）
         
         Args:
             game_id: ゲームID
@@ -75,49 +116,94 @@ class ConnectionManager:
             message: 送信するメッセージ
             
         Returns:
-            bool: 送信成功したらTrue
+            bool: キューに積めたらTrue
         """
         if game_id not in self._connections or player_id not in self._connections[game_id]:
             logger.warning(f"Player {player_id} not found in game {game_id}")
             return False
         
-        try:
-            websocket = self._connections[game_id][player_id]
-            await websocket.send_json(message)
-            return True
-        except Exception as e:
-            logger.error(f"Error sending message to player {player_id}: {e}")
+        return self._connections[game_id][player_id].enqueue_message(message)
+    
+    async def send_personal_frame(self, game_id: str, player_id: str, frame: Frame) -> bool:
+        """
+        接続のコーデックでエンコード済みのフレームを特定のプレイヤーに送信（キューに積むだけ）
+        
+        Args:
+            game_id: ゲームID
+            player_id: プレイヤーID
+            frame: エンコード済みのフレーム
+            
+        Returns:
+            bool: キューに積めたらTrue
+        """
+        if game_id not in self._connections or player_id not in self._connections[game_id]:
+            logger.warning(f"Player {player_id} not found in game {game_id}")
             return False
+        
+        return self._connections[game_id][player_id].enqueue_frame(frame)
     
     async def broadcast(self, game_id: str, message: dict, exclude: Optional[str] = None) -> int:
         """
         ゲーム内の全プレイヤーにメッセージをブロードキャスト
         
+        各接続の送信キューに積むだけで、遅いクライアントの送信完了は待たない。
+        
         Args:
             game_id: ゲームID
             message: 送信するメッセージ
             exclude: 除外するプレイヤーID
             
         Returns:
-            int: 送信成功したプレイヤー数
+            int: キューに積めたプレイヤー数
         """
         if game_id not in self._connections:
             logger.warning(f"Game {game_id} not found in connections")
             return 0
         
         success_count = 0
-        for player_id, websocket in self._connections[game_id].items():
+        for player_id, connection in list(self._connections[game_id].items()):
             if exclude and player_id == exclude:
                 continue
             
-            try:
-                await websocket.send_json(message)
+            if connection.enqueue_message(message):
                 success_count += 1
-            except Exception as e:
-                logger.error(f"Error broadcasting to player {player_id}: {e}")
         
         return success_count
     
+    def get_connection(self, game_id: str, player_id: str) -> Optional[ClientConnection]:
+        """
+        プレイヤーの接続を取得
+        
+        Args:
+            game_id: ゲームID
+            player_id: プレイヤーID
+            
+        Returns:
+            Optional[ClientConnection]: 接続、なければNone
+        """
+        return self._connections.get(game_id, {}).get(player_id)
+    
+    def get_connections(self, game_id: str) -> List[ClientConnection]:
+        """
+        ゲームに接続中の全接続を取得
+        
+        Args:
+            game_id: ゲームID
+            
+        Returns:
+            List[ClientConnection]: 接続のリスト
+        """
+        return list(self._connections.get(game_id, {}).values())
+    
+    def all_connections(self) -> List[ClientConnection]:
+        """
+        全ゲームの接続を取得（ハートビートの巡回用）
+        
+        Returns:
+            List[ClientConnection]: 接続のリスト
+        """
+        return list(self._reverse_lookup.values())
+    
     def is_connected(self, game_id: str, player_id: str) -> bool:
         """
         プレイヤーが接続されているかチェック
@@ -0,0 +1,76 @@
+"""
+ゲームごとの直近の状態変化のリングバッファ
+再接続したクライアントに、切断中に見逃したバージョンの差分だけを送り直すために使う。
+"""
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional
+
+from app.core.memory import deep_sizeof
+
+if TYPE_CHECKING:
+    from .serializers import DeltaFrame
+
+
+class GameEventLog:
+    """
+    ゲームごとに直近の差分フレームを上限つきで保持する
+
+    StateFrameCache が新しいバージョンのフレームを作るたびに record し、replay(game_id, version) で
+    version から最新までの差分を順に取り出す。途中が欠けていれば None を返す
+    （その場合は完全な状態を送る）。
+
+    Args:
+        capacity: ゲームごとに保持する差分の数
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity: int = capacity
+        self._logs: Dict[str, Deque["DeltaFrame"]] = {}
+
+    def record(self, game_id: str, delta: Optional["DeltaFrame"]) -> None:
+        """新しいバージョンへの差分を記録（差分がなければ履歴をつなげられないので消去）"""
+        log = self._logs.get(game_id)
+        if delta is None:
+            if log is not None:
+                log.clear()
+            return
+        if log is None:
+            log = self._logs[game_id] = deque(maxlen=self.capacity)
+        if log and log[-1].version == delta.version:
+            return  # 同じバージョンは記録済み
+        if log and log[-1].version != delta.from_version:
+            log.clear()  # 記録していないバージョンを挟んだ
+        log.append(delta)
+
+    def replay(self, game_id: str, version: int) -> Optional[List["DeltaFrame"]]:
+        """
+        version から最新までの差分を取得
+
+        Args:
+            game_id: ゲームID
+            version: クライアントが持っているバージョン
+
+        Returns:
+            Optional[List[DeltaFrame]]: 差分のリスト（最新なら空）。履歴が足りなければ None
+        """
+        log = self._logs.get(game_id)
+        if not log:
+            return None
+        if log[-1].version == version:
+            return []
+        for start, delta in enumerate(log):
+            if delta.from_version == version:
+                return list(log)[start:]
+        return None
+
+    def memory_usage(self, game_id: str) -> int:
+        """ゲームの履歴のメモリ使用量の概算（バイト）"""
+        return deep_sizeof(self._logs.get(game_id))
+
+    def forget(self, game_id: str) -> None:
+        """ゲーム削除時に履歴を破棄"""
+        self._logs.pop(game_id, None)
+
+
+# グローバルインスタンス
+game_event_log = GameEventLog()
@@ -0,0 +1,153 @@
+"""
+ハートビートと切れた接続の回収
+一定間隔で全接続を1回だけ巡回し、しばらく何も受信していない接続に ping を送る。
+timeout 秒以上応答のない接続（ハーフオープンなど）と、送信に失敗した接続はまとめて切断する。
+
+巡回は共有タイマーホイールの1つのタイマーで行い、接続ごとのタスクやタイマーは作らない。
+クライアントは ping に pong を返す（pong に限らず何か受信すれば生存とみなす）。
+"""
+from fastapi import status
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from .client_connection import ClientConnection
+from .codecs import Frame
+from .connection_manager import connection_manager
+from .serializers import create_message
+from .spectators import spectator_hub
+from app.core.timer_wheel import TimerHandle
+from app.game.services.timer_service import timer_service
+
+logger = logging.getLogger(__name__)
+
+# 回収した接続のクローズハンドシェイクを待つ上限（秒）
+CLOSE_TIMEOUT = 5.0
+
+
+class HeartbeatMonitor:
+    """
+    全接続の生存確認と回収を1つの巡回で行う
+
+    Args:
+        interval: 巡回（ping）の間隔（秒、0で無効）
+        timeout: この秒数以上何も受信していない接続を切れたとみなす（省略時は interval の3倍）
+    """
+
+    def __init__(self, interval: float = 15.0, timeout: Optional[float] = None):
+        self.interval: float = interval
+        self.timeout: float = timeout if timeout is not None else interval * 3
+        self.pings_sent: int = 0
+        self.reaped: int = 0
+        self.sweeps: int = 0
+        self._timer: Optional[TimerHandle] = None
+
+    @property
+    def is_running(self) -> bool:
+        """巡回が有効かどうか"""
+        return self._timer is not None
+
+    def start(self) -> None:
+        """巡回を開始（共有タイマーホイールが動いている必要がある）"""
+        if self.interval > 0 and self._timer is None:
+            self._timer = timer_service.call_later(self.interval, self._on_tick)
+
+    def stop(self) -> None:
+        """巡回を停止"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def sweep(self) -> int:
+        """
+        全接続を巡回し、切れた接続を回収して残りに ping を送る
+
+        Returns:
+            int: 回収した接続数
+        """
+        self.sweeps += 1
+        now = time.monotonic()
+        ping = create_message("ping", {"ts": time.time()})
+        frames: Dict[str, Frame] = {}  # コーデックごとに1回だけエンコード
+        dead_players: List[ClientConnection] = []
+        dead_spectators: List[ClientConnection] = []
+
+        for connections, dead in (
+            (connection_manager.all_connections(), dead_players),
+            (spectator_hub.all_connections(), dead_spectators),
+        ):
+            for connection in connections:
+                idle = now - connection.last_seen
+                if connection.closed or idle > self.timeout:
+                    dead.append(connection)
+                elif idle >= self.interval / 2:
+                    frame = frames.get(connection.codec.name)
+                    if frame is None:
+                        frame = frames[connection.codec.name] = connection.codec.encode(ping)
+                    if connection.enqueue_frame(frame):
+                        self.pings_sent += 1
+
+        for connection in dead_players:
+            connection_manager.disconnect(connection.websocket)
+        for connection in dead_spectators:
+            spectator_hub.disconnect(connection)
+        dead = dead_players + dead_spectators
+        if dead:
+            self.reaped += len(dead)
+            logger.info(f"Reaped {len(dead)} stale connections")
+            asyncio.get_running_loop().create_task(self._close_websockets(dead))
+        return len(dead)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        接続の統計
+
+        live は直近 interval 秒以内に受信のあった接続、stale は ping への応答待ちの接続。
+
+        Returns:
+            Dict[str, float]: 統計
+        """
+        now = time.monotonic()
+        live = stale = 0
+        for connection in connection_manager.all_connections() + spectator_hub.all_connections():
+            if not connection.closed and now - connection.last_seen < self.interval:
+                live += 1
+            else:
+                stale += 1
+        return {
+            "interval": self.interval,
+            "timeout": self.timeout,
+            "live": live,
+            "stale": stale,
+            "reaped": self.reaped,
+            "pings_sent": self.pings_sent,
+            "sweeps": self.sweeps,
+        }
+
+    def _on_tick(self) -> None:
+        """タイマーから呼ばれる巡回（次の巡回を登録し直す）"""
+        self._timer = None
+        try:
+            self.sweep()
+        except Exception as e:
+            logger.error(f"Heartbeat sweep failed: {e}", exc_info=True)
+        self.start()
+
+    @staticmethod
+    async def _close_websockets(connections: List[ClientConnection]) -> None:
+        """回収した接続のWebSocketをまとめて閉じる（受信ループには切断として届く）"""
+        async def close(connection: ClientConnection) -> None:
+            try:
+                await asyncio.wait_for(
+                    connection.websocket.close(code=status.WS_1001_GOING_AWAY, reason="Heartbeat timeout"),
+                    CLOSE_TIMEOUT
+                )
+            except Exception as e:
+                logger.debug(f"Error closing stale websocket for {connection.player_id}: {e}")
+
+        await asyncio.gather(*(close(connection) for connection in connections))
+
+
+# グローバルインスタンス
+heartbeat_monitor = HeartbeatMonitor()
@@ -0,0 +1,63 @@
+"""
+クライアントからの受信メッセージの検証
+受信フレームは、起動時に1回だけ構築した判別共用体（type で選ぶ）のバリデータで1回だけ解析する。
+サイズ超過・壊れたフレーム・未知の type・不正なフィールドは GameService に届く前に拒否する。
+"""
+from typing import Optional
+
+from pydantic import ValidationError
+
+from app.schemas.websocket import ClientMessage, client_message_adapter
+from .codecs import Codec, Frame
+
+# 受信フレームの上限（バイト、テキストは文字数）
+MAX_MESSAGE_SIZE = 4096
+
+
+class InvalidMessageError(ValueError):
+    """受信メッセージを拒否した（接続は維持し、エラーを返す）"""
+
+
+def parse_client_message(raw: Frame, codec: Codec, max_size: Optional[int] = MAX_MESSAGE_SIZE) -> ClientMessage:
+    """
+    受信フレームを検証してメッセージのモデルにする
+
+    テキストフレームは接続のコーデックに関係なくJSONとして、JSONのパースと検証を1回で行う。
+    バイナリフレームはバイナリコーデック（msgpack）の接続ならデコードしてから検証する。
+
+    Args:
+        raw: 受信フレーム（str または bytes）
+        codec: 接続のコーデック
+        max_size: フレームの上限（Noneで無制限）
+
+    Returns:
+        ClientMessage: 検証済みのメッセージ
+
+    Raises:
+        InvalidMessageError: サイズ超過・壊れたフレーム・未知の type・不正なフィールド
+    """
+    if max_size is not None and len(raw) > max_size:
+        raise InvalidMessageError(f"Message too large ({len(raw)} > {max_size} bytes)")
+    try:
+        if isinstance(raw, bytes) and codec.binary:
+            return client_message_adapter.validate_python(codec.decode(raw))
+        return client_message_adapter.validate_json(raw)
+    except ValidationError as e:
+        raise InvalidMessageError(_describe(e)) from None
+    except Exception:
+        # バイナリコーデックのデコード失敗など
+        raise InvalidMessageError("Malformed message") from None
+
+
+def _describe(error: ValidationError) -> str:
+    """クライアントに返すエラーメッセージ（最初のエラーだけ）"""
+    first = error.errors(include_url=False)[0]
+    kind = first["type"]
+    if kind == "union_tag_invalid":
+        return f"Unknown message type: {first['ctx']['tag']}"
+    if kind == "union_tag_not_found":
+        return "Missing message type"
+    if kind.startswith("json_") or kind in ("model_type", "model_attributes_type"):
+        return "Malformed message"
+    location = ".".join(str(part) for part in first["loc"][1:])
+    return f"Invalid message: {location}: {first['msg']}" if location else f"Invalid message: {first['msg']}"
@@ -3,38 +3,66 @@ WebSocketエンドポイント
 ゲーム進行のためのリアルタイム通信
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, status
-from typing import Optional
+from typing import List, Optional
 import asyncio
 import logging
+import time
 
 from .connection_manager import connection_manager
-from .serializers import serialize_game_state, create_message
+from .serializers import state_frame_cache, create_message
+from .codecs import negotiate_codec
+from .broadcast_coalescer import broadcast_coalescer
+from .spectators import spectator_hub
+from .sessions import session_manager
+from .event_log import game_event_log
+from .client_connection import ClientConnection
+from .inbound import InvalidMessageError
+from app.schemas.websocket import ClientMessage, PlayerActionMessage
 from app.game.services.game_service import game_service
-from app.game.services.ai_service import AIService
+from app.game.services.game_lifecycle import game_lifecycle
+from app.game.services.timer_service import timer_service
+from app.game.services.ai_batch_dispatcher import ai_batch_dispatcher
+from app.game.services.tournament_service import tournament_service
+from .ai_turn_scheduler import ai_turn_scheduler
 from app.game.domain.player import Player
 from app.game.domain.enum import ActionType, GameStatus
 from app.game.domain.action import PlayerAction
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-ai_service = AIService()
+# 1回のブロードキャストで全接続の送信キューに積むまでの時間（/metrics）
+broadcast_fanout = metrics.histogram(
+    "poker_broadcast_fanout_seconds",
+    "Time to encode one state version and queue it for every player and spectator of a table",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
 
 
 @router.websocket("/ws/game/{game_id}")
 async def game_websocket(
     websocket: WebSocket,
     game_id: str,
-    username: str = Query(..., min_length=1, max_length=20)
+    username: str = Query(..., min_length=1, max_length=20),
+    delta: bool = Query(False),
+    codec: Optional[str] = Query(None),
+    token: Optional[str] = Query(None),
+    last_version: Optional[int] = Query(None)
 ):
     """
     ゲーム用WebSocketエンドポイント
     
+    delta=true で接続すると、2回目以降の状態は game_state_delta（差分）で届く。
+    codec=json|orjson|msgpack でワイヤーフォーマットを選べる（既定はjson、使えなければjson）。
+    token=再接続トークン で接続すると、猶予期間内なら同じ座席のプレイヤーとして復帰し、
+    last_version 以降に見逃した差分だけが届く（履歴が足りなければ完全な状態）。
+    
     接続フロー:
     1. ゲームの存在確認
-    2. プレイヤー作成と座席配置
+    2. セッションの復帰、またはプレイヤー作成と座席配置
     3. WebSocket接続確立
-    4. 初期状態送信
+    4. 初期状態送信（復帰時は見逃した分だけ）
     5. メッセージループ開始
     """
     
@@ -45,40 +73,64 @@ async def game_websocket(
         logger.warning(f"Connection rejected: game {game_id} not found")
         return
     
-    # 2. プレイヤー作成
-    import uuid
-    player_id = str(uuid.uuid4())
-    player = Player(player_id=player_id, name=username, is_ai=False)
+    # 2. 再接続トークンがあればセッションを復帰
+    session = session_manager.resume(token, game_id) if token else None
+    if session is not None and game.get_player_by_id(session.player_id) is None:
+        session = None  # 猶予期間中にゲームから外れていた
+    resumed = session is not None
     
-    # 3. 座席配置
-    success = await game_service.setup_single_play_seats(game_id, player)
-    if not success:
-        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Failed to setup seats")
-        logger.warning(f"Connection rejected: failed to setup seats for {username} in game {game_id}")
-        return
+    if session is None:
+        # プレイヤー作成
+        import uuid
+        player = Player(player_id=str(uuid.uuid4()), name=username, is_ai=False)
+        
+        # 座席配置
+        success = await game_service.setup_single_play_seats(game_id, player)
+        if not success:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Failed to setup seats")
+            logger.warning(f"Connection rejected: failed to setup seats for {username} in game {game_id}")
+            return
+        session = session_manager.create(game_id, player.id)
+    player_id = session.player_id
     
-    # 4. WebSocket接続確立
-    await connection_manager.connect(websocket, game_id, player_id)
+    # 3. WebSocket接続確立
+    connection = await connection_manager.connect(
+        websocket, game_id, player_id, delta=delta, codec=negotiate_codec(codec)
+    )
+    
+    game_lifecycle.attach(game_id)
     
     try:
-        # 5. 接続成功メッセージ送信
+        # 4. 接続成功メッセージ送信
         await connection_manager.send_personal(
             game_id,
             player_id,
             create_message("connected", {
                 "player_id": player_id,
                 "game_id": game_id,
-                "message": f"Welcome {username}!"
+                "codec": connection.codec.name,
+                "session_token": session.token,
+                "resumed": resumed,
+                "message": f"Welcome back {username}!" if resumed else f"Welcome {username}!"
             })
         )
         
-        # 6. 初期ゲーム状態を送信
-        await broadcast_game_state(game_id)
+        # 5. 初期ゲーム状態を送信（復帰時は見逃した分だけ）
+        if resumed:
+            replay_missed_state(connection, last_version)
+        else:
+            await broadcast_coalescer.publish(game_id, urgent=True)
         
-        # 7. メッセージループ
+        # 6. メッセージループ
         while True:
-            data = await websocket.receive_json()
-            await handle_message(game_id, player_id, data)
+            try:
+                message = await connection.receive_message()
+            except InvalidMessageError as e:
+                connection.enqueue_message(create_message("error", None, str(e)))
+                continue
+            if message.type not in ("ping", "pong"):
+                game_lifecycle.touch(game_id)
+            await handle_message(game_id, player_id, message)
             
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {username} from game {game_id}")
@@ -87,40 +139,176 @@ async def game_websocket(
     finally:
         # クリーンアップ
         connection_manager.disconnect(websocket)
+        game_lifecycle.detach(game_id)
         
-        # プレイヤーをゲームから削除
-        game.remove_player_by_id(player_id)
-        logger.info(f"Player {username} removed from game {game_id}")
+        # 新しい接続で復帰済みでなければ、猶予期間のあいだ座席を保持する（ゲームが破棄済みなら不要）
+        if connection_manager.get_connection(game_id, player_id) is None and game_service.get_game_state(game_id):
+            await session_manager.detach(session)
 
 
-async def handle_message(game_id: str, player_id: str, data: dict) -> None:
+async def on_session_expired(game_id: str, player_id: str) -> None:
     """
-    クライアントからのメッセージを処理
+    再接続の猶予期間が切れたプレイヤーをゲームから外す
     
     Args:
         game_id: ゲームID
         player_id: プレイヤーID
-        data: 受信したメッセージデータ
     """
-    message_type = data.get("type")
+    if not game_service.get_game_state(game_id):
+        return
+    # プレイヤーをゲームから削除（テーブルのアクター経由）
+    await game_service.remove_player(game_id, player_id)
+    logger.info(f"Player {player_id} removed from game {game_id}")
+    await broadcast_coalescer.publish(game_id, urgent=True)
+
+
+session_manager.set_expire_listener(on_session_expired)
+
+
+async def on_game_closed(game_id: str, reason: str) -> None:
+    """
+    破棄されたゲームのWebSocket側のリソースを解放し、接続中のプレイヤーと観戦者を切断する
+    
+    Args:
+        game_id: ゲームID
+        reason: 破棄の理由（deleted / idle / abandoned / capacity / table_broken）
+    """
+    await ai_turn_scheduler.close(game_id)
+    state_frame_cache.forget(game_id)
+    broadcast_coalescer.forget(game_id)
+    spectator_hub.close_game(game_id)
+    session_manager.forget_game(game_id)
     
+    connections = connection_manager.get_connections(game_id)
+    for connection in connections:
+        connection.enqueue_message(create_message("game_closed", {"game_id": game_id, "reason": reason}))
+    if connections:
+        asyncio.get_running_loop().create_task(close_game_connections(connections))
+
+
+async def close_game_connections(connections: List[ClientConnection]) -> None:
+    """ゲームの接続を閉じる（送信キューの game_closed を送り切ってから）"""
+    for connection in connections:
+        for _ in range(50):
+            if not connection.queued or connection.closed:
+                break
+            await asyncio.sleep(0.01)
+        try:
+            await connection.websocket.close(code=status.WS_1001_GOING_AWAY, reason="Game closed")
+        except Exception as e:
+            logger.debug(f"Error closing websocket for player {connection.player_id}: {e}")
+
+
+game_lifecycle.add_close_listener(on_game_closed)
+game_lifecycle.add_memory_probe("frames", state_frame_cache.memory_usage)
+game_lifecycle.add_memory_probe("event_log", game_event_log.memory_usage)
+
+
+def replay_missed_state(connection: ClientConnection, last_version: Optional[int]) -> None:
+    """
+    再接続したクライアントに切断中に見逃した状態を送る
+    
+    差分配信の接続で last_version からの差分がリングバッファに揃っていれば差分だけを順に送り、
+    そうでなければ最新の完全な状態を送る。
+    
+    Args:
+        connection: 再接続した接続
+        last_version: クライアントが最後に受け取ったバージョン
+    """
+    game = game_service.get_game_state(connection.game_id)
+    if not game:
+        return
+    
+    missed = None
+    if connection.delta and last_version is not None:
+        missed = game_event_log.replay(connection.game_id, last_version)
+    if missed is None:
+        frame = state_frame_cache.frame(game)
+        connection.enqueue_frame(frame.encode(connection.player_id, connection.codec), frame.version)
+        return
+    
+    connection.last_version = last_version
+    for delta in missed:
+        connection.enqueue_frame(delta.encode(connection.player_id, connection.codec), delta.version)
+
+
+@router.websocket("/ws/spectate/{game_id}")
+async def spectate_websocket(
+    websocket: WebSocket,
+    game_id: str,
+    delta: bool = Query(False),
+    codec: Optional[str] = Query(None)
+):
+    """
+    観戦用WebSocketエンドポイント
+    
+    公開情報だけの game_state（ホールカードはショーダウンまで非公開）を受け取る。
+    座席には着かず、アクションも送れない。delta / codec はゲーム用エンドポイントと同じ。
+    """
+    game = game_service.get_game_state(game_id)
+    if not game:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Game not found")
+        logger.warning(f"Spectator rejected: game {game_id} not found")
+        return
+    
+    connection = await spectator_hub.connect(
+        websocket, game_id, delta=delta, codec=negotiate_codec(codec), current=state_frame_cache.frame(game)
+    )
+    connection.enqueue_message(create_message("spectating", {
+        "game_id": game_id,
+        "codec": connection.codec.name,
+        "delay": spectator_hub.delay
+    }))
+    
+    try:
+        while True:
+            try:
+                message = await connection.receive_message()
+            except InvalidMessageError as e:
+                connection.enqueue_message(create_message("error", None, str(e)))
+                continue
+            if message.type in ("get_state", "resync"):
+                connection.last_version = None
+                spectator_hub.resend_latest(connection)
+            elif message.type == "pong":
+                pass
+            elif message.type == "ping":
+                connection.enqueue_message(create_message("pong", None))
+            else:
+                connection.enqueue_message(create_message("error", None, "Spectators cannot send actions"))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error in spectator connection: {e}", exc_info=True)
+    finally:
+        spectator_hub.disconnect(connection)
+
+
+async def handle_message(game_id: str, player_id: str, message: ClientMessage) -> None:
+    """
+    クライアントからのメッセージを処理
+    
+    Args:
+        game_id: ゲームID
+        player_id: プレイヤーID
+        message: 検証済みのメッセージ（未知の type や不正なフィールドは受信時に拒否済み）
+    """
     try:
-        if message_type == "start_game":
+        if message.type == "start_game":
             await handle_start_game(game_id, player_id)
         
-        elif message_type == "player_action":
-            await handle_player_action(game_id, player_id, data)
+        elif message.type == "player_action":
+            await handle_player_action(game_id, player_id, message)
         
-        elif message_type == "get_state":
+        elif message.type in ("get_state", "resync"):
+            # resync: 差分のバージョンが飛んだクライアントが完全な状態を要求する
             await send_game_state(game_id, player_id)
         
-        else:
-            logger.warning(f"Unknown message type: {message_type}")
-            await connection_manager.send_personal(
-                game_id,
-                player_id,
-                create_message("error", None, f"Unknown message type: {message_type}")
-            )
+        elif message.type == "pong":
+            pass  # ハートビートの応答（受信時刻は接続側で記録済み）
+        
+        elif message.type == "ping":
+            await connection_manager.send_personal(game_id, player_id, create_message("pong", None))
     
     except Exception as e:
         logger.error(f"Error handling message: {e}", exc_info=True)
@@ -144,10 +332,11 @@ async def handle_start_game(game_id: str, player_id: str) -> None:
     success = await game_service.start_game(game_id)
     
     if success:
-        await broadcast_game_state(game_id)
+        timer_service.arm_turn_clock(game_id)
+        await broadcast_coalescer.publish(game_id, urgent=True)
         
-        # AIのターンをチェック
-        await process_ai_turns(game_id)
+        # AIのターンはテーブルのスケジューラに任せる
+        ai_turn_scheduler.notify(game_id)
     else:
         await connection_manager.send_personal(
             game_id,
@@ -156,131 +345,123 @@ async def handle_start_game(game_id: str, player_id: str) -> None:
         )
 
 
-async def handle_player_action(game_id: str, player_id: str, data: dict) -> None:
+async def handle_player_action(game_id: str, player_id: str, message: PlayerActionMessage) -> None:
     """
     プレイヤーアクション処理
     
     Args:
         game_id: ゲームID
         player_id: プレイヤーID
-        data: アクションデータ
+        message: 検証済みのアクションメッセージ
     """
-    try:
-        action_type_str = data.get("action")
-        amount = data.get("amount", 0)
-        
-        # ActionTypeに変換
-        action_type = ActionType(action_type_str.upper())
-        
-        logger.info(f"Player {player_id} action: {action_type.value} amount: {amount}")
-        
-        # アクション処理
-        success = await game_service.process_player_action(
-            game_id,
-            player_id,
-            action_type,
-            amount
-        )
+    logger.info(f"Player {player_id} action: {message.action.value} amount: {message.amount}")
+    
+    # アクション処理
+    success = await game_service.process_player_action(
+        game_id,
+        player_id,
+        message.action,
+        message.amount
+    )
+    
+    if success:
+        timer_service.arm_turn_clock(game_id)
+
+        # 全員に状態をブロードキャスト
+        await broadcast_coalescer.publish(game_id)
         
-        if success:
-            # 全員に状態をブロードキャスト
-            await broadcast_game_state(game_id)
-            
-            # ゲーム終了チェック
-            game = game_service.get_game_state(game_id)
-            if game and game.status not in [GameStatus.HAND_COMPLETE, GameStatus.WAITING]:
-                # AIのターンを処理
-                await process_ai_turns(game_id)
-        else:
-            await connection_manager.send_personal(
-                game_id,
-                player_id,
-                create_message("error", None, "Invalid action")
-            )
-    
-    except ValueError as e:
-        logger.error(f"Invalid action type: {e}")
+        # AIのターンはテーブルのスケジューラに任せる
+        ai_turn_scheduler.notify(game_id)
+    else:
         await connection_manager.send_personal(
             game_id,
             player_id,
-            create_message("error", None, f"Invalid action: {str(e)}")
+            create_message("error", None, "Invalid action")
         )
 
 
-async def process_ai_turns(game_id: str, max_iterations: int = 10) -> None:
+async def on_ai_action(game_id: str) -> None:
     """
-    AIのターンを自動処理
+    AIのアクションが適用された後の処理
     
     Args:
         game_id: ゲームID
-        max_iterations: 最大処理回数（無限ループ防止）
     """
-    game = game_service.get_game_state(game_id)
-    if not game:
-        return
+    timer_service.arm_turn_clock(game_id)
+    await broadcast_coalescer.publish(game_id)
+
+
+ai_turn_scheduler.set_state_listener(on_ai_action)
+ai_batch_dispatcher.set_state_listener(on_ai_action)
+
+
+async def on_turn_timeout(game_id: str, player_id: str, action_type: ActionType) -> None:
+    """
+    ターン制限時間切れで自動アクションが実行された後の処理
     
-    for i in range(max_iterations):
-        # 現在のターンがAIかチェック
-        if game.current_seat_index is None:
-            break
-        
-        current_seat = game.table.seats[game.current_seat_index]
-        
-        # AIでない、または座席が空ならループ終了
-        if not current_seat.is_occupied or not current_seat.player.is_ai:
-            break
-        
-        # ゲーム終了状態ならループ終了
-        if game.status in [GameStatus.HAND_COMPLETE, GameStatus.WAITING]:
-            break
-        
-        # AIアクション決定
-        ai_action = ai_service.decide_action(game, current_seat)
-        if not ai_action:
-            logger.warning(f"AI could not decide action for seat {current_seat.index}")
-            break
-        
-        logger.info(f"AI {current_seat.player.name} action: {ai_action.action_type.value}")
-        
-        # 少し待つ（リアルっぽく）
-        await asyncio.sleep(1.5)
-        
-        # アクション実行
-        success = await game_service.poker_engine.process_action(game, ai_action)
-        if not success:
-            logger.error(f"AI action failed for {current_seat.player.name}")
-            break
-        
-        # 状態をブロードキャスト
-        await broadcast_game_state(game_id)
+    Args:
+        game_id: ゲームID
+        player_id: 自動アクションしたプレイヤーID
+        action_type: 実行されたアクション
+    """
+    await broadcast_coalescer.publish(game_id)
+    ai_turn_scheduler.notify(game_id)
+
+
+timer_service.add_timeout_listener(on_turn_timeout)
+
+
+async def on_tournament_hand_started(game_id: str) -> None:
+    """
+    トーナメントのテーブルで次のハンドが自動で始まった後の処理
     
-    if i >= max_iterations - 1:
-        logger.warning(f"AI turn processing reached max iterations for game {game_id}")
+    Args:
+        game_id: テーブル（ゲーム）ID
+    """
+    timer_service.arm_turn_clock(game_id)
+    await broadcast_coalescer.publish(game_id, urgent=True)
+    ai_turn_scheduler.notify(game_id)
+
+
+async def on_tournament_seats_changed(game_id: str) -> None:
+    """
+    トーナメントのテーブル移動・敗退で着席者が変わった後の処理
+    
+    Args:
+        game_id: テーブル（ゲーム）ID
+    """
+    await broadcast_coalescer.publish(game_id)
+
+
+tournament_service.set_hand_started_listener(on_tournament_hand_started)
+tournament_service.set_seats_changed_listener(on_tournament_seats_changed)
 
 
 async def send_game_state(game_id: str, player_id: str) -> None:
     """
-    特定のプレイヤーにゲーム状態を送信
+    特定のプレイヤーにゲーム状態（完全なスナップショット）を送信
     
     Args:
         game_id: ゲームID
         player_id: プレイヤーID
     """
     game = game_service.get_game_state(game_id)
-    if not game:
+    connection = connection_manager.get_connection(game_id, player_id)
+    if not game or not connection:
         return
     
-    state = serialize_game_state(game, player_id)
-    await connection_manager.send_personal(
-        game_id,
-        player_id,
-        create_message("game_state", state)
-    )
+    frame = state_frame_cache.frame(game)
+    if not connection.enqueue_frame(frame.encode(player_id, connection.codec), frame.version):
+        logger.warning(f"Failed to queue game state for player {player_id}")
 
 
 async def broadcast_game_state(game_id: str) -> None:
     """
-    全プレイヤーにゲーム状態をブロードキャスト
+    全プレイヤーにゲーム状態をブロードキャスト（broadcast_coalescer から呼ばれる）
+    
+    公開部分はバージョン×コーデックごとに1回だけエンコードし、各プレイヤーには自分のホールカードだけを差し込んで送る。
+    差分配信の接続には、直前のバージョンを受け取っていれば差分を、そうでなければ完全な状態を送る。
+    各接続の送信キューに積むだけで、送信完了は待たない。
     
     Args:
         game_id: ゲームID
@@ -289,13 +470,39 @@ async def broadcast_game_state(game_id: str) -> None:
     if not game:
         return
     
-    # 各プレイヤーに個別に送信（ホールカードの表示制御のため）
-    connected_players = connection_manager.get_connected_players(game_id)
-    
-    for player_id in connected_players:
-        state = serialize_game_state(game, player_id)
-        await connection_manager.send_personal(
-            game_id,
-            player_id,
-            create_message("game_state", state)
-        )
+    start = time.perf_counter()
+    frame = state_frame_cache.frame(game)
+    delta = state_frame_cache.delta(game)
+    for connection in connection_manager.get_connections(game_id):
+        connection.enqueue_state(frame, delta)
+    spectator_hub.publish(game_id, frame, delta)
+    broadcast_fanout.observe(time.perf_counter() - start)
+
+
+broadcast_coalescer.set_flush(broadcast_game_state)
+
+
+def _connection_groups():
+    """種類ごとの接続（プレイヤー・観戦者）"""
+    return (("player", connection_manager.all_connections()), ("spectator", spectator_hub.all_connections()))
+
+
+def _queue_depths():
+    """送信キューに溜まっているフレーム数の合計（スクレイプ時に集計）"""
+    return [({"kind": kind}, sum(c.queued for c in connections)) for kind, connections in _connection_groups()]
+
+
+def _max_queue_depths():
+    """最も溜まっている接続の送信キューのフレーム数（スクレイプ時に集計）"""
+    return [
+        ({"kind": kind}, max((c.queued for c in connections), default=0))
+        for kind, connections in _connection_groups()
+    ]
+
+
+metrics.gauge(
+    "poker_connections", "Open WebSocket connections",
+    collector=lambda: [({"kind": kind}, len(connections)) for kind, connections in _connection_groups()],
+)
+metrics.gauge("poker_outbound_queue_frames", "Frames waiting in send queues", collector=_queue_depths)
+metrics.gauge("poker_outbound_queue_max_frames", "Deepest single send queue", collector=_max_queue_depths)
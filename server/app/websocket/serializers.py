@@ -2,10 +2,13 @@
 ゲーム状態のシリアライズ
 GameStateをJSON形式に変換してクライアントに送信
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from app.game.domain.game_state import GameState
 from app.game.domain.seat import Seat
 from app.game.domain.deck import Card
+from app.core.memory import deep_sizeof
+from .codecs import CODECS, DEFAULT_CODEC, Codec, Frame
+from .event_log import GameEventLog, game_event_log
 
 
 def serialize_card(card: Card) -> Dict[str, str]:
@@ -33,7 +36,8 @@ def serialize_seat(seat: Seat, viewing_player_id: Optional[str] = None) -> Dict[
             "bet_in_round": 0,
             "bet_in_hand": 0,
             "hole_cards": [],
-            "last_action": None
+            "last_action": None,
+            "position": None
         }
     
     # ホールカードの表示判定
@@ -65,8 +69,16 @@ def serialize_game_state(game: GameState, viewing_player_id: Optional[str] = Non
         game: ゲーム状態
         viewing_player_id: 閲覧者のプレイヤーID
     """
+    state = _serialize_table_state(game)
+    state["seats"] = [serialize_seat(seat, viewing_player_id) for seat in game.table.seats]
+    return state
+
+
+def _serialize_table_state(game: GameState) -> Dict[str, Any]:
+    """座席以外のゲーム状態（全員に共通）をシリアライズ"""
     return {
         "game_id": game.id,
+        "version": game.version,
         "status": game.status.value,
         "current_round": game.current_round.value,
         "current_seat_index": game.current_seat_index,
@@ -74,20 +86,311 @@ def serialize_game_state(game: GameState, viewing_player_id: Optional[str] = Non
         "small_blind": game.small_blind,
         "big_blind": game.big_blind,
         "dealer_seat_index": game.dealer_seat_index,
-        "seats": [serialize_seat(seat, viewing_player_id) for seat in game.table.seats],
         "community_cards": [serialize_card(card) for card in game.table.community_cards],
+        "runouts": [
+            [serialize_card(card) for card in board]
+            for board in game.table.runouts
+        ] if len(game.table.runouts) > 1 else [],
         "pots": [
             {
                 "amount": pot.amount,
-                "eligible_seats": pot.eligible_seats
+                # Pot.reset はリストをその場で空にするので、キャッシュするフレームにはコピーを持たせる
+                "eligible_seats": list(pot.eligible_seats)
             }
             for pot in game.table.pots
         ],
-        "winners": game.winners,
-        "valid_actions": game.valid_actions
+        "winners": list(game.winners),
+        "valid_actions": list(game.valid_actions)
     }
 
 
+class _EncodedFrame:
+    """1つのコーデックでエンコード済みのフレームの部品"""
+
+    __slots__ = ("prefix", "suffix", "seats", "private_seats", "public")
+
+    def __init__(self, prefix: Frame, suffix: Frame, seats: List[Frame], private_seats: Dict[int, Frame], public: Frame):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.seats = seats
+        self.private_seats = private_seats
+        self.public = public
+
+
+class StateFrame:
+    """
+    公開部分をエンコード済みの game_state メッセージ
+
+    状態が変わるたびに1回だけ build_state_frame で作り、全閲覧者で共有する。
+    エンコードはコーデックごとに最初に要求されたときに1回だけ行う。
+    閲覧者ごとの差分は自分のホールカードだけなので、エンコード済みの座席の並びのうち
+    自分の座席だけを、事前にエンコードしておいた非公開版に差し替えて連結する。
+    """
+
+    __slots__ = (
+        "version", "message_type", "table_state", "seat_states", "private_states",
+        "_seat_by_player", "_encoded",
+    )
+
+    def __init__(
+        self,
+        version: int,
+        message_type: str,
+        table_state: Dict[str, Any],
+        seat_states: List[Dict[str, Any]],
+        private_states: Dict[int, Dict[str, Any]],
+        seat_by_player: Dict[str, int]
+    ):
+        self.version = version
+        self.message_type = message_type
+        self.table_state = table_state
+        self.seat_states = seat_states        # 公開版の座席
+        self.private_states = private_states  # 持ち主向けの座席（ホールカード付き）
+        self._seat_by_player = seat_by_player
+        self._encoded: Dict[str, _EncodedFrame] = {}
+
+    def _encoded_for(self, codec: Codec) -> _EncodedFrame:
+        """コーデックごとのエンコード済みの部品（初回のみエンコード）"""
+        encoded = self._encoded.get(codec.name)
+        if encoded is not None:
+            return encoded
+
+        message_prefix, message_suffix = codec.map_prefix(
+            [("type", codec.encode(self.message_type))], "data"
+        )
+        data_prefix, data_suffix = codec.map_prefix(
+            [(key, codec.encode(value)) for key, value in self.table_state.items()], "seats"
+        )
+        prefix = codec.concat([message_prefix, data_prefix])
+        suffix = codec.concat([data_suffix, message_suffix])
+        seats = [codec.encode(seat_state) for seat_state in self.seat_states]
+        private_seats = {index: codec.encode(state) for index, state in self.private_states.items()}
+        public = codec.concat([prefix, codec.join_array(seats), suffix])
+
+        encoded = _EncodedFrame(prefix, suffix, seats, private_seats, public)
+        self._encoded[codec.name] = encoded
+        return encoded
+
+    def encode(self, viewing_player_id: Optional[str] = None, codec: Optional[Codec] = None) -> Frame:
+        """
+        閲覧者向けのメッセージを取得
+
+        Args:
+            viewing_player_id: 閲覧者のプレイヤーID（Noneなら公開情報のみ）
+            codec: コーデック（省略時はJSON）
+
+        Returns:
+            Frame: エンコード済みのメッセージ
+        """
+        codec = codec or CODECS[DEFAULT_CODEC]
+        encoded = self._encoded_for(codec)
+        seat_index = self._seat_by_player.get(viewing_player_id)
+        private = encoded.private_seats.get(seat_index)
+        if private is None:
+            return encoded.public
+        seats = list(encoded.seats)
+        seats[seat_index] = private
+        return codec.concat([encoded.prefix, codec.join_array(seats), encoded.suffix])
+
+    def owner_state(self, seat_index: int) -> Dict[str, Any]:
+        """座席の持ち主から見た座席（ホールカードが非公開なら持ち主向けの版）"""
+        return self.private_states.get(seat_index) or self.seat_states[seat_index]
+
+    def seat_owner(self, seat_index: int) -> Optional[str]:
+        """座席に座っているプレイヤーID"""
+        owner = self.seat_states[seat_index]["player"]
+        return owner["id"] if owner else None
+
+
+def build_state_frame(game: GameState, message_type: str = "game_state") -> StateFrame:
+    """
+    ゲーム状態の公開部分と各座席を1回だけ組み立てる
+
+    Args:
+        game: ゲーム状態
+        message_type: メッセージタイプ
+
+    Returns:
+        StateFrame: 閲覧者ごとに encode() で取り出せるフレーム
+    """
+    seat_states: List[Dict[str, Any]] = []
+    private_states: Dict[int, Dict[str, Any]] = {}
+    seat_by_player: Dict[str, int] = {}
+    for seat in game.table.seats:
+        seat_states.append(serialize_seat(seat))
+        if seat.is_occupied:
+            seat_by_player[seat.player.id] = seat.index
+            if seat.hole_cards and not seat.show_hand:
+                private_states[seat.index] = serialize_seat(seat, seat.player.id)
+
+    return StateFrame(
+        game.version, message_type, _serialize_table_state(game),
+        seat_states, private_states, seat_by_player
+    )
+
+
+class DeltaFrame:
+    """
+    2つのバージョン間の差分を表す game_state_delta メッセージ
+
+    data の形式:
+        {"from_version": 前のバージョン, "version": 新しいバージョン,
+         "changes": {変わったトップレベルのキー: 新しい値},
+         "seats": {"座席インデックス": {変わったフィールド: 新しい値}}}
+    座席は変わったフィールドだけを送る。自分の座席だけは持ち主から見た差分（ホールカードを含む）に差し替える。
+    """
+
+    __slots__ = ("from_version", "version", "changes", "seat_changes", "owner_changes", "_encoded")
+
+    def __init__(
+        self,
+        from_version: int,
+        version: int,
+        changes: Dict[str, Any],
+        seat_changes: Dict[int, Dict[str, Any]],
+        owner_changes: Dict[str, tuple]
+    ):
+        self.from_version = from_version
+        self.version = version
+        self.changes = changes
+        self.seat_changes = seat_changes
+        self.owner_changes = owner_changes
+        self._encoded: Dict[str, tuple] = {}
+
+    def _encoded_for(self, codec: Codec) -> tuple:
+        """コーデックごとの (data の先頭部分, 座席の差分, 公開版) を取得（初回のみエンコード）"""
+        encoded = self._encoded.get(codec.name)
+        if encoded is None:
+            head = [
+                ("from_version", codec.encode(self.from_version)),
+                ("version", codec.encode(self.version)),
+                ("changes", codec.encode(self.changes)),
+            ]
+            seat_entries = {index: codec.encode(changes) for index, changes in self.seat_changes.items()}
+            encoded = (head, seat_entries, self._join(codec, head, seat_entries))
+            self._encoded[codec.name] = encoded
+        return encoded
+
+    @staticmethod
+    def _join(codec: Codec, head: List[Tuple[str, Frame]], seat_entries: Dict[int, Frame]) -> Frame:
+        seats = codec.join_map([(str(index), fragment) for index, fragment in seat_entries.items()])
+        data = codec.join_map(head + [("seats", seats)])
+        return codec.join_map([("type", codec.encode("game_state_delta")), ("data", data)])
+
+    def encode(self, viewing_player_id: Optional[str] = None, codec: Optional[Codec] = None) -> Frame:
+        """閲覧者向けの差分メッセージを取得"""
+        codec = codec or CODECS[DEFAULT_CODEC]
+        head, seat_entries, public = self._encoded_for(codec)
+        owner_entry = self.owner_changes.get(viewing_player_id)
+        if owner_entry is None:
+            return public
+        seat_index, owner_changes = owner_entry
+        seat_entries = dict(seat_entries)
+        seat_entries[seat_index] = codec.encode(owner_changes)
+        return self._join(codec, head, seat_entries)
+
+
+def _diff(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """値が変わったキーだけを取り出す"""
+    return {key: value for key, value in current.items() if previous.get(key) != value}
+
+
+def build_delta_frame(previous: StateFrame, current: StateFrame) -> DeltaFrame:
+    """
+    フレーム同士を比較して差分フレームを作る
+
+    Args:
+        previous: 前のバージョンのフレーム
+        current: 新しいバージョンのフレーム
+
+    Returns:
+        DeltaFrame: 差分フレーム
+    """
+    changes = _diff(previous.table_state, current.table_state)
+    changes.pop("version", None)
+
+    seat_changes: Dict[int, Dict[str, Any]] = {}
+    owner_changes: Dict[str, tuple] = {}
+    for seat_index, seat_state in enumerate(current.seat_states):
+        public_changes = _diff(previous.seat_states[seat_index], seat_state)
+        if public_changes:
+            seat_changes[seat_index] = public_changes
+
+        owner = current.seat_owner(seat_index)
+        if owner is None:
+            continue
+        if seat_index in current.private_states or seat_index in previous.private_states:
+            # 座っている人が替わった場合、新しい持ち主が見ていたのは公開版
+            if previous.seat_owner(seat_index) == owner:
+                previous_view = previous.owner_state(seat_index)
+            else:
+                previous_view = previous.seat_states[seat_index]
+            changes_for_owner = _diff(previous_view, current.owner_state(seat_index))
+            if changes_for_owner != public_changes:
+                owner_changes[owner] = (seat_index, changes_for_owner)
+
+    return DeltaFrame(previous.version, current.version, changes, seat_changes, owner_changes)
+
+
+class StateFrameCache:
+    """
+    ゲームごとに最新バージョンのフレームと、直前のバージョンからの差分を保持する
+
+    同じバージョンに対しては何度呼ばれてもエンコードは1回だけ行う。
+    作った差分は event_log（再接続時の再送用のリングバッファ）にも記録する。
+
+    Args:
+        event_log: 差分を記録するリングバッファ
+    """
+
+    def __init__(self, event_log: Optional[GameEventLog] = None):
+        self.event_log = event_log
+        self._frames: Dict[str, StateFrame] = {}
+        self._deltas: Dict[str, DeltaFrame] = {}
+
+    def frame(self, game: GameState) -> StateFrame:
+        """現在のバージョンのフレームを取得（なければ作成し、差分も更新）"""
+        cached = self._frames.get(game.id)
+        if cached is not None and cached.version == game.version:
+            return cached
+
+        frame = build_state_frame(game)
+        if (
+            cached is not None
+            and cached.version < frame.version
+            and len(cached.seat_states) == len(frame.seat_states)
+        ):
+            self._deltas[game.id] = build_delta_frame(cached, frame)
+        else:
+            self._deltas.pop(game.id, None)
+        self._frames[game.id] = frame
+        if self.event_log is not None:
+            self.event_log.record(game.id, self._deltas.get(game.id))
+        return frame
+
+    def delta(self, game: GameState) -> Optional[DeltaFrame]:
+        """直前のバージョンから現在のバージョンへの差分（frame() の後に呼ぶ）"""
+        delta = self._deltas.get(game.id)
+        if delta is None or delta.version != game.version:
+            return None
+        return delta
+
+    def memory_usage(self, game_id: str) -> int:
+        """ゲームのキャッシュ済みフレームと差分のメモリ使用量の概算（バイト）"""
+        return deep_sizeof((self._frames.get(game_id), self._deltas.get(game_id)))
+
+    def forget(self, game_id: str) -> None:
+        """ゲーム削除時にキャッシュを破棄"""
+        self._frames.pop(game_id, None)
+        self._deltas.pop(game_id, None)
+        if self.event_log is not None:
+            self.event_log.forget(game_id)
+
+
+# グローバルインスタンス
+state_frame_cache = StateFrameCache(game_event_log)
+
+
 def create_message(message_type: str, data: Any, error: Optional[str] = None) -> Dict[str, Any]:
     """
     標準的なメッセージフォーマットを作成
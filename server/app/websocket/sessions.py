@@ -0,0 +1,128 @@
+"""
+再接続用のセッション
+接続時に再接続トークンを発行し、切断後も猶予期間のあいだは座席とチップを保持する。
+猶予期間内に同じトークンで接続し直せば同じプレイヤーとして復帰できる。
+"""
+from typing import Awaitable, Callable, Dict, Optional
+import logging
+import secrets
+
+from app.core.timer_wheel import TimerHandle
+from app.game.services.timer_service import timer_service
+
+logger = logging.getLogger(__name__)
+
+# 猶予期間が切れたときに呼ばれるリスナー (game_id, player_id)
+ExpireListener = Callable[[str, str], Awaitable[None]]
+
+
+class Session:
+    """
+    1プレイヤー分のセッション
+
+    Args:
+        token: 再接続トークン
+        game_id: ゲームID
+        player_id: プレイヤーID
+    """
+
+    __slots__ = ("token", "game_id", "player_id", "grace_timer")
+
+    def __init__(self, token: str, game_id: str, player_id: str):
+        self.token = token
+        self.game_id = game_id
+        self.player_id = player_id
+        self.grace_timer: Optional[TimerHandle] = None  # 切断中のみ
+
+    @property
+    def is_detached(self) -> bool:
+        """切断中（猶予期間中）かどうか"""
+        return self.grace_timer is not None
+
+
+class SessionManager:
+    """
+    再接続トークンとプレイヤーの対応、切断後の猶予期間を管理する
+
+    猶予期間のタイマーは共有タイマーホイールに登録する（セッションごとのタスクは作らない）。
+
+    Args:
+        grace_period: 切断後に座席を保持する秒数（0なら即座に退席）
+    """
+
+    def __init__(self, grace_period: float = 60.0):
+        self.grace_period: float = grace_period
+        self._sessions: Dict[str, Session] = {}
+        self._expire_listener: Optional[ExpireListener] = None
+
+    def set_expire_listener(self, listener: ExpireListener) -> None:
+        """猶予期間が切れたときに呼ばれるリスナーを設定（退席処理など）"""
+        self._expire_listener = listener
+
+    def create(self, game_id: str, player_id: str) -> Session:
+        """新しいセッションを作成し、再接続トークンを発行"""
+        session = Session(secrets.token_urlsafe(24), game_id, player_id)
+        self._sessions[session.token] = session
+        return session
+
+    def resume(self, token: str, game_id: str) -> Optional[Session]:
+        """
+        再接続トークンからセッションを復帰（猶予期間のタイマーを止める）
+
+        Args:
+            token: 再接続トークン
+            game_id: 接続先のゲームID
+
+        Returns:
+            Optional[Session]: 復帰したセッション（無効なトークンならNone）
+        """
+        session = self._sessions.get(token)
+        if session is None or session.game_id != game_id:
+            return None
+        if session.grace_timer is not None:
+            session.grace_timer.cancel()
+            session.grace_timer = None
+        return session
+
+    async def detach(self, session: Session) -> None:
+        """
+        接続が切れたセッションの猶予期間を開始（0なら即座に期限切れ）
+
+        Args:
+            session: セッション
+        """
+        if self.grace_period <= 0:
+            await self._expire(session.token)
+            return
+        if session.grace_timer is not None:
+            session.grace_timer.cancel()
+        session.grace_timer = timer_service.call_later(self.grace_period, self._expire, session.token)
+        logger.info(f"Holding seat of player {session.player_id} in game {session.game_id} for {self.grace_period}s")
+
+    def forget_game(self, game_id: str) -> None:
+        """ゲーム削除時にセッションを破棄"""
+        for token, session in list(self._sessions.items()):
+            if session.game_id == game_id:
+                if session.grace_timer is not None:
+                    session.grace_timer.cancel()
+                del self._sessions[token]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def _expire(self, token: str) -> None:
+        """猶予期間切れ: セッションを破棄してリスナーを呼ぶ"""
+        session = self._sessions.pop(token, None)
+        if session is None:
+            return
+        session.grace_timer = None
+        logger.info(f"Reconnect grace period expired for player {session.player_id} in game {session.game_id}")
+        if self._expire_listener is not None:
+            try:
+                await self._expire_listener(session.game_id, session.player_id)
+            except Exception as e:
+                logger.error(f"Session expire listener failed: {e}", exc_info=True)
+
+
+# グローバルインスタンス
+session_manager = SessionManager()
@@ -0,0 +1,183 @@
+"""
+観戦チャンネル
+観戦者はプレイヤーとは別に管理し、公開情報だけの game_state を受け取る
+（ホールカードはショーダウンで公開されるまで含まれない）。
+
+状態のバージョンごとに公開版をコーデックごとに1回だけエンコードし、全観戦者に同じバイト列を送る。
+観戦者が増えても増えるのは各接続の送信キューへの追加とソケットへの書き込みだけ。
+遅延（delay）を設定すると、フレームをその秒数だけ溜めてから観戦者に流す。
+"""
+from collections import deque
+from fastapi import WebSocket, status
+from typing import Deque, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+import uuid
+
+from .client_connection import ClientConnection
+from .codecs import Codec
+from .serializers import DeltaFrame, StateFrame
+
+logger = logging.getLogger(__name__)
+
+# (公開する時刻, フレーム, 直前のフレームからの差分)
+_DelayedFrame = Tuple[float, StateFrame, Optional[DeltaFrame]]
+
+
+class SpectatorHub:
+    """
+    テーブルごとの観戦者と遅延バッファを管理する
+
+    Args:
+        delay: 観戦者に流すまでの遅延（秒、0で遅延なし）
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay: float = delay
+        self._spectators: Dict[str, Dict[str, ClientConnection]] = {}
+        self._latest: Dict[str, StateFrame] = {}  # 観戦者に公開済みの最新フレーム（観戦者がいるテーブルのみ）
+        self._buffers: Dict[str, Deque[_DelayedFrame]] = {}
+        self._release_handles: Dict[str, asyncio.TimerHandle] = {}
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        game_id: str,
+        delta: bool = False,
+        codec: Optional[Codec] = None,
+        current: Optional[StateFrame] = None
+    ) -> ClientConnection:
+        """
+        観戦者を接続し、公開済みの最新の状態を送る
+
+        Args:
+            websocket: WebSocket接続
+            game_id: ゲームID
+            delta: 差分配信を受け取るかどうか
+            codec: ワイヤーフォーマット（省略時はJSON）
+            current: 現在の状態のフレーム（公開済みのフレームがなく遅延なしのときに送る）
+
+        Returns:
+            ClientConnection: 観戦者の接続
+        """
+        await websocket.accept()
+        spectator_id = f"spectator-{uuid.uuid4()}"
+        connection = ClientConnection(websocket, game_id, spectator_id, delta=delta, codec=codec)
+        connection.start()
+        self._spectators.setdefault(game_id, {})[spectator_id] = connection
+
+        latest = self._latest.get(game_id)
+        if latest is None and self.delay <= 0 and current is not None:
+            latest = self._latest[game_id] = current
+        if latest is not None:
+            connection.enqueue_state(latest)
+        logger.info(f"Spectator {spectator_id} joined game {game_id}")
+        return connection
+
+    def disconnect(self, connection: ClientConnection) -> None:
+        """観戦者を切断"""
+        connection.close()
+        spectators = self._spectators.get(connection.game_id)
+        if spectators is not None:
+            spectators.pop(connection.player_id, None)
+            if not spectators:
+                del self._spectators[connection.game_id]
+                self._forget(connection.game_id)
+
+    def resend_latest(self, connection: ClientConnection) -> None:
+        """公開済みの最新の状態を送り直す（get_state / resync）"""
+        latest = self._latest.get(connection.game_id)
+        if latest is not None:
+            connection.enqueue_state(latest)
+
+    def all_connections(self) -> List[ClientConnection]:
+        """全テーブルの観戦者の接続（ハートビートの巡回用）"""
+        return [connection for spectators in self._spectators.values() for connection in spectators.values()]
+
+    def spectator_count(self, game_id: str) -> int:
+        """テーブルの観戦者数"""
+        return len(self._spectators.get(game_id, ()))
+
+    def publish(self, game_id: str, frame: StateFrame, delta: Optional[DeltaFrame] = None) -> None:
+        """
+        新しい状態を観戦者に流す（遅延があればバッファに溜める）
+
+        観戦者がいないテーブルのフレームは保持もバッファもしない
+        （最初の観戦者には connect に渡された現在のフレームを送る）。
+
+        Args:
+            game_id: ゲームID
+            frame: 最新のフレーム
+            delta: 直前のフレームからの差分
+        """
+        if game_id not in self._spectators:
+            return
+        if self.delay <= 0:
+            self._release(game_id, frame, delta)
+            return
+
+        buffer = self._buffers.setdefault(game_id, deque())
+        buffer.append((time.monotonic() + self.delay, frame, delta))
+        if game_id not in self._release_handles:
+            self._schedule_release(game_id)
+
+    def close_game(self, game_id: str) -> None:
+        """テーブル削除時に観戦者を切断し、バッファを破棄"""
+        self._forget(game_id)
+        for connection in list(self._spectators.pop(game_id, {}).values()):
+            connection.close()
+            asyncio.get_running_loop().create_task(self._close_websocket(connection))
+
+    def stats(self) -> Dict[str, int]:
+        """観戦の統計"""
+        return {
+            "tables": len(self._spectators),
+            "spectators": sum(len(spectators) for spectators in self._spectators.values()),
+            "buffered_frames": sum(len(buffer) for buffer in self._buffers.values()),
+        }
+
+    def _forget(self, game_id: str) -> None:
+        """テーブルの最新フレームと遅延バッファを破棄する"""
+        handle = self._release_handles.pop(game_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._buffers.pop(game_id, None)
+        self._latest.pop(game_id, None)
+
+    def _release(self, game_id: str, frame: StateFrame, delta: Optional[DeltaFrame]) -> None:
+        """フレームを全観戦者の送信キューに積む（エンコードはフレーム側で1回だけ）"""
+        self._latest[game_id] = frame
+        for connection in list(self._spectators.get(game_id, {}).values()):
+            connection.enqueue_state(frame, delta)
+
+    def _schedule_release(self, game_id: str) -> None:
+        buffer = self._buffers.get(game_id)
+        if not buffer:
+            self._buffers.pop(game_id, None)
+            return
+        delay = max(0.0, buffer[0][0] - time.monotonic())
+        self._release_handles[game_id] = asyncio.get_running_loop().call_later(
+            delay, self._release_due, game_id
+        )
+
+    def _release_due(self, game_id: str) -> None:
+        """公開時刻を過ぎたフレームを順に流す"""
+        self._release_handles.pop(game_id, None)
+        buffer = self._buffers.get(game_id)
+        now = time.monotonic()
+        while buffer and buffer[0][0] <= now:
+            _, frame, delta = buffer.popleft()
+            self._release(game_id, frame, delta)
+        self._schedule_release(game_id)
+
+    @staticmethod
+    async def _close_websocket(connection: ClientConnection) -> None:
+        try:
+            await connection.websocket.close(code=status.WS_1001_GOING_AWAY, reason="Game closed")
+        except Exception as e:
+            logger.debug(f"Error closing spectator websocket: {e}")
+
+
+# グローバルインスタンス
+spectator_hub = SpectatorHub()
@@ -0,0 +1,135 @@
+"""
+AI決定のベンチマーク: 全テーブル一括（NumPy）と既存の経路の比較
+
+- 決定のみ: 特徴量のエンコードとスコアリングを、同じ方策の1件ずつ・AIService.decide_action のループと比べる
+- 適用まで: AIだけのテーブルでハンドを最後まで進め、適用したアクション数/秒を比べる
+  - scheduler: AITurnScheduler の経路（ai_executor で決定し、テーブルのアクターで適用、思考時間0）
+  - batched: AIBatchDispatcher.tick() を保留中の決定がなくなるまで繰り返す
+
+実行方法（serverディレクトリで）:
+    python benchmarks/bench_ai_batch.py --tables 2000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.game.domain.player import Player  # noqa: E402
+from app.game.services.game_service import GameService, game_service as default_game_service  # noqa: E402
+from app.game.services.ai_executor import ai_executor  # noqa: E402
+from app.game.services.ai_service import AIService  # noqa: E402
+from app.game.services.ai_batch_dispatcher import AIBatchDispatcher  # noqa: E402
+from app.websocket.ai_turn_scheduler import AITurnScheduler  # noqa: E402
+
+
+async def build_tables(game_service: GameService, tables: int) -> List[str]:
+    """AIだけのテーブルを作成してハンドを開始する"""
+    game_ids = []
+    # GameState.add_player の標準出力を抑制
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(tables):
+            game = await game_service.create_single_play_game()
+            bot = Player(player_id=str(uuid.uuid4()), name="Bot", is_ai=True)
+            await game_service.setup_single_play_seats(game.id, bot)
+            await game_service.start_game(game.id)
+            game_ids.append(game.id)
+    return game_ids
+
+
+async def play_out(label: str, tables: int, run: Callable[[List[str]], Awaitable[None]]) -> float:
+    """AIだけのテーブルで1ハンドずつ最後まで進め、適用したアクション数/秒を表示する"""
+    # AITurnScheduler はグローバルの GameService を使うので、両方の経路をそろえる
+    game_ids = await build_tables(default_game_service, tables)
+    start = time.perf_counter()
+    await run(game_ids)
+    elapsed = time.perf_counter() - start
+    applied = sum(len(default_game_service.games[game_id].history) for game_id in game_ids)
+    for game_id in game_ids:
+        default_game_service.delete_game(game_id)
+    rate = applied / elapsed
+    print(f"{label:<32} {rate:>12,.0f} actions/s ({applied} actions in {elapsed:.2f}s)")
+    return rate
+
+
+def bench(label: str, decisions: int, fn, repeat: int) -> float:
+    """fnをrepeat回実行し、1秒あたりの決定数を表示する"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = decisions * repeat / elapsed
+    print(f"{label:<32} {rate:>12,.0f} decisions/s")
+    return rate
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    # アクションごとのINFOログは両方の経路で出さない（出力のコストを比べないため）
+    logging.disable(logging.INFO)
+
+    game_service = GameService()
+    await build_tables(game_service, args.tables)
+
+    dispatcher = AIBatchDispatcher(game_service)
+    ai_service = AIService()
+    pending = dispatcher.collect_pending()
+    print(f"tables={args.tables} pending decisions={len(pending)}")
+
+    def batched():
+        features, amounts = dispatcher.encode(pending)
+        dispatcher.decide(features, amounts)
+
+    def one_at_a_time():
+        for item in pending:
+            features, amounts = dispatcher.encode([item])
+            dispatcher.decide(features, amounts)
+
+    def scoring_only():
+        dispatcher.decide(features, amounts)
+
+    def ai_service_loop():
+        for _, game, seat, _ in pending:
+            ai_service.decide_action(game, seat)
+
+    features, amounts = dispatcher.encode(pending)
+    print("-- decision only")
+    batched_rate = bench("batched (encode + score)", len(pending), batched, args.repeat)
+    single_rate = bench("one at a time (same policy)", len(pending), one_at_a_time, args.repeat)
+    bench("batched scoring only", len(pending), scoring_only, args.repeat * 20)
+    service_rate = bench("AIService.decide_action loop", len(pending), ai_service_loop, args.repeat)
+    print(f"batched / one at a time: {batched_rate / single_rate:.1f}x, "
+          f"batched / AIService loop: {batched_rate / service_rate:.2f}x")
+
+    print("-- decided and applied (play each table's hand to the end)")
+    scheduler = AITurnScheduler(think_time=0)
+
+    async def scheduler_path(game_ids: List[str]) -> None:
+        await asyncio.gather(*(scheduler._play_ai_turns(game_id) for game_id in game_ids))
+
+    batch_dispatcher = AIBatchDispatcher(default_game_service)
+
+    async def batched_path(game_ids: List[str]) -> None:
+        while await batch_dispatcher.tick():
+            pass
+        assert not batch_dispatcher.collect_pending()
+
+    scheduler_rate = await play_out(f"scheduler ({ai_executor.mode} executor)", args.tables, scheduler_path)
+    batched_applied = await play_out("batched tick", args.tables, batched_path)
+    print(f"batched / scheduler: {batched_applied / scheduler_rate:.1f}x")
+    ai_executor.shutdown()
+    await default_game_service.table_actors.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
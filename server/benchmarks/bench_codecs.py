@@ -0,0 +1,113 @@
+"""
+ワイヤーフォーマットのベンチマーク: コーデックごとの1メッセージあたりのエンコードコストとサイズ
+
+- baseline: 従来の送信方法（閲覧者ごとに serialize_game_state + 標準JSON）
+- full: 公開部分を1回だけエンコードし、閲覧者ごとにホールカードを差し込んだ game_state
+- delta: 1アクション分の game_state_delta
+- control: 小さな制御メッセージ（エラーなど）
+
+実行方法（serverディレクトリで）:
+    python benchmarks/bench_codecs.py --seats 9 --repeat 2000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.game.domain.player import Player  # noqa: E402
+from app.game.services.game_service import GameService  # noqa: E402
+from app.game.services.ai_service import AIService  # noqa: E402
+from app.websocket.codecs import CODECS  # noqa: E402
+from app.websocket.serializers import (  # noqa: E402
+    build_delta_frame,
+    build_state_frame,
+    create_message,
+    serialize_game_state,
+)
+
+
+async def build_table(seats: int):
+    """全席が埋まったテーブルを作り、1アクション進めた前後の状態を返す"""
+    game_service = GameService()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = await game_service.create_game("bench", seat_count=seats)
+        players = [Player(player_id=f"player-{i}", name=f"Player{i}") for i in range(seats)]
+        for index, player in enumerate(players):
+            game.add_player(player)
+            game.table.seats[index].sit_down(player, 10000)
+        await game_service.start_game(game.id)
+
+    before = build_state_frame(game)
+    seat = game.table.seats[game.current_seat_index]
+    action = AIService().decide_action(game, seat)
+    await game_service.poker_engine.process_action(game, action)
+    return game, [player.id for player in players], before
+
+
+def per_message(fn, messages: int, repeat: int) -> float:
+    """fnをrepeat回実行し、1メッセージあたりのマイクロ秒を返す"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / (repeat * messages) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="コーデックごとのエンコードコスト")
+    parser.add_argument("--seats", type=int, default=9)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    game, viewers, before = asyncio.run(build_table(args.seats))
+    viewer_count = len(viewers)
+
+    def baseline():
+        for viewer in viewers:
+            json.dumps(create_message("game_state", serialize_game_state(game, viewer)), separators=(",", ":"))
+
+    baseline_size = len(json.dumps(
+        create_message("game_state", serialize_game_state(game, viewers[0])), separators=(",", ":")
+    ).encode())
+    print(f"{viewer_count} viewers, {args.repeat} broadcasts")
+    print(f"{'codec':<10}{'full us/msg':>14}{'full bytes':>12}{'delta us/msg':>15}{'delta bytes':>13}{'control us':>12}")
+    print(f"{'baseline':<10}{per_message(baseline, viewer_count, args.repeat):>14.2f}{baseline_size:>12}")
+
+    control = create_message("error", None, "Invalid action")
+    for name, codec in CODECS.items():
+        def full():
+            frame = build_state_frame(game)
+            for viewer in viewers:
+                frame.encode(viewer, codec)
+
+        def delta():
+            frame = build_state_frame(game)
+            delta_frame = build_delta_frame(before, frame)
+            for viewer in viewers:
+                delta_frame.encode(viewer, codec)
+
+        def encode_control():
+            codec.encode(control)
+
+        frame = build_state_frame(game)
+        full_size = len(_as_bytes(frame.encode(viewers[0], codec)))
+        delta_size = len(_as_bytes(build_delta_frame(before, frame).encode(viewers[0], codec)))
+        print(
+            f"{name:<10}"
+            f"{per_message(full, viewer_count, args.repeat):>14.2f}{full_size:>12}"
+            f"{per_message(delta, viewer_count, args.repeat):>15.2f}{delta_size:>13}"
+            f"{per_message(encode_control, 1, args.repeat * 10):>12.2f}"
+        )
+
+
+def _as_bytes(frame) -> bytes:
+    return frame if isinstance(frame, bytes) else frame.encode()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+受信メッセージの検証のベンチマーク: 1メッセージあたりの解析コスト
+
+- baseline: 従来の処理（json.loads のあと dict から type を取り出し、ActionType(action.upper()) に変換）
+- adapter(json): 判別共用体の TypeAdapter で JSON のパースと検証を1回で行う（テキストフレーム）
+- adapter(msgpack): msgpack をデコードしてから TypeAdapter で検証（バイナリフレーム）
+- reject: 壊れた・未知の type・サイズ超過のメッセージを拒否するまでのコスト
+
+実行方法（serverディレクトリで）:
+    python benchmarks/bench_inbound.py --repeat 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.game.domain.enum import ActionType  # noqa: E402
+from app.websocket.codecs import CODECS  # noqa: E402
+from app.websocket.inbound import InvalidMessageError, parse_client_message  # noqa: E402
+
+MESSAGES = {
+    "player_action": {"type": "player_action", "action": "RAISE", "amount": 300},
+    "get_state": {"type": "get_state"},
+    "pong": {"type": "pong"},
+}
+
+REJECTED = {
+    "malformed": "{\"type\": \"player_action\", \"action\": ",
+    "unknown_type": json.dumps({"type": "chat", "message": "hello"}),
+    "bad_field": json.dumps({"type": "player_action", "action": "JUMP", "amount": -1}),
+    "oversized": json.dumps({"type": "get_state", "padding": "x" * 8192}),
+}
+
+
+def baseline(raw: str):
+    """従来の受信処理（dict のまま type で分岐し、アクションは手で変換）"""
+    data = json.loads(raw)
+    if data.get("type") == "player_action":
+        return ActionType(data.get("action").upper()), data.get("amount", 0)
+    return data.get("type")
+
+
+def per_call(fn, raw, repeat: int) -> float:
+    """fn(raw) を repeat 回実行し、1回あたりのマイクロ秒を返す"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(raw)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def rejecting(codec):
+    def parse(raw):
+        try:
+            parse_client_message(raw, codec)
+        except InvalidMessageError:
+            pass
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inbound message validation benchmark")
+    parser.add_argument("--repeat", type=int, default=100000)
+    args = parser.parse_args()
+
+    json_codec = CODECS["json"]
+    msgpack_codec = CODECS.get("msgpack")
+
+    print(f"{'message':<16} {'baseline µs':>12} {'adapter(json) µs':>17} {'adapter(msgpack) µs':>20}")
+    for name, message in MESSAGES.items():
+        raw = json.dumps(message)
+        base = per_call(baseline, raw, args.repeat)
+        adapter = per_call(lambda r: parse_client_message(r, json_codec), raw, args.repeat)
+        if msgpack_codec is not None:
+            packed = msgpack_codec.encode(message)
+            binary = f"{per_call(lambda r: parse_client_message(r, msgpack_codec), packed, args.repeat):20.2f}"
+        else:
+            binary = f"{'n/a':>20}"
+        print(f"{name:<16} {base:12.2f} {adapter:17.2f} {binary}")
+
+    print()
+    print(f"{'rejected':<16} {'adapter(json) µs':>17}")
+    for name, raw in REJECTED.items():
+        print(f"{name:<16} {per_call(rejecting(json_codec), raw, args.repeat):17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+デッキ・ポット・GameState の使い回しのベンチマーク: 10,000ハンドあたりのオブジェクト生成数とGC
+
+- legacy: 従来の処理（ハンドごとに新しい Deck と52枚の Card・ポットのリストを作り、ゲームの作成ごとに GameState を作る）
+- pooled: 共有の52枚とデッキ・ポット・ボードのリストを使い回し、破棄したゲームの GameState をプールから再利用する
+
+全員がコール/チェックするハンドをテーブルのアクター経由で進め、--hands-per-table ハンドごとに
+ゲームを破棄して作り直す（作り直しの多いサーバーを模す）。GCの回数と停止時間は gc.callbacks で計る。
+
+実行方法（serverディレクトリで）:
+    python benchmarks/bench_pooling.py --hands 10000
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.game.domain.deck import Card, Deck  # noqa: E402
+from app.game.domain.enum import ActionType, GameStatus  # noqa: E402
+from app.game.domain.game_state import GameState  # noqa: E402
+from app.game.domain.player import Player  # noqa: E402
+from app.game.domain.seat import Seat  # noqa: E402
+from app.game.domain.table import Pot, Table  # noqa: E402
+from app.game.services.game_service import GameService  # noqa: E402
+
+COUNTED = (Card, Deck, Pot, Seat, Table, GameState)
+BUY_IN = 10000
+
+
+def legacy_reset_for_new_hand(self: Table) -> None:
+    """従来の Table.reset_for_new_hand（ハンドごとに新しいデッキとリストを作る）"""
+    deck = Deck.__new__(Deck)
+    deck.cards = [Card(rank, suit) for suit in Card.suit_map.keys() for rank in Card.rank_order]
+    deck.shuffle()
+    self.deck = deck
+    self.community_cards = []
+    self.runouts = []
+    self.pots = [Pot()]
+    for seat in self.seats:
+        seat.clear_for_new_hand()
+
+
+@contextlib.contextmanager
+def count_constructions(counter: Counter):
+    """COUNTED のクラスの生成数を数える"""
+    originals = {cls: cls.__init__ for cls in COUNTED}
+
+    def wrap(cls, init):
+        def counted_init(self, *args, **kwargs):
+            counter[cls.__name__] += 1
+            init(self, *args, **kwargs)
+        return counted_init
+
+    for cls, init in originals.items():
+        cls.__init__ = wrap(cls, init)
+    try:
+        yield
+    finally:
+        for cls, init in originals.items():
+            cls.__init__ = init
+
+
+@contextlib.contextmanager
+def measure_gc(result: Dict[str, float]):
+    """世代ごとのGC回数と合計停止時間（ミリ秒）を数える"""
+    started: Dict[str, float] = {}
+
+    def callback(phase, info):
+        if phase == "start":
+            started["t"] = time.perf_counter()
+        else:
+            result["pause_ms"] += (time.perf_counter() - started.pop("t", time.perf_counter())) * 1000
+            result[f"gen{info['generation']}"] += 1
+
+    result.update({"pause_ms": 0.0, "gen0": 0, "gen1": 0, "gen2": 0})
+    gc.collect()
+    gc.callbacks.append(callback)
+    try:
+        yield
+    finally:
+        gc.callbacks.remove(callback)
+
+
+async def new_table(game_service: GameService, seats: int) -> str:
+    """全席にプレイヤーを座らせたゲームを作成する"""
+    game_id = str(uuid.uuid4())
+    await game_service.create_game(game_id, seat_count=seats)
+    for i in range(seats):
+        await game_service.join_game(game_id, Player(player_id=str(uuid.uuid4()), name=f"P{i}"))
+    return game_id
+
+
+async def play_hand(game_service: GameService, game_id: str) -> None:
+    """全員がコール/チェックするハンドを最後まで進める"""
+    game = game_service.get_game_state(game_id)
+    for seat in game.table.seats:
+        if seat.stack < game.big_blind * 2:
+            seat.stack = BUY_IN
+    await game_service.start_game(game_id)
+    while game.status == GameStatus.IN_PROGRESS and game.current_seat_index is not None:
+        seat = game.table.seats[game.current_seat_index]
+        action = ActionType.CALL if game.current_bet > seat.bet_in_round else ActionType.CHECK
+        if not await game_service.process_player_action(game_id, seat.player.id, action, 0):
+            break
+
+
+async def run(mode: str, hands: int, seats: int, hands_per_table: int) -> Dict[str, float]:
+    """hands ハンドを進め、生成数・GC・経過時間を返す"""
+    game_service = GameService()
+    if mode == "legacy":
+        game_service.state_pool.max_size = 0
+    original_reset = Table.reset_for_new_hand
+    if mode == "legacy":
+        Table.reset_for_new_hand = legacy_reset_for_new_hand
+
+    counter: Counter = Counter()
+    result: Dict[str, float] = {}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), count_constructions(counter), measure_gc(result):
+            start = time.perf_counter()
+            game_id = await new_table(game_service, seats)
+            for hand in range(1, hands + 1):
+                await play_hand(game_service, game_id)
+                if hand % hands_per_table == 0:
+                    await game_service.release_game(game_service.delete_game(game_id))
+                    game_id = await new_table(game_service, seats)
+            result["seconds"] = time.perf_counter() - start
+    finally:
+        Table.reset_for_new_hand = original_reset
+        await game_service.table_actors.shutdown()
+
+    # 再利用時の GameState.reset も __init__ を通るので、新しく作った数はプールの統計から取る
+    counter["GameState"] = game_service.state_pool.created
+    result["objects"] = sum(counter.values())
+    result.update({name: counter[name] for name in ("Card", "Deck", "Pot", "GameState")})
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--seats", type=int, default=6)
+    parser.add_argument("--hands-per-table", type=int, default=20, help="この数のハンドごとにゲームを作り直す")
+    args = parser.parse_args()
+
+    print(f"hands={args.hands} seats={args.seats} hands_per_table={args.hands_per_table}")
+    header = (
+        f"{'mode':<8} {'objects':>9} {'Card':>8} {'Deck':>6} {'Pot':>7} {'GameState':>9} "
+        f"{'gen0':>6} {'gen1':>5} {'gen2':>5} {'gc ms':>8} {'hands/s':>9}"
+    )
+    print(header)
+    for mode in ("legacy", "pooled"):
+        r = await run(mode, args.hands, args.seats, args.hands_per_table)
+        print(
+            f"{mode:<8} {r['objects']:>9,} {r['Card']:>8,} {r['Deck']:>6,} {r['Pot']:>7,} {r['GameState']:>9,} "
+            f"{r['gen0']:>6} {r['gen1']:>5} {r['gen2']:>5} {r['pause_ms']:>8.1f} {args.hands / r['seconds']:>9,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,371 @@
+"""
+WebSocket負荷試験: 多数のテーブルを同時に進め、アクションからブロードキャストまでの遅延を計測する
+
+テーブルごとに POST /api/games/single-play でゲームを作り、/ws/game/{game_id} に1クライアントずつ接続して
+自分の手番でランダムな合法アクション（チェック/コール/フォールド/ベット/レイズ）を送る。
+一定間隔で次を表示する。
+
+- アクション送信から、そのアクションを反映した状態（game_state / game_state_delta）を受信するまでの p50/p95/p99
+- 全クライアントの受信メッセージ数/秒
+- サーバープロセスのメモリ（RSS、Linuxの /proc から。--spawn か --server-pid を指定した場合）
+
+実行方法（serverディレクトリで）:
+    # ローカルにuvicornを起動して計測
+    python benchmarks/load_test.py --spawn --tables 1000 --duration 120
+    # ブロードキャストの間引きなしで計測
+    python benchmarks/load_test.py --spawn --tables 1000 --env POKER_BROADCAST_INTERVAL=0
+    # 起動済みのサーバーに対して計測
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --server-pid 12345 --tables 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import websockets
+from websockets.exceptions import ConnectionClosed, InvalidStatus
+
+SERVER_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """ソート済みの値のパーセンタイル（最近傍）"""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def read_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """プロセスの常駐メモリ（MB、取得できなければNone）"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class LoadStats:
+    """全クライアントで共有する計測値（区間ごとの値は report でリセット）"""
+
+    def __init__(self):
+        self.connected = 0
+        self.tables_created = 0
+        self.failures = 0
+        self.actions = 0
+        self.invalid_actions = 0
+        self.hands = 0
+        self.messages = 0
+        self.window_messages = 0
+        self.window_latencies: List[float] = []
+        self.latencies: List[float] = []
+
+    def record_latency(self, seconds: float) -> None:
+        self.window_latencies.append(seconds)
+        self.latencies.append(seconds)
+
+
+class TableClient:
+    """
+    1テーブル分のクライアント（ゲーム作成・接続・手番でのアクション）
+
+    Args:
+        index: クライアント番号
+        args: コマンドライン引数
+        http: ゲーム作成用のHTTPクライアント
+        stats: 共有の計測値
+    """
+
+    def __init__(self, index: int, args: argparse.Namespace, http: httpx.AsyncClient, stats: LoadStats):
+        self.index = index
+        self.args = args
+        self.http = http
+        self.stats = stats
+        self.rng = random.Random(args.seed + index)
+        self.player_id: Optional[str] = None
+        self.state: Optional[dict] = None
+        # (送信時刻, 送信時点のバージョン)。反映された状態を受信したら計測して消す
+        self.pending: Optional[tuple] = None
+
+    async def run(self, deadline: float) -> None:
+        """締め切りまでテーブルを進める（破産したら新しいゲームを作り直す）"""
+        while time.monotonic() < deadline:
+            try:
+                busted = await self._play_game(deadline)
+            except (OSError, ConnectionClosed, InvalidStatus, httpx.HTTPError, asyncio.TimeoutError):
+                self.stats.failures += 1
+                await asyncio.sleep(1.0)
+                continue
+            if not busted:
+                return
+
+    async def _play_game(self, deadline: float) -> bool:
+        response = await self.http.post("/api/games/single-play", json={})
+        response.raise_for_status()
+        game_id = response.json()["game_id"]
+        self.stats.tables_created += 1
+
+        ws_url = self.args.url.replace("http", "ws", 1) + f"/ws/game/{game_id}?username=load{self.index}"
+        if self.args.delta:
+            ws_url += "&delta=true"
+        async with websockets.connect(ws_url, max_size=None, ping_interval=None) as ws:
+            self.stats.connected += 1
+            try:
+                await ws.send(json.dumps({"type": "start_game"}))
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        return False
+                    self.stats.messages += 1
+                    self.stats.window_messages += 1
+                    if await self._on_message(ws, json.loads(raw)):
+                        return True
+            finally:
+                self.stats.connected -= 1
+                self.pending = None
+
+    async def _on_message(self, ws, message: dict) -> bool:
+        """受信メッセージの処理。破産してテーブルを作り直す場合はTrue"""
+        message_type = message["type"]
+        if message_type == "connected":
+            self.player_id = message["data"]["player_id"]
+            return False
+        if message_type == "ping":
+            await ws.send(json.dumps({"type": "pong"}))
+            return False
+        if message_type == "error":
+            if self.pending is not None:
+                # 不正なアクション（レイズ額など）はコール/チェックでやり直す
+                self.stats.invalid_actions += 1
+                self.pending = None
+                await self._send_action(ws, self._passive_action())
+            return False
+        if message_type == "game_state":
+            self.state = message["data"]
+        elif message_type == "game_state_delta":
+            if not self._apply_delta(message["data"]):
+                await ws.send(json.dumps({"type": "resync"}))
+                return False
+        else:
+            return False
+
+        state = self.state
+        if self.pending is not None and state["version"] > self.pending[1]:
+            self.stats.record_latency(time.perf_counter() - self.pending[0])
+            self.pending = None
+
+        if state["status"] == "HAND_COMPLETE":
+            self.stats.hands += 1
+            my_seat = self._my_seat()
+            if my_seat is None or my_seat["stack"] <= 0:
+                return True
+            await ws.send(json.dumps({"type": "start_game"}))
+            return False
+
+        current = state["current_seat_index"]
+        if (
+            self.pending is None
+            and state["status"] == "IN_PROGRESS"
+            and current is not None
+            and (state["seats"][current].get("player") or {}).get("id") == self.player_id
+        ):
+            if self.args.think > 0:
+                await asyncio.sleep(self.rng.uniform(0, self.args.think))
+            await self._send_action(ws, self._random_action())
+        return False
+
+    def _apply_delta(self, delta: dict) -> bool:
+        """差分を手元の状態に適用（バージョンが飛んでいればFalse）"""
+        if self.state is None or self.state["version"] != delta["from_version"]:
+            return False
+        self.state.update(delta["changes"])
+        self.state["version"] = delta["version"]
+        for index, changes in delta["seats"].items():
+            self.state["seats"][int(index)].update(changes)
+        return True
+
+    def _my_seat(self) -> Optional[dict]:
+        for seat in self.state["seats"]:
+            if (seat.get("player") or {}).get("id") == self.player_id:
+                return seat
+        return None
+
+    def _passive_action(self) -> dict:
+        seat = self._my_seat()
+        if seat is not None and seat["bet_in_round"] < self.state["current_bet"]:
+            return {"type": "player_action", "action": "CALL", "amount": 0}
+        return {"type": "player_action", "action": "CHECK", "amount": 0}
+
+    def _random_action(self) -> dict:
+        """手番でのランダムな合法アクション（フォールド10%・ベット/レイズ15%・残りはチェック/コール）"""
+        state = self.state
+        seat = self._my_seat()
+        to_call = state["current_bet"] - seat["bet_in_round"]
+        roll = self.rng.random()
+        if roll < 0.10 and to_call > 0:
+            return {"type": "player_action", "action": "FOLD", "amount": 0}
+        if roll < 0.25 and seat["stack"] > to_call + state["big_blind"]:
+            if state["current_bet"] == 0:
+                return {"type": "player_action", "action": "BET", "amount": state["big_blind"] * 2}
+            total = min(state["current_bet"] + state["big_blind"] * 2, seat["stack"] + seat["bet_in_round"])
+            return {"type": "player_action", "action": "RAISE", "amount": total}
+        return self._passive_action()
+
+    async def _send_action(self, ws, action: dict) -> None:
+        self.pending = (time.perf_counter(), self.state["version"])
+        self.stats.actions += 1
+        await ws.send(json.dumps(action))
+
+
+def spawn_server(port: int, env_overrides: Dict[str, str]) -> subprocess.Popen:
+    """ローカルにuvicornを起動"""
+    env = dict(os.environ, **env_overrides)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(http: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    """サーバーが /health に応答するまで待つ"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await http.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError("Server did not become ready")
+        await asyncio.sleep(0.2)
+
+
+async def report_loop(stats: LoadStats, args: argparse.Namespace, pid: Optional[int], timeline: List[dict]) -> None:
+    """一定間隔で区間の計測値を表示"""
+    started = time.monotonic()
+    last = started
+    print(f"{'time':>6} {'conns':>6} {'msg/s':>8} {'actions':>8} {'p50ms':>7} {'p95ms':>7} {'p99ms':>7} {'rssMB':>7}")
+    while True:
+        await asyncio.sleep(args.report_interval)
+        now = time.monotonic()
+        window = sorted(stats.window_latencies)
+        row = {
+            "time": round(now - started, 1),
+            "connections": stats.connected,
+            "messages_per_sec": round(stats.window_messages / (now - last), 1),
+            "actions": stats.actions,
+            "p50_ms": round(percentile(window, 50) * 1000, 2),
+            "p95_ms": round(percentile(window, 95) * 1000, 2),
+            "p99_ms": round(percentile(window, 99) * 1000, 2),
+            "rss_mb": read_rss_mb(pid),
+        }
+        timeline.append(row)
+        rss = f"{row['rss_mb']:7.1f}" if row["rss_mb"] is not None else f"{'-':>7}"
+        print(
+            f"{row['time']:6.1f} {row['connections']:6d} {row['messages_per_sec']:8.1f} {row['actions']:8d} "
+            f"{row['p50_ms']:7.2f} {row['p95_ms']:7.2f} {row['p99_ms']:7.2f} {rss}"
+        )
+        stats.window_messages = 0
+        stats.window_latencies.clear()
+        last = now
+
+
+def raise_fd_limit() -> None:
+    """同時接続数のためにファイルディスクリプタの上限を引き上げる"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="WebSocket load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="サーバーのURL（--spawn時は無視）")
+    parser.add_argument("--spawn", action="store_true", help="ローカルにuvicornを起動して計測する")
+    parser.add_argument("--port", type=int, default=8765, help="--spawn時のポート")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="--spawn時にサーバーへ渡す環境変数（例: POKER_BROADCAST_INTERVAL=0）")
+    parser.add_argument("--server-pid", type=int, default=None, help="メモリを計測するサーバーのPID")
+    parser.add_argument("--tables", type=int, default=200, help="同時に進めるテーブル（クライアント）数")
+    parser.add_argument("--ramp", type=float, default=100.0, help="1秒あたりに開始するテーブル数")
+    parser.add_argument("--duration", type=float, default=60.0, help="計測時間（秒）")
+    parser.add_argument("--think", type=float, default=0.0, help="アクション前の最大待ち時間（秒、一様乱数）")
+    parser.add_argument("--delta", action="store_true", help="差分配信（delta=true）で接続する")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="表示間隔（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="時系列と集計をJSONで保存するパス")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    server: Optional[subprocess.Popen] = None
+    pid = args.server_pid
+    if args.spawn:
+        server = spawn_server(args.port, dict(item.split("=", 1) for item in args.env))
+        pid = server.pid
+        args.url = f"http://127.0.0.1:{args.port}"
+
+    stats = LoadStats()
+    timeline: List[dict] = []
+    limits = httpx.Limits(max_connections=100)
+    try:
+        async with httpx.AsyncClient(base_url=args.url, timeout=30.0, limits=limits) as http:
+            await wait_ready(http)
+            rss_start = read_rss_mb(pid)
+            reporter = asyncio.create_task(report_loop(stats, args, pid, timeline))
+            deadline = time.monotonic() + args.duration
+            clients = []
+            for index in range(args.tables):
+                client = TableClient(index, args, http, stats)
+                clients.append(asyncio.create_task(client.run(deadline)))
+                if args.ramp > 0:
+                    await asyncio.sleep(1 / args.ramp)
+            await asyncio.gather(*clients)
+            reporter.cancel()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    latencies = sorted(stats.latencies)
+    summary = {
+        "tables": args.tables,
+        "duration": args.duration,
+        "tables_created": stats.tables_created,
+        "failures": stats.failures,
+        "actions": stats.actions,
+        "invalid_actions": stats.invalid_actions,
+        "hands": stats.hands,
+        "messages": stats.messages,
+        "messages_per_sec": round(stats.messages / args.duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "rss_start_mb": rss_start,
+        "rss_peak_mb": max((row["rss_mb"] for row in timeline if row["rss_mb"] is not None), default=None),
+    }
+    print()
+    for key, value in summary.items():
+        print(f"{key:>16}: {value}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"summary": summary, "timeline": timeline}, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,10 +4,27 @@ FastAPIアプリケーションのエントリーポイント
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from app.websocket import router as websocket_router
 from app.api.game_api import router as game_api_router
+from app.api.tournament_api import router as tournament_api_router
+from app.game.services.game_service import game_service
+from app.game.services.timer_service import timer_service
+from app.game.services.game_lifecycle import game_lifecycle
+from app.game.services.tournament_service import tournament_service
+from app.game.services.ai_executor import ai_executor
+from app.game.services.ai_service import AIService
+from app.game.services.ai_batch_dispatcher import ai_batch_dispatcher
+from app.websocket.ai_turn_scheduler import ai_turn_scheduler
+from app.websocket.broadcast_coalescer import broadcast_coalescer
+from app.websocket.spectators import spectator_hub
+from app.websocket.sessions import session_manager
+from app.websocket.heartbeat import heartbeat_monitor
+from app.sharding.node import shard_node
+from app.core.metrics import metrics
+from app.core.loop_lag import loop_lag_monitor
+from functools import partial
 import logging
 import os
 
@@ -22,6 +39,50 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# AI進行モード: "scheduler"（テーブルごとのタスク）または "batch"（全テーブルを一括処理）
+AI_MODE = os.getenv("POKER_AI_MODE", "scheduler")
+
+# AIの戦略（"conservative" / "equity" / "cfr"）と equity 戦略の1回の決定の時間予算（秒、ゲーム作成時の ai_time_budget で上書き）
+# cfr 戦略の戦略ファイル（cfr_trainer の出力、開けない場合は equity で判断する）
+# AI決定の実行モード（"thread" / "process"）。scheduler モードの AI に適用される
+ai_executor.configure(
+    ai_service_factory=partial(
+        AIService,
+        strategy=os.getenv("POKER_AI_STRATEGY", "conservative"),
+        time_budget=float(os.getenv("POKER_AI_TIME_BUDGET", "0.05")),
+        strategy_path=os.getenv("POKER_AI_STRATEGY_PATH") or None,
+    ),
+    mode=os.getenv("POKER_AI_EXECUTOR", "thread"),
+)
+
+# ゲーム状態のブロードキャスト間隔（秒）。連続した変更はこの間隔で1回にまとめる（0で毎回送信）
+broadcast_coalescer.interval = float(os.getenv("POKER_BROADCAST_INTERVAL", "0.05"))
+
+# 観戦者への配信遅延（秒）
+spectator_hub.delay = float(os.getenv("POKER_SPECTATOR_DELAY", "0"))
+
+# 切断後に座席を保持する秒数（この間は再接続トークンで復帰できる、0で即座に退席）
+session_manager.grace_period = float(os.getenv("POKER_RECONNECT_GRACE", "60"))
+
+# ハートビートの間隔（秒、0で無効）と、応答がなければ切断するまでの秒数
+heartbeat_monitor.interval = float(os.getenv("POKER_HEARTBEAT_INTERVAL", "15"))
+heartbeat_monitor.timeout = float(os.getenv("POKER_HEARTBEAT_TIMEOUT", str(heartbeat_monitor.interval * 3)))
+
+# ゲームの破棄: 人間の操作がない秒数・人間が接続していない秒数（0で無効）とゲーム数の上限（0で無制限）
+game_lifecycle.idle_ttl = float(os.getenv("POKER_GAME_IDLE_TTL", "1800"))
+game_lifecycle.abandoned_ttl = float(os.getenv("POKER_GAME_ABANDONED_TTL", "300"))
+game_lifecycle.max_games = int(os.getenv("POKER_MAX_GAMES", "10000"))
+# 破棄したゲームの GameState を再利用する数（0で無効）
+game_service.state_pool.max_size = int(os.getenv("POKER_GAME_POOL_SIZE", "256"))
+
+# トーナメントのハンドが終わってから次のハンドを始めるまでの秒数
+tournament_service.hand_interval = float(os.getenv("POKER_TOURNAMENT_HAND_INTERVAL", "3"))
+# トーナメントのブラインドレベルの長さ（秒、作成時に level_interval の指定がないとき、0で上げない）
+tournament_service.level_interval = float(os.getenv("POKER_TOURNAMENT_LEVEL_INTERVAL", "600"))
+
+# イベントループの遅延を計測する間隔（秒、0で無効）
+loop_lag_monitor.interval = float(os.getenv("POKER_LOOP_LAG_INTERVAL", "0.5"))
+
 # テンプレート設定
 templates = Jinja2Templates(directory="templates")
 
@@ -41,9 +102,38 @@ app.add_middleware(
 
 # ルーターを追加
 app.include_router(game_api_router)  # REST API
+app.include_router(tournament_api_router)  # REST API（トーナメント）
 app.include_router(websocket_router)  # WebSocket
 
 
+@app.on_event("startup")
+async def on_startup():
+    """共有タイマーホイール・ハートビート・AI進行の駆動を開始（シャーディング時はメッセージバスに接続）"""
+    await shard_node.start()
+    timer_service.start()
+    loop_lag_monitor.start()
+    heartbeat_monitor.start()
+    game_lifecycle.start()
+    if AI_MODE == "batch":
+        ai_turn_scheduler.enabled = False
+        ai_batch_dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """AIターンスケジューラ・共有タイマーホイール・AIエグゼキュータを停止"""
+    await ai_turn_scheduler.shutdown()
+    broadcast_coalescer.shutdown()
+    heartbeat_monitor.stop()
+    loop_lag_monitor.stop()
+    game_lifecycle.stop()
+    await ai_batch_dispatcher.stop()
+    await timer_service.stop()
+    await game_service.table_actors.shutdown()
+    await shard_node.stop()
+    ai_executor.shutdown()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     """テストクライアントのHTMLページを表示"""
@@ -53,7 +143,53 @@ async def root(request: Request):
 @app.get("/health")
 async def health_check():
     """ヘルスチェックエンドポイント"""
-    return {"status": "healthy", "service": "poker"}
+    return {
+        "status": "healthy",
+        "service": "poker",
+        "shard": {"index": shard_node.config.index, "count": shard_node.config.count}
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus テキスト形式のメトリクス（ゲーム・接続・イベントループ）"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/ai/decision-cache")
+async def decision_cache_stats():
+    """AI決定キャッシュのヒット率（equity戦略、プロセスモードではワーカー分も合計）"""
+    return ai_executor.decision_cache_stats()
+
+
+@app.get("/api/broadcast/stats")
+async def broadcast_stats():
+    """ゲーム状態ブロードキャストの送信数と間引き数"""
+    return broadcast_coalescer.stats()
+
+
+@app.get("/api/spectators/stats")
+async def spectator_stats():
+    """観戦中のテーブル数・観戦者数・遅延バッファのフレーム数"""
+    return spectator_hub.stats()
+
+
+@app.get("/api/connections/stats")
+async def connection_stats():
+    """生存中・応答待ちの接続数と、ハートビートで回収した接続数"""
+    return heartbeat_monitor.stats()
+
+
+@app.get("/api/lifecycle/stats")
+async def lifecycle_stats():
+    """ゲーム数・人間が接続中のゲーム数・理由ごとの破棄数"""
+    return game_lifecycle.stats()
+
+
+@app.get("/api/lifecycle/memory")
+async def lifecycle_memory(limit: int = 20):
+    """全ゲームのメモリ使用量の概算と、使用量の多いゲームの一覧"""
+    return game_lifecycle.memory_report(limit=limit)
 
 
 @app.get("/api/info")
@@ -67,10 +203,22 @@ async def api_info():
             "rest_api": {
                 "create_game": "POST /api/games/single-play",
                 "get_game": "GET /api/games/{game_id}",
-                "delete_game": "DELETE /api/games/{game_id}"
+                "delete_game": "DELETE /api/games/{game_id}",
+                "game_memory": "GET /api/games/{game_id}/memory",
+                "create_tournament": "POST /api/tournaments",
+                "start_tournament": "POST /api/tournaments/{tournament_id}/start",
+                "get_tournament": "GET /api/tournaments/{tournament_id}",
+                "ai_decision_cache": "GET /api/ai/decision-cache",
+                "broadcast_stats": "GET /api/broadcast/stats",
+                "spectator_stats": "GET /api/spectators/stats",
+                "connection_stats": "GET /api/connections/stats",
+                "lifecycle_stats": "GET /api/lifecycle/stats",
+                "lifecycle_memory": "GET /api/lifecycle/memory",
+                "metrics": "GET /metrics"
             },
             "websocket": {
-                "game": "WS /ws/game/{game_id}?username={username}"
+                "game": "WS /ws/game/{game_id}?username={username}",
+                "spectate": "WS /ws/spectate/{game_id}"
             }
         },
         "usage": {
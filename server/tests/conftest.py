@@ -0,0 +1,24 @@
+"""
+テスト共通のヘルパー
+"""
+import uuid
+from typing import List
+
+from app.game.domain.enum import ActionType, GameStatus
+from app.game.domain.game_state import GameState
+from app.game.domain.player import Player
+from app.game.services.game_service import GameService
+
+
+def make_players(count: int, is_ai: bool = True) -> List[Player]:
+    """count 人のプレイヤーを作る"""
+    return [Player(player_id=str(uuid.uuid4()), name=f"P{i}", is_ai=is_ai) for i in range(count)]
+
+
+async def fold_to_hand_end(service: GameService, game_id: str) -> GameState:
+    """手番のプレイヤーが順にフォールドしてハンドを終わらせる"""
+    game = service.get_game_state(game_id)
+    while game.status == GameStatus.IN_PROGRESS and game.current_seat_index is not None:
+        seat = game.table.seats[game.current_seat_index]
+        assert await service.process_player_action(game_id, seat.player.id, ActionType.FOLD)
+    return game
@@ -0,0 +1,117 @@
+"""
+AIの決定に渡すスナップショットと、エグゼキュータ経由の決定のテスト
+"""
+from functools import partial
+
+import pytest
+
+from app.game.services.ai_executor import AIExecutor
+from app.game.services.ai_service import AIService
+from app.game.services.game_service import GameService
+
+from conftest import fold_to_hand_end, make_players
+
+
+async def started_game(seat_count: int = 3):
+    service = GameService()
+    await service.create_game("g1", seat_count=seat_count)
+    for player in make_players(seat_count):
+        await service.join_game("g1", player)
+    assert await service.start_game("g1")
+    return service, service.get_game_state("g1")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_copies_hand_state_without_history():
+    service, game = await started_game()
+    seat = game.table.seats[game.current_seat_index]
+    assert await service.process_player_action("g1", seat.player.id, AIService().decide_action(game, seat).action_type)
+    assert game.history
+
+    snapshot = game.snapshot()
+    assert snapshot.history == [] and snapshot.players == []
+    assert snapshot.table.deck.cards == []
+    for original, copied in zip(game.table.seats, snapshot.table.seats):
+        assert copied.hole_cards == original.hole_cards
+        assert copied.hole_cards is not original.hole_cards
+        assert (copied.stack, copied.bet_in_round, copied.status) == (original.stack, original.bet_in_round, original.status)
+    assert snapshot.table.total_pot == game.table.total_pot
+
+    # スナップショットを変更しても元のゲームは変わらない
+    snapshot.table.seats[0].hole_cards.clear()
+    snapshot.table.pots[0].eligible_seats.append(99)
+    assert len(game.table.seats[0].hole_cards) == 2
+    assert 99 not in game.table.pots[0].eligible_seats
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_history_is_cleared_at_hand_start():
+    service, game = await started_game()
+    await fold_to_hand_end(service, "g1")
+    assert game.history
+    assert await service.start_game("g1")
+    assert game.history == []
+    assert game.hand_number == 2
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_thread_executor_decides_like_the_service():
+    service, game = await started_game()
+    seat = game.table.seats[game.current_seat_index]
+    executor = AIExecutor(mode="thread", max_workers=1, decision_timeout=10)
+    try:
+        action = await executor.decide_action(game, seat)
+    finally:
+        executor.shutdown()
+    expected = AIService().decide_action(game, seat)
+    assert (action.player_id, action.action_type, action.amount) == \
+        (expected.player_id, expected.action_type, expected.amount)
+    await service.table_actors.shutdown()
+
+
+def test_configure_replaces_service_and_mode():
+    executor = AIExecutor(mode="thread", max_workers=1)
+    assert executor.strategy == "conservative"
+    executor.configure(ai_service_factory=partial(AIService, strategy="equity", time_budget=0.01), mode="process")
+    assert executor.strategy == "equity"
+    assert executor._ai_service.time_budget == 0.01
+    assert executor.mode == "process"
+    with pytest.raises(ValueError):
+        executor.configure(mode="fiber")
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_single_play_game_keeps_ai_time_budget():
+    service = GameService()
+    game = await service.create_single_play_game(ai_time_budget=0.2)
+    assert game.ai_time_budget == 0.2
+    default = await service.create_single_play_game()
+    assert default.ai_time_budget is None
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_decision_cache_stats_include_process_workers():
+    service, game = await started_game()
+    seat = game.table.seats[game.current_seat_index]
+    executor = AIExecutor(
+        ai_service_factory=partial(AIService, strategy="equity", time_budget=0.005),
+        mode="process", max_workers=1, decision_timeout=30
+    )
+    try:
+        first = await executor.decide_action(game, seat)
+        second = await executor.decide_action(game, seat)
+        stats = executor.decision_cache_stats()
+    finally:
+        executor.shutdown()
+    assert first.player_id == second.player_id == seat.player.id
+    assert (stats["strategy"], stats["mode"]) == ("equity", "process")
+    # 同じ局面の2回目はワーカーのキャッシュに当たる
+    (worker,) = stats["workers"].values()
+    assert (worker["hits"], worker["misses"]) == (1, 1)
+    assert stats["hits"] >= 1 and stats["misses"] >= 1
+    assert executor.decision_cache_stats()["workers"] == {}
+    await service.table_actors.shutdown()
@@ -0,0 +1,47 @@
+"""
+AIServiceの戦略設定のテスト
+"""
+import logging
+
+import pytest
+
+from app.game.services.ai_service import AIService
+from app.game.services.game_service import GameService
+
+from conftest import make_players
+
+
+@pytest.mark.parametrize("strategy_path", [None, "missing_strategy.bin", "broken"])
+def test_cfr_without_usable_strategy_file_falls_back(tmp_path, caplog, strategy_path):
+    if strategy_path == "broken":
+        broken = tmp_path / "broken.bin"
+        broken.write_bytes(b"not a strategy file")
+        strategy_path = str(broken)
+    elif strategy_path:
+        strategy_path = str(tmp_path / strategy_path)
+
+    with caplog.at_level(logging.WARNING):
+        service = AIService(strategy="cfr", strategy_path=strategy_path)
+    assert service.strategy == "cfr"
+    assert service.strategy_table is None
+    assert "falling back to equity" in caplog.text
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        AIService(strategy="random")
+
+
+@pytest.mark.asyncio
+async def test_cfr_fallback_still_decides():
+    game_service = GameService()
+    await game_service.create_game("g1", seat_count=2)
+    for player in make_players(2):
+        await game_service.join_game("g1", player)
+    assert await game_service.start_game("g1")
+    game = game_service.get_game_state("g1")
+    seat = game.table.seats[game.current_seat_index]
+
+    action = AIService(strategy="cfr", time_budget=0.005).decide_action(game, seat)
+    assert action is not None and action.player_id == seat.player.id
+    await game_service.table_actors.shutdown()
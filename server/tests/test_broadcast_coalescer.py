@@ -0,0 +1,60 @@
+"""
+ブロードキャストの間引きのテスト
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.websocket.broadcast_coalescer import BroadcastCoalescer
+
+
+@pytest.mark.asyncio
+async def test_updates_within_interval_are_sent_once():
+    coalescer = BroadcastCoalescer(interval=0.02)
+    sent = []
+    release = asyncio.Event()
+
+    async def flush(game_id: str) -> None:
+        await release.wait()
+        sent.append(game_id)
+
+    coalescer.set_flush(flush)
+    release.set()
+    await coalescer.publish("g1")
+    assert sent == ["g1"]
+
+    release.clear()
+    for _ in range(5):
+        await coalescer.publish("g1")
+    assert coalescer.stats()["pending"] == 1
+    await asyncio.sleep(0.04)
+    # 間隔の終わりに始めた送信タスクは完了まで参照が保持される
+    assert len(coalescer._flushing) == 1
+    release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert sent == ["g1", "g1"]
+    assert not coalescer._flushing
+    assert coalescer.stats() == {"published": 6, "flushed": 2, "coalesced": 4, "pending": 0}
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_pending_and_running_flushes():
+    coalescer = BroadcastCoalescer(interval=0.02)
+    started = asyncio.Event()
+
+    async def flush(game_id: str) -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    coalescer.set_flush(flush)
+    coalescer._last_flush["g1"] = coalescer._last_flush["g2"] = time.monotonic()
+    await coalescer.publish("g1")
+    await coalescer.publish("g2")
+    await asyncio.wait_for(started.wait(), timeout=1.0)
+    coalescer.shutdown()
+    assert coalescer.stats()["pending"] == 0
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert not coalescer._flushing
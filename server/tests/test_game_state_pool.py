@@ -0,0 +1,122 @@
+"""
+GameState・デッキ・ポットの使い回し（プールとハンドごとのリセット）のテスト
+"""
+import asyncio
+import copy
+
+import pytest
+
+from app.game.domain.enum import ActionType, GameStatus, Round
+from app.game.domain.game_state import GameState
+from app.game.services.game_lifecycle import GameLifecycleManager
+from app.game.services.game_service import GameService
+from app.websocket.serializers import build_state_frame, serialize_game_state
+
+from conftest import fold_to_hand_end, make_players
+
+
+async def played_game(service: GameService, game_id: str = "g1") -> GameState:
+    """3人で1ハンド終えたゲーム"""
+    await service.create_game(game_id, big_blind=200, seat_count=3)
+    for player in make_players(3):
+        await service.join_game(game_id, player)
+    assert await service.start_game(game_id)
+    return await fold_to_hand_end(service, game_id)
+
+
+async def call_to_flop(service: GameService, game_id: str) -> GameState:
+    """全員がコール/チェックしてフロップまで進める"""
+    game = service.get_game_state(game_id)
+    while game.current_round == Round.PREFLOP:
+        seat = game.table.seats[game.current_seat_index]
+        action = ActionType.CALL if game.current_bet > seat.bet_in_round else ActionType.CHECK
+        assert await service.process_player_action(game_id, seat.player.id, action)
+    return game
+
+
+@pytest.mark.asyncio
+async def test_reused_game_state_matches_a_new_one():
+    service = GameService()
+    game = await played_game(service)
+    assert game.history and game.hand_number == 1
+
+    released = service.delete_game("g1")
+    assert released is game
+    assert len(service.state_pool) == 0  # アクターが止まるまではプールに戻さない
+    await service.release_game(released)
+    assert len(service.state_pool) == 1
+
+    reused = await service.create_game("g2", big_blind=100, seat_count=3)
+    assert reused is game
+    assert service.state_pool.stats()["reused"] == 1
+    fresh = GameState(big_blind=100, small_blind=50, seat_count=3)
+    fresh.id = "g2"
+    expected = serialize_game_state(fresh)
+    actual = serialize_game_state(reused)
+    expected.pop("version")
+    actual.pop("version")
+    assert actual == expected
+    assert (reused.history, reused.players, reused.hand_number) == ([], [], 0)
+    assert reused.status == GameStatus.WAITING
+    assert len(reused.table.deck.cards) == 52
+
+    # 座席数が違えば使い回さない
+    other = await service.create_game("g3", seat_count=6)
+    assert other is not game and service.state_pool.stats()["created"] == 2
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cached_frame_keeps_eligible_seats_after_pot_reset():
+    service = GameService()
+    await service.create_game("g1", seat_count=3)
+    for player in make_players(3):
+        await service.join_game("g1", player)
+    assert await service.start_game("g1")
+    game = await call_to_flop(service, "g1")
+    frame = build_state_frame(game)
+    pots = copy.deepcopy(frame.table_state["pots"])
+    assert pots[0]["eligible_seats"] == [0, 1, 2]
+    encoded = frame.encode()
+
+    # 次のハンドで Pot.reset が eligible_seats をその場で空にしても、作成済みのフレームは変わらない
+    await fold_to_hand_end(service, "g1")
+    assert await service.start_game("g1")
+    assert game.table.pots[0].eligible_seats != [0, 1, 2]
+    assert frame.table_state["pots"] == pots
+    assert build_state_frame(game).version != frame.version
+    frame._encoded.clear()
+    assert frame.encode() == encoded
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_game_state_after_listeners_and_actor():
+    service = GameService()
+    lifecycle = GameLifecycleManager(service, sweep_interval=0)
+    game = await played_game(service)
+    lifecycle.register("g1")
+    seen = []
+    started = asyncio.Event()
+
+    async def listener(game_id: str, reason: str) -> None:
+        # リスナーの時点ではまだプールに戻っていない
+        seen.append((game_id, reason, len(service.state_pool)))
+
+    async def slow_command() -> None:
+        started.set()
+        await asyncio.sleep(10)
+
+    lifecycle.add_close_listener(listener)
+    running = asyncio.ensure_future(service.run_on_table("g1", slow_command))
+    await started.wait()
+    assert await lifecycle.close_game("g1")
+    assert seen == [("g1", "deleted", 0)]
+    # 実行中のコマンドを待っていた呼び出し側はキャンセルされず、Noneで再開する
+    assert running.done() and not running.cancelled()
+    assert running.result() is None
+    assert len(service.state_pool) == 1
+    assert await service.create_game("g2", seat_count=3) is game
+
+    assert not await lifecycle.close_game("g1")
+    await service.table_actors.shutdown()
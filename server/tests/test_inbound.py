@@ -0,0 +1,81 @@
+"""
+受信メッセージの検証（拒否の経路）のテスト
+"""
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from app.game.domain.enum import ActionType
+from app.game.services.game_service import game_service
+from app.schemas.websocket import PingMessage, PlayerActionMessage
+from app.websocket.codecs import CODECS
+from app.websocket.inbound import MAX_MESSAGE_SIZE, InvalidMessageError, parse_client_message
+
+JSON = CODECS["json"]
+MSGPACK = CODECS["msgpack"]
+
+
+@pytest.mark.parametrize("raw, error", [
+    ("x" * (MAX_MESSAGE_SIZE + 1), f"Message too large ({MAX_MESSAGE_SIZE + 1} > {MAX_MESSAGE_SIZE} bytes)"),
+    ("not json", "Malformed message"),
+    ('{"type": "ping"', "Malformed message"),
+    ("[1, 2]", "Invalid message: Input should be an object"),
+    ('{"action": "CALL"}', "Missing message type"),
+    ('{"type": "chat", "message": "hi"}', "Unknown message type: chat"),
+    ('{"type": "player_action", "action": "JUMP"}', "Invalid message: action: "),
+    ('{"type": "player_action"}', "Invalid message: action: Field required"),
+    ('{"type": "player_action", "action": "BET", "amount": -1}', "Invalid message: amount: "),
+    ('{"type": "player_action", "action": "BET", "amount": "lots"}', "Invalid message: amount: "),
+])
+def test_rejected_text_frames(raw, error):
+    with pytest.raises(InvalidMessageError) as excinfo:
+        parse_client_message(raw, JSON)
+    assert str(excinfo.value).startswith(error)
+
+
+@pytest.mark.parametrize("raw, error", [
+    (b"\xc1", "Malformed message"),
+    (msgpack.packb([1, 2]), "Malformed message"),
+    (msgpack.packb({"type": "resign"}), "Unknown message type: resign"),
+    (msgpack.packb({"type": "player_action", "action": "RAISE", "amount": -5}), "Invalid message: amount: "),
+    (msgpack.packb({"type": "ping", "pad": "x" * MAX_MESSAGE_SIZE}), "Message too large"),
+])
+def test_rejected_binary_frames(raw, error):
+    with pytest.raises(InvalidMessageError) as excinfo:
+        parse_client_message(raw, MSGPACK)
+    assert str(excinfo.value).startswith(error)
+
+
+def test_accepted_frames():
+    action = parse_client_message('{"type": "player_action", "action": "call", "amount": null}', JSON)
+    assert isinstance(action, PlayerActionMessage)
+    assert (action.action, action.amount) == (ActionType.CALL, 0)
+    # JSON接続のバイナリフレームもJSONとして扱う
+    assert isinstance(parse_client_message(b'{"type": "ping"}', JSON), PingMessage)
+    assert isinstance(parse_client_message(msgpack.packb({"type": "ping"}), MSGPACK), PingMessage)
+    # テキストフレームはmsgpack接続でもJSON
+    assert isinstance(parse_client_message('{"type": "ping"}', MSGPACK), PingMessage)
+    large = '{"type": "ping", "pad": "%s"}' % ("x" * MAX_MESSAGE_SIZE)
+    assert isinstance(parse_client_message(large, JSON, max_size=None), PingMessage)
+
+
+def test_rejected_messages_keep_connection_and_game_untouched():
+    import main
+
+    with TestClient(main.app) as client:
+        game_id = client.post("/api/games/single-play", json={}).json()["game_id"]
+        with client.websocket_connect(f"/ws/game/{game_id}?username=bob") as ws:
+            assert ws.receive_json()["type"] == "connected"
+            assert ws.receive_json()["type"] == "game_state"
+            version = game_service.get_game_state(game_id).version
+
+            for raw in ("not json", '{"type": "start_game", "extra": ', "x" * (MAX_MESSAGE_SIZE + 1)):
+                ws.send_text(raw)
+                message = ws.receive_json()
+                assert message["type"] == "error" and message["error"]
+            assert game_service.get_game_state(game_id).version == version
+
+            # 拒否の後も同じ接続でメッセージを受け付ける
+            ws.send_text('{"type": "get_state"}')
+            assert ws.receive_json()["type"] == "game_state"
+        client.delete(f"/api/games/{game_id}")
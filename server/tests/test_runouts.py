@@ -0,0 +1,137 @@
+"""
+ラン・イット・N回（ランアウトの配布・ポット分割・ショーダウン）のテスト
+"""
+from typing import Dict, List
+
+import pytest
+
+from app.game.domain.deck import Card
+from app.game.domain.enum import GameStatus, SeatStatus
+from app.game.domain.game_state import GameState
+from app.game.domain.table import Pot
+from app.game.logic.pot_manager import PotManager
+from app.game.services.dealer_service import DealerService
+from app.game.services.game_service import GameService
+from app.game.services.showdown_service import ShowdownService
+
+from conftest import make_players
+
+
+def cards(text: str) -> List[Card]:
+    """"As Kh 2c" のような文字列からカードを作る"""
+    return [Card(code[0], code[1]) for code in text.split()]
+
+
+def all_in_game(hole_cards: List[str], run_it_times: int = 2) -> GameState:
+    """全員がオールインした状態のゲーム（ボードは空）"""
+    game = GameState(seat_count=len(hole_cards), run_it_times=run_it_times)
+    for seat, player, hole in zip(game.table.seats, make_players(len(hole_cards)), hole_cards):
+        game.add_player(player)
+        seat.sit_down(player, stack=0)
+        seat.status = SeatStatus.ALL_IN
+        seat.hole_cards = cards(hole)
+    return game
+
+
+def set_pots(game: GameState, pots: List[tuple]) -> None:
+    """(金額, 資格のある座席) のリストでポットを置き換える"""
+    game.table.pots = []
+    for amount, eligible in pots:
+        pot = Pot()
+        pot.amount = amount
+        pot.eligible_seats = list(eligible)
+        game.table.pots.append(pot)
+
+
+def test_deal_runouts_are_disjoint_and_keep_the_existing_board():
+    game = all_in_game(["As Ah", "Ks Kh"], run_it_times=3)
+    game.table.deck.cards = [c for c in game.table.deck.cards if str(c) not in {"A♠", "A♥", "K♠", "K♥"}]
+    flop = game.table.deck.draw(3)
+    game.table.community_cards = list(flop)
+
+    runouts = DealerService().deal_runouts(game, 3)
+
+    assert len(runouts) == 3
+    assert all(board[:3] == flop and len(board) == 5 for board in runouts)
+    turn_and_river = [card for board in runouts for card in board[3:]]
+    assert len(set(turn_and_river)) == 6
+    assert game.table.community_cards == runouts[0]
+    assert game.table.runouts == runouts
+
+
+def test_deal_runouts_clamps_to_what_the_deck_can_deal():
+    game = all_in_game(["As Ah", "Ks Kh"])
+    game.table.deck.cards = game.table.deck.cards[:7]
+
+    runouts = DealerService().deal_runouts(game, 3)
+
+    assert len(runouts) == 1
+    assert len(game.table.deck.cards) == 2
+
+
+def test_runout_distribution_gives_the_odd_chip_to_the_first_runout():
+    game = all_in_game(["As Ah", "Ks Kh"])
+    set_pots(game, [(201, [0, 1])])
+    scores: Dict[int, List[int]] = {0: [10, 500], 1: [20, 400]}
+
+    distributions = PotManager.calculate_runout_distribution(game, scores, 2)
+
+    assert distributions == [
+        {"seat_index": 0, "amount": 101, "pot_type": "main", "runout": 0},
+        {"seat_index": 1, "amount": 100, "pot_type": "main", "runout": 1},
+    ]
+
+
+def test_runout_distribution_respects_side_pot_eligibility():
+    # 座席0が一番短いスタック: メインは全員、サイドは座席1と2だけ
+    game = all_in_game(["As Ah", "Ks Kh", "Qs Qh"])
+    set_pots(game, [(300, [0, 1, 2]), (200, [1, 2])])
+    # 座席0はどちらのボードでも最強だがサイドポットには関われない
+    scores = {0: [1, 1], 1: [50, 90], 2: [60, 80]}
+
+    distributions = PotManager.calculate_runout_distribution(game, scores, 2)
+
+    main = [d for d in distributions if d["pot_type"] == "main"]
+    side = [d for d in distributions if d["pot_type"] == "side_1"]
+    assert {(d["seat_index"], d["runout"], d["amount"]) for d in main} == {(0, 0, 150), (0, 1, 150)}
+    assert {(d["seat_index"], d["runout"], d["amount"]) for d in side} == {(1, 0, 100), (2, 1, 100)}
+    assert sum(d["amount"] for d in distributions) == 500
+
+
+def test_evaluate_multi_runout_splits_the_pot_between_boards():
+    game = all_in_game(["As Ah", "Ks Kh"])
+    set_pots(game, [(201, [0, 1])])
+    # 1つ目のボードはAのトリップス、2つ目のボードはKのトリップス
+    game.table.deck.cards = cards("Ac Kd 2c 7d 9s Kc 3c 8d Td 4s")
+
+    winners = ShowdownService().evaluate_multi_runout(game, DealerService(), 2)
+
+    by_seat = {w["seat_index"]: w for w in winners}
+    assert by_seat[0]["amount"] == 101 and by_seat[0]["runouts"] == [0]
+    assert by_seat[1]["amount"] == 100 and by_seat[1]["runouts"] == [1]
+    assert [seat.stack for seat in game.table.seats] == [101, 100]
+    assert len(game.table.runouts) == 2
+    assert game.status == GameStatus.HAND_COMPLETE
+
+
+def test_evaluate_multi_runout_aggregates_a_scoop_per_pot():
+    game = all_in_game(["As Ah", "7c 2d"], run_it_times=3)
+    set_pots(game, [(300, [0, 1])])
+    game.table.deck.cards = cards("Ac 3s 5h 9d Jc Ad 4s 6h Tc Qd Kc 8s 3h 9h Js")
+
+    winners = ShowdownService().evaluate_multi_runout(game, DealerService(), 3)
+
+    assert len(winners) == 1
+    assert winners[0]["seat_index"] == 0
+    assert winners[0]["amount"] == 300
+    assert winners[0]["runouts"] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_single_play_game_takes_run_it_times():
+    service = GameService()
+    game = await service.create_single_play_game(big_blind=100, buy_in=10000, run_it_times=2)
+    assert game.run_it_times == 2
+
+    other = await service.create_game("g-default")
+    assert other.run_it_times == 1
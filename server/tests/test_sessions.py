@@ -0,0 +1,113 @@
+"""
+再接続セッション（猶予期間中の復帰と期限切れ）のテスト
+"""
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+from app.game.services.game_service import game_service
+from app.game.services.timer_service import timer_service
+from app.websocket.sessions import SessionManager, session_manager
+
+
+@pytest_asyncio.fixture
+async def expired():
+    """共有タイマーを動かし、期限切れになった (game_id, player_id) を記録するリスナーを返す"""
+    calls = []
+
+    async def listener(game_id: str, player_id: str) -> None:
+        calls.append((game_id, player_id))
+
+    timer_service.start()
+    yield calls, listener
+    await timer_service.stop()
+
+
+@pytest.mark.asyncio
+async def test_resume_within_grace_period_keeps_session(expired):
+    calls, listener = expired
+    sessions = SessionManager(grace_period=0.2)
+    sessions.set_expire_listener(listener)
+    session = sessions.create("g1", "p1")
+
+    assert sessions.resume("wrong-token", "g1") is None
+    assert sessions.resume(session.token, "other-game") is None
+
+    await sessions.detach(session)
+    assert session.is_detached
+    assert sessions.resume(session.token, "g1") is session
+    assert not session.is_detached
+    await asyncio.sleep(0.4)
+    assert calls == []
+    assert sessions.resume(session.token, "g1") is session
+
+
+@pytest.mark.asyncio
+async def test_grace_period_expiry_invalidates_token(expired):
+    calls, listener = expired
+    sessions = SessionManager(grace_period=0.2)
+    sessions.set_expire_listener(listener)
+    session = sessions.create("g1", "p1")
+
+    await sessions.detach(session)
+    await sessions.detach(session)  # 切断が重なっても期限切れは1回
+    await asyncio.sleep(0.5)
+    assert calls == [("g1", "p1")]
+    assert sessions.resume(session.token, "g1") is None
+    assert len(sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_zero_grace_period_and_forget_game(expired):
+    calls, listener = expired
+    sessions = SessionManager(grace_period=0)
+    sessions.set_expire_listener(listener)
+    await sessions.detach(sessions.create("g1", "p1"))
+    assert calls == [("g1", "p1")]
+
+    sessions.grace_period = 0.2
+    kept = sessions.create("g2", "p2")
+    await sessions.detach(sessions.create("g1", "p3"))
+    sessions.forget_game("g1")
+    await asyncio.sleep(0.4)
+    assert calls == [("g1", "p1")]
+    assert len(sessions) == 1 and sessions.resume(kept.token, "g2") is kept
+
+
+def test_websocket_resume_and_expiry():
+    import main
+
+    grace_period = session_manager.grace_period
+    with TestClient(main.app) as client:
+        game_id = client.post("/api/games/single-play", json={}).json()["game_id"]
+        with client.websocket_connect(f"/ws/game/{game_id}?username=bob") as ws:
+            connected = ws.receive_json()["data"]
+            token, player_id = connected["session_token"], connected["player_id"]
+            assert connected["resumed"] is False
+
+        # 切断しても猶予期間中は座席が残り、同じトークンで同じプレイヤーとして復帰する
+        game = game_service.get_game_state(game_id)
+        assert game.get_player_by_id(player_id) is not None
+        with client.websocket_connect(f"/ws/game/{game_id}?username=bob&token={token}") as ws:
+            resumed = ws.receive_json()["data"]
+            assert resumed["resumed"] is True and resumed["player_id"] == player_id
+            assert ws.receive_json()["type"] == "game_state"
+
+        # 猶予期間が切れると退席し、トークンは使えなくなる
+        session_manager.grace_period = 0.2
+        try:
+            with client.websocket_connect(f"/ws/game/{game_id}?username=bob&token={token}") as ws:
+                assert ws.receive_json()["data"]["resumed"] is True
+            deadline = time.monotonic() + 3.0
+            while game.get_player_by_id(player_id) is not None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert game.get_player_by_id(player_id) is None
+            with client.websocket_connect(f"/ws/game/{game_id}?username=bob&token={token}") as ws:
+                reconnected = ws.receive_json()["data"]
+                assert reconnected["resumed"] is False and reconnected["player_id"] != player_id
+        finally:
+            session_manager.grace_period = grace_period
+        client.delete(f"/api/games/{game_id}")
@@ -0,0 +1,36 @@
+"""
+観戦チャンネル（観戦者がいないテーブルのフレームを保持しないこと）のテスト
+"""
+import time
+
+from fastapi.testclient import TestClient
+
+from app.game.services.game_service import game_service
+from app.websocket.spectators import spectator_hub
+
+
+def test_frames_are_kept_only_while_a_table_has_spectators():
+    import main
+
+    with TestClient(main.app) as client:
+        game_id = client.post("/api/games/single-play", json={}).json()["game_id"]
+        with client.websocket_connect(f"/ws/game/{game_id}?username=bob") as ws:
+            assert ws.receive_json()["type"] == "connected"
+            assert ws.receive_json()["type"] == "game_state"
+            # 配信はされたが、観戦者がいないのでフレームは保持しない
+            assert game_id not in spectator_hub._latest
+
+            # 最初の観戦者には現在の状態を送る
+            with client.websocket_connect(f"/ws/spectate/{game_id}") as spectator:
+                state = spectator.receive_json()
+                assert state["type"] == "game_state"
+                assert state["data"]["version"] == game_service.get_game_state(game_id).version
+                assert spectator.receive_json()["type"] == "spectating"
+                assert game_id in spectator_hub._latest
+
+            # 最後の観戦者が抜けたらフレームを破棄する
+            deadline = time.monotonic() + 3.0
+            while game_id in spectator_hub._latest and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert game_id not in spectator_hub._latest
+        client.delete(f"/api/games/{game_id}")
@@ -0,0 +1,150 @@
+"""
+差分配信（game_state_delta）の適用と、再接続時の履歴からの再構築のテスト
+"""
+import random
+from typing import Any, Dict, Optional
+
+import pytest
+
+from app.game.domain.action import PlayerAction
+from app.game.domain.enum import ActionType, GameStatus
+from app.game.domain.player import Player
+from app.game.services.game_service import GameService
+from app.websocket.codecs import CODECS
+from app.websocket.event_log import GameEventLog
+from app.websocket.serializers import StateFrameCache, serialize_game_state
+
+from conftest import fold_to_hand_end
+
+VIEWERS = ("p0", None)  # 着席しているプレイヤーと観戦者
+
+
+def apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """ガイドに書いたクライアントの手順で差分を適用する"""
+    assert delta["from_version"] == state["version"]
+    state = dict(state)
+    state.update(delta["changes"])
+    state["version"] = delta["version"]
+    seats = [dict(seat) for seat in state["seats"]]
+    for index, changes in delta["seats"].items():
+        seats[int(index)].update(changes)
+    state["seats"] = seats
+    return state
+
+
+async def random_action(service: GameService, game_id: str, rng: random.Random) -> None:
+    game = service.get_game_state(game_id)
+    seat = game.table.seats[game.current_seat_index]
+    action_type = rng.choice(service.poker_engine.get_valid_actions(game, seat.player.id))
+    amount = 0
+    if action_type == ActionType.BET:
+        amount = rng.randint(game.big_blind, max(game.big_blind, seat.stack))
+    elif action_type == ActionType.RAISE:
+        all_in = seat.stack + seat.bet_in_round
+        amount = rng.randint(min(game.current_bet * 2, all_in), all_in)
+    if not await service.process_player_action(game_id, seat.player.id, action_type, amount):
+        assert await service.process_player_action(game_id, seat.player.id, ActionType.FOLD)
+
+
+async def seated_game(seat_count: int = 3):
+    service = GameService()
+    await service.create_game("g1", seat_count=seat_count)
+    for index in range(seat_count):
+        await service.join_game("g1", Player(player_id=f"p{index}", name=f"P{index}", is_ai=False))
+    return service, service.get_game_state("g1")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec_name", sorted(CODECS))
+async def test_applied_deltas_match_full_state(codec_name):
+    codec = CODECS[codec_name]
+    rng = random.Random(7)
+    service, game = await seated_game()
+    cache = StateFrameCache()
+    clients = {viewer: codec.decode(cache.frame(game).encode(viewer, codec))["data"] for viewer in VIEWERS}
+    deltas = 0
+
+    for _ in range(20):
+        for seat in game.table.seats:
+            if seat.is_occupied and seat.stack == 0:
+                seat.stack = 10000
+        assert await service.start_game("g1")
+        while True:
+            cache.frame(game)
+            delta = cache.delta(game)
+            assert delta is not None
+            deltas += 1
+            for viewer in VIEWERS:
+                message = codec.decode(delta.encode(viewer, codec))
+                assert message["type"] == "game_state_delta"
+                clients[viewer] = apply_delta(clients[viewer], message["data"])
+                assert clients[viewer] == serialize_game_state(game, viewer)
+            if game.status != GameStatus.IN_PROGRESS:
+                break
+            await random_action(service, "g1", rng)
+
+    assert deltas > 40
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_owner_delta_after_seat_changes_hands():
+    service, game = await seated_game()
+    cache = StateFrameCache()
+    assert await service.start_game("g1")
+    await fold_to_hand_end(service, "g1")
+    # p3 が観戦者として見ていた公開版の状態から、p3 が座って配られた後の本人向け差分を適用する
+    spectator = serialize_game_state(game, None)
+    cache.frame(game)
+
+    assert await service.remove_player("g1", "p2")
+    assert await service.join_game("g1", Player(player_id="p3", name="P3", is_ai=False))
+    assert await service.start_game("g1")
+    cache.frame(game)
+    delta = cache.delta(game)
+    assert delta is not None
+    codec = CODECS["json"]
+    rebuilt = apply_delta(spectator, codec.decode(delta.encode("p3", codec))["data"])
+    assert rebuilt == serialize_game_state(game, "p3")
+    assert any(seat.get("hole_cards") for seat in rebuilt["seats"])
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rebuild_from_event_log_after_missed_versions():
+    rng = random.Random(3)
+    service, game = await seated_game()
+    event_log = GameEventLog(capacity=8)
+    cache = StateFrameCache(event_log)
+    assert await service.start_game("g1")
+    cache.frame(game)
+    codec = CODECS["json"]
+    stored: Optional[Dict[str, Any]] = serialize_game_state(game, "p0")
+
+    # 切断中に進んだバージョンの差分を順に適用すると最新の状態になる
+    for _ in range(5):
+        if game.status != GameStatus.IN_PROGRESS:
+            assert await service.start_game("g1")
+        else:
+            await random_action(service, "g1", rng)
+        cache.frame(game)
+    replay = event_log.replay("g1", stored["version"])
+    assert replay and replay[-1].version == game.version
+    for delta in replay:
+        stored = apply_delta(stored, codec.decode(delta.encode("p0", codec))["data"])
+    assert stored == serialize_game_state(game, "p0")
+    assert event_log.replay("g1", game.version) == []
+
+    # 履歴（capacity）より古いバージョンからは再構築できないので、完全な状態を送る
+    old_version = game.version
+    for _ in range(10):
+        if game.status != GameStatus.IN_PROGRESS:
+            assert await service.start_game("g1")
+        else:
+            await random_action(service, "g1", rng)
+        cache.frame(game)
+    assert event_log.replay("g1", old_version) is None
+
+    cache.forget("g1")
+    assert event_log.replay("g1", game.version) is None
+    await service.table_actors.shutdown()
@@ -0,0 +1,231 @@
+"""
+テーブルのアクター（到着順の適用・存在しないテーブルの扱い）と、AIの決定・適用の経路のテスト
+"""
+import asyncio
+
+import pytest
+
+from app.game.domain.enum import ActionType
+from app.game.services.ai_batch_dispatcher import AIBatchDispatcher
+from app.game.services.ai_executor import AIExecutor
+from app.game.services.ai_service import AIService
+from app.game.services.game_service import GameService, game_service
+from app.game.services.table_actor import TableActorRegistry
+from app.websocket.ai_turn_scheduler import AITurnScheduler
+
+from conftest import make_players
+
+
+@pytest.mark.asyncio
+async def test_commands_apply_in_arrival_order_per_table():
+    registry = TableActorRegistry()
+    applied = {"t1": [], "t2": []}
+
+    async def command(table: str, index: int) -> int:
+        # 途中で制御を手放しても、同じテーブルの次のコマンドは始まらない
+        applied[table].append(("start", index))
+        await asyncio.sleep(0)
+        applied[table].append(("end", index))
+        return index
+
+    calls = [registry.run(table, command, table, index) for index in range(20) for table in ("t1", "t2")]
+    results = await asyncio.gather(*calls)
+
+    assert results == [index for index in range(20) for _ in ("t1", "t2")]
+    for table in ("t1", "t2"):
+        assert applied[table] == [(step, index) for index in range(20) for step in ("start", "end")]
+    assert registry.stats() == {"tables": 2, "pending": 0, "processed": 40}
+    await registry.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_reentrant_run_executes_inline():
+    registry = TableActorRegistry()
+
+    async def inner() -> str:
+        return "inner"
+
+    async def outer() -> str:
+        return await registry.run("t1", inner)
+
+    assert await asyncio.wait_for(registry.run("t1", outer), timeout=1.0) == "inner"
+    await registry.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_unknown_and_deleted_games_get_no_actor():
+    service = GameService()
+    players = make_players(2)
+    assert not await service.join_game("missing", players[0])
+    assert not await service.process_player_action("missing", players[0].id, ActionType.FOLD)
+    assert len(service.table_actors) == 0
+
+    await service.create_game("g1", seat_count=2)
+    assert await service.join_game("g1", players[0])
+    assert len(service.table_actors) == 1
+    assert service.delete_game("g1")
+    # 削除後に届いたコマンドでアクターが作り直されることはない
+    assert await service.join_game("g1", players[1]) is None
+    assert len(service.table_actors) == 0
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_closing_a_table_resolves_queued_commands_without_cancelling_callers():
+    service = GameService()
+    players = make_players(2)
+    await service.create_game("g1", seat_count=2)
+    for player in players:
+        assert await service.join_game("g1", player)
+    assert await service.start_game("g1")
+    game = service.get_game_state("g1")
+    seat = game.table.seats[game.current_seat_index]
+    started = asyncio.Event()
+
+    async def slow_command() -> str:
+        started.set()
+        await asyncio.sleep(10)
+        return "done"
+
+    running = asyncio.create_task(service.run_on_table("g1", slow_command))
+    await started.wait()
+    queued = asyncio.create_task(service.process_player_action("g1", seat.player.id, ActionType.FOLD))
+    await asyncio.sleep(0)
+    assert service.table_actors.stats()["pending"] == 1
+
+    actor = service.close_table("g1")
+    # 実行中のコマンドはNone、積まれていたアクションは拒否として返り、待っている側はキャンセルされない
+    assert await asyncio.wait_for(running, timeout=1.0) is None
+    assert await asyncio.wait_for(queued, timeout=1.0) is False
+    assert not running.cancelled() and not queued.cancelled()
+    assert game.history == []
+    await actor.wait_closed()
+    await service.table_actors.shutdown()
+
+
+class GatedExecutor(AIExecutor):
+    """gate が開くまで決定を返さないエグゼキュータ"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.calls = 0
+
+    async def decide_action(self, game, seat, timeout=None):
+        self.calls += 1
+        action = AIService().decide_action(game, seat)
+        await self.gate.wait()
+        return action
+
+
+@pytest.mark.asyncio
+async def test_ai_decision_does_not_hold_the_table_actor():
+    await game_service.create_game("ai-actor", seat_count=2)
+    try:
+        for player in make_players(2):
+            await game_service.join_game("ai-actor", player)
+        assert await game_service.start_game("ai-actor")
+        game = game_service.get_game_state("ai-actor")
+        executor = GatedExecutor()
+        scheduler = AITurnScheduler(executor=executor, think_time=0)
+        turns = asyncio.create_task(scheduler._play_ai_turns("ai-actor"))
+        await asyncio.sleep(0)
+        assert executor.calls == 1
+
+        # 決定中でもテーブルのコマンドは待たされない
+        async def touch():
+            game.touch()
+            return game.version
+
+        version = await asyncio.wait_for(game_service.run_on_table("ai-actor", touch), timeout=1.0)
+        history = len(game.history)
+
+        # 決定した時とバージョンが違うので適用せずに決め直す
+        executor.gate.set()
+        await asyncio.sleep(0.01)
+        assert executor.calls >= 2
+        assert len(game.history) > history
+        assert game.version > version
+        await asyncio.wait_for(turns, timeout=1.0)
+    finally:
+        game_service.delete_game("ai-actor")
+
+
+@pytest.mark.asyncio
+async def test_batch_tick_applies_on_all_tables_concurrently():
+    service = GameService()
+    for index in range(3):
+        await service.create_game(f"g{index}", seat_count=2)
+        for player in make_players(2):
+            await service.join_game(f"g{index}", player)
+        assert await service.start_game(f"g{index}")
+    dispatcher = AIBatchDispatcher(service)
+    entered = []
+    release = asyncio.Event()
+    apply = dispatcher._apply
+
+    async def gated_apply(game_id, *args):
+        entered.append(game_id)
+        await release.wait()
+        return await apply(game_id, *args)
+
+    dispatcher._apply = gated_apply
+    tick = asyncio.create_task(dispatcher.tick())
+    await asyncio.sleep(0.01)
+    # 1つ目のテーブルの適用を待たずに全テーブルのアクターで適用が始まっている
+    assert sorted(entered) == ["g0", "g1", "g2"]
+    release.set()
+    assert await asyncio.wait_for(tick, timeout=1.0) == 3
+    assert all(len(service.get_game_state(f"g{index}").history) == 1 for index in range(3))
+    await service.table_actors.shutdown()
+
+
+async def heads_up_games(service: GameService, count: int) -> None:
+    """AI 2人のゲームを count 個開始する"""
+    for index in range(count):
+        await service.create_game(f"g{index}", seat_count=2)
+        for player in make_players(2):
+            await service.join_game(f"g{index}", player)
+        assert await service.start_game(f"g{index}")
+
+
+@pytest.mark.asyncio
+async def test_batch_apply_skips_tables_changed_since_collect():
+    service = GameService()
+    await heads_up_games(service, 1)
+    game = service.get_game_state("g0")
+    dispatcher = AIBatchDispatcher(service)
+    apply = dispatcher._apply
+
+    async def apply_after_change(game_id, game, *args):
+        # 集めた後、適用する前に別のコマンドが状態を変えた
+        game.touch()
+        return await apply(game_id, game, *args)
+
+    dispatcher._apply = apply_after_change
+    assert await dispatcher.tick() == 0
+    assert game.history == []
+
+    # 次のティックでは最新の状態から決め直して適用する
+    dispatcher._apply = apply
+    assert await dispatcher.tick() == 1
+    assert len(game.history) == 1
+    await service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_action_falls_back():
+    service = GameService()
+    await heads_up_games(service, 1)
+    game = service.get_game_state("g0")
+    seat = game.table.seats[game.current_seat_index]
+    fallback = AIExecutor.fallback_action(game, seat)
+    dispatcher = AIBatchDispatcher(service)
+    # 最小レイズに満たないレイズは拒否される
+    dispatcher._to_action = lambda game, action_code, bet_amount, facing_bet: (ActionType.RAISE, 1)
+
+    assert await dispatcher.tick() == 1
+    assert [(action.player_id, action.action_type) for action in game.history] == [
+        (seat.player.id, fallback.action_type)
+    ]
+    await service.table_actors.shutdown()
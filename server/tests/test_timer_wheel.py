@@ -0,0 +1,141 @@
+"""
+階層型タイマーホイールと、それで駆動するターン制限時間・ブラインドスケジュールのテスト
+"""
+import asyncio
+
+import pytest
+
+from app.core.timer_wheel import HierarchicalTimerWheel, TimerWheelScheduler
+from app.game.domain.enum import GameStatus
+from app.game.services.game_service import GameService
+from app.game.services.timer_service import TimerService
+
+from conftest import fold_to_hand_end, make_players
+
+
+def fired_ticks(wheel: HierarchicalTimerWheel, ticks: int):
+    """ticks 分進め、発火したタイマーの引数と発火時の tick を返す"""
+    fired = []
+    for _ in range(ticks):
+        for handle in wheel.advance():
+            if not handle.cancelled:
+                fired.append((handle.args[0], wheel.current_tick))
+    return fired
+
+
+def test_timers_fire_on_their_tick():
+    wheel = HierarchicalTimerWheel(tick=1.0, wheel_size=4, levels=3)
+    for delay in (1, 3, 4, 5):
+        wheel.schedule(delay, None, delay)
+    assert len(wheel) == 4
+    assert fired_ticks(wheel, 6) == [(1, 1), (3, 3), (4, 4), (5, 5)]
+    assert len(wheel) == 0
+
+
+def test_cascade_from_upper_levels_keeps_exact_expiry():
+    # wheel_size=4, levels=3: レベル0は4tick、レベル1は16tick、レベル2は64tickまで
+    wheel = HierarchicalTimerWheel(tick=1.0, wheel_size=4, levels=3)
+    delays = [2, 7, 16, 17, 31, 50, 63]
+    for delay in delays:
+        wheel.schedule(delay, None, delay)
+    # 上位レベルに置かれたタイマーは下位レベルへ振り直されてから、登録した tick ちょうどに発火する
+    assert fired_ticks(wheel, 64) == [(delay, delay) for delay in delays]
+
+
+def test_delay_is_clamped_to_max_delay():
+    wheel = HierarchicalTimerWheel(tick=1.0, wheel_size=4, levels=2)
+    wheel.schedule(1000, None, "far")
+    assert fired_ticks(wheel, 15) == [("far", 15)]
+
+
+def test_cancel_removes_timer():
+    wheel = HierarchicalTimerWheel(tick=1.0, wheel_size=4, levels=3)
+    keep = wheel.schedule(3, None, "keep")
+    drop = wheel.schedule(3, None, "drop")
+    drop.cancel()
+    drop.cancel()  # 2回目は何もしない
+    assert len(wheel) == 1
+    assert fired_ticks(wheel, 4) == [("keep", 3)]
+    keep.cancel()  # 発火済みのキャンセルも安全
+
+
+def test_cancel_after_cascade():
+    wheel = HierarchicalTimerWheel(tick=1.0, wheel_size=4, levels=3)
+    handle = wheel.schedule(20, None, "late")
+    other = wheel.schedule(21, None, "other")
+    # tick 16 で下位レベルへ振り直された後でもキャンセルできる
+    assert fired_ticks(wheel, 17) == []
+    handle.cancel()
+    assert len(wheel) == 1
+    assert fired_ticks(wheel, 10) == [("other", 21)]
+    assert other.cancelled is False
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_async_callbacks():
+    scheduler = TimerWheelScheduler(tick=0.01)
+    done = asyncio.Event()
+
+    async def callback(value):
+        await asyncio.sleep(0)
+        done.set()
+
+    scheduler.start()
+    try:
+        scheduler.call_later(0.02, callback, 1)
+        await asyncio.wait_for(done.wait(), timeout=1.0)
+        await asyncio.sleep(0)
+        assert not scheduler._callbacks
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_blind_schedule_repeats_until_level_up_returns_false():
+    timer = TimerService(GameService(), scheduler=TimerWheelScheduler(tick=0.01))
+    levels = []
+
+    def level_up() -> bool:
+        levels.append(len(levels) + 1)
+        return len(levels) < 3
+
+    timer.start()
+    try:
+        timer.schedule_blind_levels("t1", 0.02, level_up)
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if "t1" not in timer._blind_timers:
+                break
+        assert levels == [1, 2, 3]
+        assert "t1" not in timer._blind_timers
+
+        timer.schedule_blind_levels("t2", 0.02, level_up)
+        timer.cancel_blind_schedule("t2")
+        await asyncio.sleep(0.05)
+        assert levels == [1, 2, 3]
+    finally:
+        await timer.stop()
+
+
+@pytest.mark.asyncio
+async def test_turn_timeout_from_previous_hand_is_ignored():
+    game_service = GameService()
+    timer = TimerService(game_service)
+    await game_service.create_game("g1", seat_count=3)
+    for player in make_players(3, is_ai=False):
+        await game_service.join_game("g1", player)
+
+    assert await game_service.start_game("g1")
+    game = game_service.get_game_state("g1")
+    stale_token = timer._turn_token(game)
+    await fold_to_hand_end(game_service, "g1")
+    assert await game_service.start_game("g1")
+    # 前のハンドでタイマーを設定したときと同じ座席の手番にそろえる
+    game.current_seat_index = stale_token[1]
+
+    # 座席・ラウンドが同じでもハンドが違えば自動アクションしない
+    assert await timer._apply_turn_timeout("g1", stale_token) is None
+    applied = await timer._apply_turn_timeout("g1", timer._turn_token(game))
+    assert applied is not None
+    assert game.status in (GameStatus.IN_PROGRESS, GameStatus.HAND_COMPLETE)
+    await game_service.table_actors.shutdown()
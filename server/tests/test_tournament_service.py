@@ -0,0 +1,248 @@
+"""
+トーナメントの進行（ハンド終了からの人数調整・解散・次のハンド）のテスト
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.core.timer_wheel import TimerWheelScheduler
+from app.game.domain.enum import ActionType, GameStatus
+from app.game.domain.tournament import BlindLevel
+from app.game.services.game_lifecycle import GameLifecycleManager, CLOSE_TABLE_BROKEN
+from app.game.services.game_service import GameService
+from app.game.services.timer_service import TimerService
+from app.game.services.tournament_service import TournamentService
+
+from conftest import fold_to_hand_end, make_players
+
+
+@pytest_asyncio.fixture
+async def services():
+    game_service = GameService()
+    timer = TimerService(game_service)
+    lifecycle = GameLifecycleManager(game_service, sweep_interval=0)
+    tournaments = TournamentService(game_service, timer=timer, lifecycle=lifecycle, hand_interval=0.1)
+    game_service.add_hand_complete_listener(tournaments._on_hand_complete)
+    lifecycle.add_close_listener(tournaments._on_game_closed)
+    yield game_service, timer, lifecycle, tournaments
+    await timer.stop()
+    await game_service.table_actors.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_start_keeps_previous_hand(services):
+    game_service, _, _, _ = services
+    game = await game_service.create_game("g1", seat_count=3)
+    players = make_players(2)
+    for player in players:
+        await game_service.join_game("g1", player)
+    assert await game_service.start_game("g1")
+    await fold_to_hand_end(game_service, "g1")
+    winners = list(game.winners)
+    assert winners
+
+    # 1人だけになったテーブルでは開始に失敗し、前のハンドの結果がそのまま残る
+    game.remove_player_by_id(players[0].id)
+    version = game.version
+    assert not await game_service.start_game("g1")
+    assert game.winners == winners
+    assert game.version == version
+
+
+@pytest.mark.asyncio
+async def test_hand_complete_starts_next_hand(services):
+    game_service, timer, _, tournaments = services
+    timer.start()
+    tournament = await tournaments.create_tournament(make_players(4), seats_per_table=4)
+    table_id = next(iter(tournament.tables))
+    assert await tournaments.start_tournament(tournament.id)
+    assert not await tournaments.start_tournament(tournament.id)
+
+    game = await fold_to_hand_end(game_service, table_id)
+    assert game.status == GameStatus.HAND_COMPLETE
+    assert table_id in tournaments._next_hand_timers
+
+    for _ in range(20):
+        await asyncio.sleep(0.05)
+        if game.status == GameStatus.IN_PROGRESS:
+            break
+    assert game.status == GameStatus.IN_PROGRESS
+    assert table_id not in tournaments._next_hand_timers
+
+
+@pytest.mark.asyncio
+async def test_between_hands_breaks_table_and_closes_game(services):
+    game_service, _, lifecycle, tournaments = services
+    tournament = await tournaments.create_tournament(make_players(6), seats_per_table=4)
+    source_id, target_id = list(tournament.tables)
+    for table_id in (source_id, target_id):
+        lifecycle.register(table_id, pinned=True)
+
+    # 2人が敗退すると残り4人は1テーブル（4席）に収まるので、テーブルを解散して移動する
+    source = tournament.tables[source_id]
+    for seat in [seat for seat in source.table.seats if seat.is_occupied][:2]:
+        seat.stack = 0
+    await tournaments._between_hands(source_id)
+
+    assert tournament.remaining_players == 4
+    assert tournament.table_counts == {target_id: 4}
+    assert source_id not in game_service.games
+    assert lifecycle.evictions[CLOSE_TABLE_BROKEN] == 1
+    # 移動先は止まっていたので次のハンドを開始する
+    assert tournament.tables[target_id].status == GameStatus.IN_PROGRESS
+
+
+@pytest.mark.asyncio
+async def test_table_changes_run_on_each_table_actor(services):
+    game_service, _, lifecycle, tournaments = services
+    tournament = await tournaments.create_tournament(make_players(6), seats_per_table=4)
+    source_id, target_id = list(tournament.tables)
+    for table_id in (source_id, target_id):
+        lifecycle.register(table_id, pinned=True)
+
+    changed_on = []
+    run_on_table = game_service.run_on_table
+
+    async def recording_run_on_table(game_id, fn, *args):
+        changed_on.append((game_id, game_service.table_actors.get(game_id) is not None))
+        return await run_on_table(game_id, fn, *args)
+
+    game_service.run_on_table = recording_run_on_table
+    for seat in [seat for seat in tournament.tables[source_id].table.seats if seat.is_occupied][:2]:
+        seat.stack = 0
+    await tournaments._between_hands(source_id)
+
+    # 敗退・立たせる処理は移動元、座らせる処理と次のハンドの開始は移動先のアクターで行う
+    assert {game_id for game_id, _ in changed_on} == {source_id, target_id}
+    assert all(has_actor for _, has_actor in changed_on)
+    assert tournament.table_counts == {target_id: 4}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_table_breaks_keep_every_player_seated(services):
+    game_service, _, lifecycle, tournaments = services
+    tournament = await tournaments.create_tournament(make_players(9), seats_per_table=4)
+    table_ids = list(tournament.tables)
+    for table_id in table_ids:
+        lifecycle.register(table_id, pinned=True)
+
+    # 各テーブルで1人ずつ敗退すると残り6人は2テーブルに収まる
+    for table_id in table_ids:
+        next(seat for seat in tournament.tables[table_id].table.seats if seat.is_occupied).stack = 0
+    await asyncio.gather(*(tournaments._between_hands(table_id) for table_id in table_ids))
+
+    assert tournament.remaining_players == 6
+    assert len(tournament.tables) == 2
+    for table_id, game in tournament.tables.items():
+        seated = [seat.player.id for seat in game.table.seats if seat.is_occupied]
+        assert len(seated) == tournament.table_counts[table_id]
+        assert all(tournament.player_table[player_id] == table_id for player_id in seated)
+
+
+@pytest.mark.asyncio
+async def test_pinned_tables_are_not_evicted(services):
+    game_service, _, lifecycle, tournaments = services
+    lifecycle.abandoned_ttl = 0.0001
+    tournament = await tournaments.create_tournament(make_players(4), seats_per_table=4)
+    table_id = next(iter(tournament.tables))
+    lifecycle.register(table_id, pinned=True)
+    await asyncio.sleep(0.01)
+    assert await lifecycle.sweep() == 0
+
+    lifecycle.unpin(table_id)
+    await asyncio.sleep(0.01)
+    assert await lifecycle.sweep() == 1
+    # 外部から破棄されたテーブルのプレイヤーは敗退扱いになる
+    assert tournament.remaining_players == 0
+    assert tournament.is_finished
+
+
+@pytest.mark.asyncio
+async def test_blind_level_applies_from_next_hand(services):
+    game_service, timer, _, tournaments = services
+    timer.start()
+    tournament = await tournaments.create_tournament(
+        make_players(3), seats_per_table=3,
+        blind_levels=[BlindLevel(50, 100), BlindLevel(100, 200)], level_interval=0.1
+    )
+    table_id = next(iter(tournament.tables))
+    game = tournament.tables[table_id]
+    assert await tournaments.start_tournament(tournament.id)
+
+    for _ in range(20):
+        await asyncio.sleep(0.05)
+        if tournament.level_index == 1:
+            break
+    assert tournament.level_index == 1
+    # 最後のレベルに達したのでスケジュールは終わっている
+    assert tournament.id not in timer._blind_timers
+    # ハンドの途中ではブラインドは変わらない
+    assert game.big_blind == 100
+
+    await fold_to_hand_end(game_service, table_id)
+    for _ in range(20):
+        await asyncio.sleep(0.05)
+        if game.status == GameStatus.IN_PROGRESS:
+            break
+    assert (game.small_blind, game.big_blind) == (100, 200)
+
+
+@pytest.mark.asyncio
+async def test_blind_all_in_hand_resolves_at_start(services):
+    game_service, _, _, _ = services
+    game = await game_service.create_game("g1", big_blind=100, seat_count=2)
+    for player in make_players(2):
+        await game_service.join_game("g1", player)
+    # 次のハンドのSB/BBのどちらになってもブラインドでオールインになるスタック
+    game.table.seats[0].stack = 30
+    completed = []
+
+    async def on_complete(game_id: str) -> None:
+        completed.append(game_id)
+
+    game_service.add_hand_complete_listener(on_complete)
+    assert await game_service.start_game("g1")
+    assert game.status == GameStatus.HAND_COMPLETE
+    assert game.current_seat_index is None
+    assert len(game.table.community_cards) == 5 and game.winners
+    assert sum(seat.stack for seat in game.table.seats) == 10030
+    assert completed == ["g1"]
+
+
+@pytest.mark.asyncio
+async def test_passive_tournament_plays_to_a_single_winner():
+    game_service = GameService()
+    timer = TimerService(game_service, scheduler=TimerWheelScheduler(tick=0.01))
+    lifecycle = GameLifecycleManager(game_service, sweep_interval=0)
+    tournaments = TournamentService(game_service, timer=timer, lifecycle=lifecycle, hand_interval=0.01)
+    game_service.add_hand_complete_listener(tournaments._on_hand_complete)
+    lifecycle.add_close_listener(tournaments._on_game_closed)
+    timer.start()
+    try:
+        # ブラインドが倍々に上がり、短いスタックはブラインドだけでオールインになる
+        levels = [BlindLevel(25 * 2 ** level, 50 * 2 ** level) for level in range(12)]
+        tournament = await tournaments.create_tournament(
+            make_players(6), seats_per_table=3, starting_stack=1000, blind_levels=levels, level_interval=0.05
+        )
+        assert await tournaments.start_tournament(tournament.id)
+
+        for _ in range(2000):
+            if tournament.is_finished:
+                break
+            for table_id, game in list(tournament.tables.items()):
+                if game.status != GameStatus.IN_PROGRESS or game.current_seat_index is None:
+                    continue
+                seat = game.table.seats[game.current_seat_index]
+                action = ActionType.CALL if game.current_bet > seat.bet_in_round else ActionType.CHECK
+                await game_service.process_player_action(table_id, seat.player.id, action)
+            await asyncio.sleep(0.005)
+
+        assert tournament.is_finished
+        assert tournament.remaining_players == 1
+        assert len(tournament.finished_player_ids) == 5
+        (final_table,) = tournament.tables.values()
+        assert sum(seat.stack for seat in final_table.table.seats) == 6000
+    finally:
+        await timer.stop()
+        await game_service.table_actors.shutdown()